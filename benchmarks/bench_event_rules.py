@@ -0,0 +1,115 @@
+"""
+Compares the compiled event conditions against the condition interpreter.
+
+The shipped event catalogue is scaled up by cloning every event under new
+IDs, then all conditions are evaluated for a series of world states.
+
+Usage:
+    python benchmarks/bench_event_rules.py [--scale N] [--years N]
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from history_generator.event_processor import EventProcessor
+from history_generator.event_compiler import compile_events
+from history_generator.fantasy_world import FantasyWorld
+
+EVENT_FILE = os.path.join(project_root, "data", "event_definitions.json")
+
+def scale_catalogue(events: dict, scale: int) -> dict:
+    """
+    Clones every event scale times under suffixed IDs.
+    
+    Args:
+        events: The event definitions
+        scale: Number of copies per event
+        
+    Returns:
+        The scaled event definitions
+    """
+    scaled = {"events": {}}
+    for category, category_events in events["events"].items():
+        scaled_category = scaled["events"].setdefault(category, {})
+        for copy_index in range(scale):
+            for event_id, event_data in category_events.items():
+                event_copy = copy.deepcopy(event_data)
+                for followup in event_copy.get("followup_events", []):
+                    followup["id"] = f"{followup['id']}_{copy_index}"
+                scaled_category[f"{event_id}_{copy_index}"] = event_copy
+    return scaled
+
+def world_states(years: int):
+    """Builds one world state per year with drifting stats."""
+    world = FantasyWorld()
+    states = []
+    for offset in range(years):
+        state = copy.deepcopy(world.get_world_state())
+        state["current_year"] = 1000 + offset
+        for stats in list(state["regions"].values()) + list(state["factions"].values()):
+            for stat in stats:
+                stats[stat] = (stats[stat] + offset * 7) % 101
+        states.append(state)
+    return states
+
+def run_interpreter(processor: EventProcessor, events: dict, states) -> int:
+    eligible = 0
+    for state in states:
+        for category_events in events["events"].values():
+            for event_data in category_events.values():
+                if processor._check_conditions(event_data.get("conditions", []), state):
+                    eligible += 1
+    return eligible
+
+def run_compiled(compiled, states) -> int:
+    eligible = 0
+    for state in states:
+        for category_events in compiled.values():
+            for event in category_events:
+                if event.predicate(state):
+                    eligible += 1
+    return eligible
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark compiled event conditions')
+    parser.add_argument('--scale', type=int, default=50, help='Number of copies of each event')
+    parser.add_argument('--years', type=int, default=100, help='Number of world states to evaluate')
+    args = parser.parse_args()
+    
+    processor = EventProcessor(EVENT_FILE)
+    events = scale_catalogue(processor.events, args.scale)
+    n_events = sum(len(category_events) for category_events in events["events"].values())
+    states = world_states(args.years)
+    
+    compiled, compile_time = timed(compile_events, events, processor.common_conditions)
+    interpreted_count, interpreted_time = timed(run_interpreter, processor, events, states)
+    compiled_count, compiled_time = timed(run_compiled, compiled, states)
+    assert interpreted_count == compiled_count, "compiled predicates disagree with the interpreter"
+    
+    evaluations = n_events * args.years
+    print(json.dumps({
+        "events": n_events,
+        "years": args.years,
+        "eligible": compiled_count,
+        "compile_seconds": round(compile_time, 4),
+        "interpreter_seconds": round(interpreted_time, 4),
+        "compiled_seconds": round(compiled_time, 4),
+        "interpreter_evaluations_per_second": round(evaluations / interpreted_time),
+        "compiled_evaluations_per_second": round(evaluations / compiled_time),
+        "speedup": round(interpreted_time / compiled_time, 2)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
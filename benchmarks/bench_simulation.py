@@ -0,0 +1,296 @@
+"""
+Throughput benchmarks for the yearly simulation loop.
+
+Every benchmark builds its inputs from a fixed seed, times only the
+measured part, and repeats it on fresh inputs; the fastest repeat is
+reported. Results are printed (or written) as JSON together with the
+commit they were measured on, so runs can be compared between commits.
+
+Usage:
+    python benchmarks/bench_simulation.py [--quick] [--only NAME] [--repeat N]
+                                          [--output FILE] [--compare FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import numpy as np
+from history_generator.ensemble import run_ensemble
+from history_generator.event_processor import EventProcessor
+from history_generator.events import NoSuccessorEvent, SuccessionEvent
+from history_generator.fantasy_world import FantasyWorld
+from history_generator.marriage_market import MarriageMarket
+from history_generator.person import Person
+from history_generator.person_manager import PersonManager
+from history_generator.population import Population
+from history_generator.rng import RandomStreams
+from history_generator.simulation import Simulation
+from bench_event_rules import EVENT_FILE, scale_catalogue
+
+SEED = 20240601
+
+def dynasty_simulate_year(years: int, warmup: int):
+    """Dynasty.simulate_year for one dynasty grown over warmup years."""
+    sim = Simulation(start_year=1000, duration=warmup + years, seed=SEED)
+    dynasty = sim.create_dynasty("House Nerdival")
+    for _ in range(warmup):
+        sim.simulate_year()
+        sim.increment_year()
+    family = len(dynasty.family)
+
+    start = time.perf_counter()
+    for _ in range(years):
+        sim.population.apply_mortality(sim.year, sim.rng)
+        dynasty.simulate_year(sim.year, sim.marriage_market)
+        sim.increment_year()
+    return time.perf_counter() - start, {"family_at_start": family, "calls": years}
+
+def marriage_market(candidates: int, searches: int):
+    """MarriageMarket.update and find_partner with a filled market."""
+    streams = RandomStreams(SEED)
+    rng = streams.stream("benchmark")
+    population = Population()
+    market = MarriageMarket(PersonManager(population), streams.stream("marriage_market"))
+    year = 1000
+    for _ in range(candidates):
+        gender = rng.choice(["male", "female"])
+        person = Person(Person.generate_random_name(gender, rng), gender, year - rng.randint(16, 30),
+                        "Commoners", "Central Valley", population=population)
+        market.add(person, year, remaining_years=rng.randint(1, 10))
+    seekers = [Person(Person.generate_random_name("male", rng), "male", year - rng.randint(16, 30),
+                      "Noble Houses", "Central Valley", population=population) for _ in range(searches)]
+
+    start = time.perf_counter()
+    found = 0
+    for seeker in seekers:
+        partner = market.find_partner(seeker, year)
+        if partner is not None:
+            seeker.marry(partner)
+            market.remove(partner)
+            found += 1
+    for offset in range(10):
+        market.update(year + offset)
+    return time.perf_counter() - start, {"matches": found, "remaining": len(market.candidates)}
+
+def event_processor(scale: int, years: int):
+    """EventProcessor.process_events on a catalogue scaled up by cloning events."""
+    processor = EventProcessor(EVENT_FILE, RandomStreams(SEED).stream("events"))
+    processor.events = scale_catalogue(processor.events, scale)
+    n_events = sum(len(category_events) for category_events in processor.events["events"].values())
+    world = FantasyWorld()
+    world_state = world.get_world_state()
+
+    start = time.perf_counter()
+    triggered = 0
+    for offset in range(years):
+        world_state["current_year"] = 1000 + offset
+        triggered += len(processor.process_events(world_state, 1000 + offset))
+    return time.perf_counter() - start, {"events": n_events, "triggered": triggered}
+
+def batch_event_processor(worlds: int, years: int):
+    """BatchEventProcessor.process_year for many worlds sharing the bundled catalogue."""
+    processor = EventProcessor(EVENT_FILE)
+    batch = processor.batch(FantasyWorld().stats, worlds, RandomStreams(SEED).stream("events"))
+
+    start = time.perf_counter()
+    triggered = 0
+    for offset in range(years):
+        triggered += int(batch.process_year(1000 + offset).sum())
+    seconds = time.perf_counter() - start
+    return seconds, {"triggered": triggered, "world_years_per_second": round(worlds * years / seconds)}
+
+def person_manager_cleanup(persons: int, dead_share: float):
+    """PersonManager.cleanup_dead_persons after a share of the population died."""
+    population = Population(capacity=persons)
+    manager = PersonManager(population)
+    for index in range(persons):
+        gender = "male" if index % 2 else "female"
+        manager.add_person(Person(f"Person {index}", gender, 900 + index % 100, "Commoners",
+                                  "Central Valley", population=population))
+    rng = np.random.default_rng(SEED)
+    died = np.flatnonzero(rng.random(persons) < dead_share)
+    population.death_year[died] = 1000
+    population.death_log.extend(died.tolist())
+
+    start = time.perf_counter()
+    manager.cleanup_dead_persons(1000)
+    return time.perf_counter() - start, {"removed": len(died), "remaining": len(manager.get_all_persons())}
+
+def simulation_run(dynasties: int, years: int):
+    """A full Simulation run with several dynasties."""
+    sim = Simulation(start_year=1000, duration=years, seed=SEED)
+    for index in range(dynasties):
+        sim.create_dynasty(f"House {index}")
+
+    start = time.perf_counter()
+    events = 0
+    while sim.year < sim.end_year:
+        events += len(sim.simulate_year())
+        sim.increment_year()
+    return time.perf_counter() - start, {"events": events, "persons": len(sim.population)}
+
+def fast_forward_run(dynasties: int, years: int, step: int):
+    """A Simulation run in aggregated fast-forward steps, building succession events only."""
+    sim = Simulation(start_year=1000, duration=years, seed=SEED)
+    for index in range(dynasties):
+        sim.create_dynasty(f"House {index}")
+
+    start = time.perf_counter()
+    events = 0
+    while sim.year < sim.end_year:
+        events += len(sim.fast_forward(step, (SuccessionEvent, NoSuccessorEvent)))
+    return time.perf_counter() - start, {"events": events, "persons": len(sim.population)}
+
+def ensemble_run(worlds: int, years: int, workers: int):
+    """run_ensemble over a process pool, with the peak memory of a worker."""
+    start = time.perf_counter()
+    statistics = run_ensemble(worlds, years=years, workers=workers, base_seed=SEED)
+    seconds = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux; it is the largest of all waited-for children
+    worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return seconds, {"worlds": statistics.worlds, "worker_max_rss_mib": round(worker_rss / 1024, 1)}
+
+# name -> (function, parameter sets of the full suite, parameter sets of the quick suite)
+BENCHMARKS = {
+    "dynasty_simulate_year": (dynasty_simulate_year,
+                              [{"years": 50, "warmup": 80}],
+                              [{"years": 10, "warmup": 40}]),
+    "marriage_market": (marriage_market,
+                        [{"candidates": 1000, "searches": 1000}, {"candidates": 100000, "searches": 10000}],
+                        [{"candidates": 1000, "searches": 200}]),
+    "event_processor": (event_processor,
+                        [{"scale": 1, "years": 500}, {"scale": 10, "years": 200}, {"scale": 50, "years": 100}],
+                        [{"scale": 5, "years": 50}]),
+    "batch_event_processor": (batch_event_processor,
+                              [{"worlds": 1, "years": 200}, {"worlds": 1000, "years": 200},
+                               {"worlds": 10000, "years": 100}],
+                              [{"worlds": 1000, "years": 20}]),
+    "person_manager_cleanup": (person_manager_cleanup,
+                               [{"persons": 10 ** 3, "dead_share": 0.1}, {"persons": 10 ** 4, "dead_share": 0.1},
+                                {"persons": 10 ** 5, "dead_share": 0.1}, {"persons": 10 ** 6, "dead_share": 0.1}],
+                               [{"persons": 10 ** 3, "dead_share": 0.1}, {"persons": 10 ** 4, "dead_share": 0.1}]),
+    "simulation_run": (simulation_run,
+                       [{"dynasties": 1, "years": 100}, {"dynasties": 8, "years": 100}, {"dynasties": 32, "years": 200},
+                        {"dynasties": 256, "years": 100}],
+                       [{"dynasties": 2, "years": 30}]),
+    "fast_forward_run": (fast_forward_run,
+                         [{"dynasties": 100, "years": 1000, "step": 1}, {"dynasties": 100, "years": 1000, "step": 20}],
+                         [{"dynasties": 10, "years": 200, "step": 20}]),
+    "ensemble_run": (ensemble_run,
+                     [{"worlds": 16, "years": 100, "workers": 2}, {"worlds": 64, "years": 100, "workers": 4}],
+                     [{"worlds": 4, "years": 20, "workers": 2}])
+}
+
+def run_benchmark(name: str, params: dict, repeat: int) -> dict:
+    """
+    Runs one benchmark repeatedly on fresh inputs.
+
+    Args:
+        name: Name of the benchmark
+        params: Parameters of the benchmark
+        repeat: Number of repeats
+
+    Returns:
+        Result with the fastest and all measured times plus the benchmark's own metrics
+    """
+    function = BENCHMARKS[name][0]
+    times = []
+    for _ in range(repeat):
+        seconds, metrics = function(**params)
+        times.append(seconds)
+    return {
+        "name": name,
+        "params": params,
+        "seconds": round(min(times), 6),
+        "runs": [round(seconds, 6) for seconds in times],
+        **metrics
+    }
+
+def result_key(result: dict) -> str:
+    """Identifies a result by benchmark name and parameters."""
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """
+    Finds benchmarks that got slower than a baseline.
+
+    Args:
+        results: The current results
+        baseline: An earlier report of this script
+        threshold: Ratio of current to baseline time that counts as a regression
+
+    Returns:
+        List of (key, baseline seconds, current seconds) for all regressions
+    """
+    previous = {result_key(result): result["seconds"] for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before and result["seconds"] > before * threshold:
+            regressions.append((result_key(result), before, result["seconds"]))
+    return regressions
+
+def git_commit() -> str:
+    """Returns the current commit hash, or None outside of a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the yearly simulation loop')
+    parser.add_argument('--quick', action='store_true', help='Run small parameter sets only')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='Run only this benchmark (repeatable)')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of repeats per benchmark')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--compare', metavar='FILE', help='Report of an earlier run to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Slowdown ratio that counts as a regression')
+    args = parser.parse_args()
+
+    results = []
+    for name in args.only or BENCHMARKS:
+        _, full, quick = BENCHMARKS[name]
+        for params in quick if args.quick else full:
+            results.append(run_benchmark(name, params, args.repeat))
+            print(f"{name} {params}: {results[-1]['seconds']:.4f}s", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": SEED,
+            "quick": args.quick,
+            "repeat": args.repeat
+        },
+        "results": results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for key, before, after in regressions:
+            print(f"Regression: {key} {before:.4f}s -> {after:.4f}s", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Cold start benchmark of the command-line interface.
+
+Every scenario starts scripts/main.py (or an import) in a fresh
+interpreter: the wall time is the fastest of several runs, and one extra
+run with `python -X importtime` breaks the import time down by module.
+The results are checked against the tracked budget in
+benchmarks/startup_budget.json: wall time, time spent importing project
+modules (their own code, not NumPy) and modules a scenario must not
+import at all, such as the event catalogue when no fantasy events are
+shown. Exits with status 1 if a budget is exceeded.
+
+Run `python -m compileall -q history_generator scripts` first when
+bytecode is not written automatically, or the compile time is measured.
+
+Usage:
+    python benchmarks/bench_startup.py [--only NAME] [--repeat N]
+                                       [--output FILE] [--budget FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(project_root, "scripts", "main.py")
+BUDGET_FILE = os.path.join(project_root, "benchmarks", "startup_budget.json")
+
+# Prefix of the project's own modules in the import breakdown
+PROJECT_PACKAGE = "history_generator"
+
+# name -> (description, interpreter arguments)
+SCENARIOS = {
+    "help": ("scripts/main.py --help", [MAIN, "--help"]),
+    "dynasty_run": ("Ten years without fantasy events shown",
+                    [MAIN, "--duration", "10", "--seed", "1"]),
+    "full_run": ("Ten years with all events shown",
+                 [MAIN, "--duration", "10", "--seed", "1", "--show-all"]),
+    "import_simulation": ("import history_generator.simulation",
+                          ["-c", "import history_generator.simulation"])
+}
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parses the output of `python -X importtime`.
+
+    Args:
+        stderr: Standard error of the process
+
+    Returns:
+        List of (module, self microseconds, cumulative microseconds, depth) in import order
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        if not self_time.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(self_time), int(cumulative), depth))
+    return imports
+
+def run_scenario(name: str, repeat: int) -> dict:
+    """Starts a scenario repeat times plus once with import timing and returns its result."""
+    _, arguments = SCENARIOS[name]
+    command = [sys.executable] + arguments
+    env = dict(os.environ, PYTHONPATH=project_root)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=project_root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True)
+        timings.append(time.perf_counter() - start)
+    process = subprocess.run([sys.executable, "-X", "importtime"] + arguments, cwd=project_root, env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    imports = parse_importtime(process.stderr)
+    project = [(module, self_time) for module, self_time, _, _ in imports
+               if module == PROJECT_PACKAGE or module.startswith(PROJECT_PACKAGE + ".")]
+    return {
+        "scenario": name,
+        "wall_ms": round(min(timings) * 1000, 1),
+        "import_ms": round(sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000, 1),
+        "project_import_ms": round(sum(self_time for _, self_time in project) / 1000, 1),
+        "numpy_import_ms": round(sum(cumulative for module, _, cumulative, _ in imports if module == "numpy") / 1000, 1),
+        "slowest_project_modules": [[module, round(self_time / 1000, 2)]
+                                    for module, self_time in sorted(project, key=lambda entry: -entry[1])[:5]],
+        "modules": sorted({module for module, _, _, _ in imports})
+    }
+
+def check_budget(result: dict, budget: dict) -> list:
+    """Returns a message for every budget the result exceeds."""
+    violations = []
+    for key in ("wall_ms", "project_import_ms"):
+        if key in budget and result[key] > budget[key]:
+            violations.append(f"{result['scenario']}: {key} {result[key]} > {budget[key]}")
+    modules = set(result["modules"])
+    for module in budget.get("forbidden_modules", []):
+        if module in modules:
+            violations.append(f"{result['scenario']}: imports {module}")
+    return violations
+
+def git_commit() -> str:
+    """Returns the current commit hash, or None outside of a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the cold start of the command-line interface')
+    parser.add_argument('--only', action='append', choices=sorted(SCENARIOS), help='Run only this scenario (repeatable)')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed starts per scenario')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--budget', default=BUDGET_FILE, help='Budget file to check against (empty to skip)')
+    args = parser.parse_args()
+
+    budgets = {}
+    if args.budget:
+        with open(args.budget) as file:
+            budgets = json.load(file)["scenarios"]
+
+    results = []
+    violations = []
+    for name in args.only or SCENARIOS:
+        result = run_scenario(name, args.repeat)
+        violations.extend(check_budget(result, budgets.get(name, {})))
+        results.append(result)
+        print(f"{name}: {result['wall_ms']:.1f}ms (imports {result['import_ms']:.1f}ms, "
+              f"project {result['project_import_ms']:.1f}ms, numpy {result['numpy_import_ms']:.1f}ms)",
+              file=sys.stderr)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat
+        },
+        "results": [{key: value for key, value in result.items() if key != "modules"} for result in results]
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    for violation in violations:
+        print(f"Over budget: {violation}", file=sys.stderr)
+    if violations:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
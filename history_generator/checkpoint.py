@@ -0,0 +1,315 @@
+import json
+import os
+import struct
+import sys
+import zlib
+from typing import Dict, List, Tuple
+import numpy as np
+from .dynasty import Dynasty
+from .event_queue import EventQueue
+from .marriage_market import MarriageCandidate, _Bucket
+from .person import Person
+from .population import GENDERS, RELATIONS, Population
+from .logger_config import world_logger
+
+# File layout: magic, format version, reserved flags, then the zlib-compressed payload
+MAGIC = b"HGCP"
+FORMAT_VERSION = 2
+_PREAMBLE = struct.Struct("<4sHH")
+_HEADER_LENGTH = struct.Struct("<I")
+
+_COLUMNS = ("birth_year", "death_year", "gender", "faction", "region", "health", "was_king", "partner_count")
+
+class CheckpointError(ValueError):
+    """Raised when a checkpoint file cannot be read."""
+
+def _encode(state: dict, arrays: Dict[str, np.ndarray]) -> bytes:
+    """
+    Packs plain state and arrays into a checkpoint payload.
+    
+    The payload is a JSON header (plain state plus name, dtype and shape of
+    every array) followed by the raw little-endian array data.
+    """
+    layout = []
+    blobs = []
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        layout.append([name, array.dtype.str, list(array.shape)])
+        blobs.append(array.tobytes())
+    header = json.dumps({"state": state, "arrays": layout}, separators=(",", ":")).encode("utf-8")
+    return _HEADER_LENGTH.pack(len(header)) + header + b"".join(blobs)
+
+def _decode(payload: bytes) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """Unpacks a checkpoint payload into plain state and arrays."""
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload)
+    offset = _HEADER_LENGTH.size
+    header = json.loads(payload[offset:offset + header_length].decode("utf-8"))
+    offset += header_length
+    arrays = {}
+    for name, dtype, shape in header["arrays"]:
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays[name] = np.frombuffer(payload, dtype=dtype, count=count, offset=offset).reshape(shape).copy()
+        offset += count * dtype.itemsize
+    return header["state"], arrays
+
+def _intern_strings(values: List[str]) -> Tuple[List[str], np.ndarray]:
+    """Splits a list of repeated strings into a table of unique strings and codes."""
+    table: Dict[str, int] = {}
+    codes = np.fromiter((table.setdefault(value, len(table)) for value in values),
+                        dtype=np.int32, count=len(values))
+    return list(table), codes
+
+def _flatten(groups: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Packs a list of ID lists into lengths and concatenated IDs."""
+    lengths = np.array([len(group) for group in groups], dtype=np.int32)
+    ids = np.fromiter((item for group in groups for item in group), dtype=np.int32, count=int(lengths.sum()))
+    return lengths, ids
+
+def _unflatten(lengths: np.ndarray, ids: np.ndarray) -> List[List[int]]:
+    """Reverses _flatten."""
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    ids = ids.tolist()
+    return [ids[bounds[index]:bounds[index + 1]] for index in range(len(lengths))]
+
+def _capture(simulation) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """Collects the complete state of a simulation as plain values and arrays."""
+    population = simulation.population
+    arrays: Dict[str, np.ndarray] = {}
+    state: dict = {
+        "year": simulation.year,
+        "end_year": simulation.end_year,
+        "seed": simulation.seed
+    }
+    
+    # Population columns, names and relations
+    for column in _COLUMNS:
+        arrays[f"population/{column}"] = population.view(column)
+    state["names"], arrays["population/names"] = _intern_strings(population.names)
+    state["factions"] = population.factions.names
+    state["regions"] = population.regions.names
+    for relation in RELATIONS:
+        adjacency = getattr(population, relation)
+        adjacency.compact()
+        arrays[f"population/{relation}/indptr"] = adjacency.indptr
+        arrays[f"population/{relation}/indices"] = adjacency.indices
+    arrays["population/death_log"] = np.array(population.death_log, dtype=np.int32)
+    
+    # Genealogy store; evicted relations stay on disk and are only referenced
+    if simulation.genealogy is not None:
+        simulation.genealogy.flush()
+        state["genealogy"] = {
+            "path": os.path.abspath(simulation.genealogy.path),
+            "eviction_batch": simulation.eviction_batch,
+            "position": simulation._eviction_position
+        }
+    
+    # Managed persons; the secondary indexes are rebuilt on resume
+    manager = simulation.person_manager
+    arrays["person_manager/ids"] = np.fromiter(manager._persons, dtype=np.int32, count=len(manager._persons))
+    state["death_log_position"] = manager._death_log_position
+    
+    # Marriage market, keeping the bucket order the partner draw depends on
+    market = simulation.marriage_market
+    arrays["marriage_market/ids"] = np.fromiter(market._candidates, dtype=np.int32, count=len(market._candidates))
+    arrays["marriage_market/expiry_years"] = np.fromiter(
+        (candidate.expiry_year for candidate in market._candidates.values()),
+        dtype=np.int32, count=len(market._candidates))
+    bucket_keys = [(GENDERS.index(gender), birth_year)
+                   for gender, buckets in market._buckets.items() for birth_year in buckets]
+    arrays["marriage_market/bucket_keys"] = np.array(bucket_keys, dtype=np.int32).reshape(-1, 2)
+    arrays["marriage_market/bucket_lengths"], arrays["marriage_market/bucket_ids"] = _flatten(
+        [bucket.ids for buckets in market._buckets.values() for bucket in buckets.values()])
+    arrays["marriage_market/expiry_keys"] = np.array(list(market._expiries), dtype=np.int32)
+    arrays["marriage_market/expiry_lengths"], arrays["marriage_market/expiry_ids"] = _flatten(
+        list(market._expiries.values()))
+        
+    # Dynasties
+    state["dynasties"] = [
+        {
+            "name": dynasty.name,
+            "founding_king": dynasty.founding_king.id,
+            "founding_queen": dynasty.founding_queen.id,
+            "monarch": dynasty.monarch.id
+        }
+        for dynasty in simulation.dynasties
+    ]
+    arrays["dynasties/family_lengths"], arrays["dynasties/family_ids"] = _flatten(
+        [[person.id for person in dynasty.family] for dynasty in simulation.dynasties])
+        
+    # Fantasy world (None if fantasy events are disabled)
+    world = simulation.fantasy_world
+    state["world"] = None
+    if world is not None:
+        queue = world.delayed_events
+        state["world"] = {
+            "year": world.year,
+            "regions": world.stats.to_dict("regions"),
+            "factions": world.stats.to_dict("factions"),
+            "delayed_events": queue.to_list(),
+            "queue_counters": [queue.max_depth, queue.scheduled, queue.popped]
+        }
+    
+    # Random streams: Mersenne Twister words plus the NumPy bit generator state
+    streams = simulation.random.streams()
+    state["streams"] = []
+    twister_words = []
+    for name, stream in streams.items():
+        version, words, gauss_next = stream.getstate()
+        twister_words.append(words)
+        state["streams"].append({
+            "name": name,
+            "version": version,
+            "gauss_next": gauss_next,
+            "generator": stream.generator.bit_generator.state
+        })
+    arrays["streams/twister"] = np.array(twister_words, dtype=np.uint32).reshape(len(streams), -1)
+    return state, arrays
+
+def save_checkpoint(simulation, path: str) -> None:
+    """
+    Writes the complete state of a simulation to a checkpoint file.
+    
+    The file is written to a temporary name first and then moved into
+    place, so an interrupted write never replaces a valid checkpoint.
+    
+    Args:
+        simulation: The simulation to save
+        path: Path of the checkpoint file
+    """
+    state, arrays = _capture(simulation)
+    data = _PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0) + zlib.compress(_encode(state, arrays), 6)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(data)
+    os.replace(temporary_path, path)
+    world_logger.info("Saved checkpoint of year %d to %s", simulation.year, path)
+
+def read_checkpoint(path: str) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """
+    Reads and validates a checkpoint file.
+    
+    Args:
+        path: Path of the checkpoint file
+        
+    Returns:
+        The plain state and the arrays stored in the checkpoint
+        
+    Raises:
+        CheckpointError: If the file is not a checkpoint, has an unsupported
+            format version or is corrupt
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _PREAMBLE.size:
+        raise CheckpointError(f"{path} is not a checkpoint file")
+    magic, version, _ = _PREAMBLE.unpack_from(data)
+    if magic != MAGIC:
+        raise CheckpointError(f"{path} is not a checkpoint file")
+    if version != FORMAT_VERSION:
+        raise CheckpointError(f"Unsupported checkpoint format version {version} (expected {FORMAT_VERSION})")
+    try:
+        return _decode(zlib.decompress(data[_PREAMBLE.size:]))
+    except (zlib.error, struct.error, ValueError, KeyError) as e:
+        raise CheckpointError(f"Corrupt checkpoint {path}: {e}")
+
+def _restore_population(population: Population, state: dict, arrays: Dict[str, np.ndarray]) -> None:
+    """Loads the stored rows into an empty population."""
+    size = len(arrays["population/names"])
+    while population._capacity < size:
+        population._grow()
+    for column in _COLUMNS:
+        getattr(population, column)[:size] = arrays[f"population/{column}"]
+    population._size = size
+    names = [sys.intern(name) for name in state["names"]]
+    population.names = [names[code] for code in arrays["population/names"].tolist()]
+    for name in state["factions"]:
+        population.factions.code(name)
+    for name in state["regions"]:
+        population.regions.code(name)
+    for relation in RELATIONS:
+        adjacency = getattr(population, relation)
+        adjacency.indptr = arrays[f"population/{relation}/indptr"]
+        adjacency.indices = arrays[f"population/{relation}/indices"]
+    population.death_log = arrays["population/death_log"].tolist()
+
+def load_checkpoint(path: str, simulation_class):
+    """
+    Rebuilds a simulation from a checkpoint file.
+    
+    The resumed simulation continues exactly like the one that was saved,
+    including the state of every random stream.
+    
+    Args:
+        path: Path of the checkpoint file
+        simulation_class: The simulation class to instantiate
+        
+    Returns:
+        The restored simulation
+        
+    Raises:
+        CheckpointError: If the file cannot be read
+    """
+    state, arrays = read_checkpoint(path)
+    simulation = simulation_class(start_year=state["year"], duration=state["end_year"] - state["year"],
+                                  seed=state["seed"], fantasy_events=state["world"] is not None)
+    population = simulation.population
+    _restore_population(population, state, arrays)
+    
+    # Genealogy store, forgetting persons evicted after the checkpoint was taken
+    genealogy = state.get("genealogy")
+    if genealogy is not None:
+        store = simulation.enable_genealogy(genealogy["path"], genealogy["eviction_batch"])
+        store.retain(population.death_log[:genealogy["position"]])
+        simulation._eviction_position = genealogy["position"]
+    
+    # Random streams
+    for index, stream_state in enumerate(state["streams"]):
+        stream = simulation.random.stream(stream_state["name"])
+        stream.setstate((stream_state["version"], tuple(arrays["streams/twister"][index].tolist()),
+                         stream_state["gauss_next"]))
+        stream.generator.bit_generator.state = stream_state["generator"]
+        
+    # Managed persons
+    manager = simulation.person_manager
+    for person_id in arrays["person_manager/ids"].tolist():
+        manager.add_person(Person.view(population, person_id))
+    manager._death_log_position = state["death_log_position"]
+    
+    # Marriage market
+    market = simulation.marriage_market
+    for person_id, expiry_year in zip(arrays["marriage_market/ids"].tolist(),
+                                      arrays["marriage_market/expiry_years"].tolist()):
+        market._candidates[person_id] = MarriageCandidate(Person.view(population, person_id), expiry_year)
+    bucket_ids = _unflatten(arrays["marriage_market/bucket_lengths"], arrays["marriage_market/bucket_ids"])
+    for (gender, birth_year), ids in zip(arrays["marriage_market/bucket_keys"].tolist(), bucket_ids):
+        bucket = _Bucket()
+        for person_id in ids:
+            bucket.add(person_id)
+        market._buckets[GENDERS[gender]][birth_year] = bucket
+    expiry_ids = _unflatten(arrays["marriage_market/expiry_lengths"], arrays["marriage_market/expiry_ids"])
+    market._expiries = dict(zip(arrays["marriage_market/expiry_keys"].tolist(), expiry_ids))
+    
+    # Dynasties
+    family_ids = _unflatten(arrays["dynasties/family_lengths"], arrays["dynasties/family_ids"])
+    for dynasty_state, family in zip(state["dynasties"], family_ids):
+        name = dynasty_state["name"]
+        dynasty = Dynasty(name, Person.view(population, dynasty_state["founding_king"]),
+                          Person.view(population, dynasty_state["founding_queen"]),
+                          simulation.random.stream(f"dynasty/{name}"))
+        dynasty.monarch = Person.view(population, dynasty_state["monarch"])
+        dynasty.set_family(Person.view(population, person_id) for person_id in family)
+        simulation.dynasties.append(dynasty)
+        
+    # Fantasy world
+    world_state = state["world"]
+    if world_state is not None:
+        world = simulation.fantasy_world
+        world.year = world_state["year"]
+        world.regions = world_state["regions"]
+        world.factions = world_state["factions"]
+        world.delayed_events = EventQueue.from_list(world_state["delayed_events"])
+        world.delayed_events.max_depth, world.delayed_events.scheduled, world.delayed_events.popped = \
+            world_state["queue_counters"]
+    world_logger.info("Resumed simulation at year %d from %s", simulation.year, path)
+    return simulation
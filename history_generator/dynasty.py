@@ -1,11 +1,127 @@
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
 from .person import Person
+from .population import FEMALE, NO_YEAR
+from .succession import Family, HeirIndex
+from .genealogy import family_tree
 from .marriage_market import MarriageMarket
-from .events import SuccessionEvent, NoSuccessorEvent, DeathEvent, MarriageEvent, BirthEvent, Event
+from .events import SuccessionEvent, NoSuccessorEvent, DeathEvent, MarriageEvent, BirthEvent, Event, EventTypes, wants
 from .logger_config import world_logger
 from .config.settings import MARRIAGE, CHILDBIRTH
 import random
 
+# Kinds of plan steps
+EVENT_STEP = 0
+MARRIAGE_STEP = 1
+BIRTH_STEP = 2
+SUCCESSION_STEP = 3
+
+@dataclass
+class FamilySnapshot:
+    """
+    Plain-value copy of a dynasty's family at the start of a year.
+    
+    Holds everything the planning step reads, so a year is planned from
+    plain values before any change is applied. Applying the plans in
+    dynasty order keeps the heir index and the genealogy in step with the
+    shared population.
+    
+    Attributes:
+        name: Name of the dynasty
+        monarch: ID of the current monarch
+        ids: IDs of the family members in family order
+        names: Name per member
+        birth_years: Year of birth per member
+        dead: Whether each member is dead
+        married: Whether each member has a partner
+        partners: Member index -> (ID, name) of the first living partner, for living married women
+    """
+    name: str
+    monarch: int
+    ids: List[int]
+    names: List[str]
+    birth_years: List[int]
+    dead: List[bool]
+    married: List[bool]
+    partners: Dict[int, Tuple[int, str]] = field(default_factory=dict)
+
+@dataclass
+class YearPlan:
+    """
+    Outcome of planning one dynasty year.
+    
+    Attributes:
+        removed: IDs of dead members leaving the family
+        steps: Ordered steps: (EVENT_STEP, event), (MARRIAGE_STEP, person_id),
+            (BIRTH_STEP, mother_id, father_id, child_gender, child_name)
+            or (SUCCESSION_STEP, monarch_id)
+    """
+    removed: List[int] = field(default_factory=list)
+    steps: List[tuple] = field(default_factory=list)
+
+def plan_year(snapshot: FamilySnapshot, year: int, rng, event_types: EventTypes = None) -> YearPlan:
+    """
+    Plans a dynasty year from a family snapshot.
+    
+    Decides deaths, who seeks a partner and which couples have a child,
+    drawing only from the dynasty's random stream. Partner matching, the
+    creation of children and finding the heir of a deceased monarch are
+    left to Dynasty.apply_plan, so the plan only depends on the dynasty
+    itself. Couples married this
+    year have their first chance of a child in the next year.
+    
+    Args:
+        snapshot: The family at the start of the year
+        year: The current year
+        rng: Random stream of the dynasty
+        event_types: Event classes to produce (all if None)
+        
+    Returns:
+        The plan of the year
+    """
+    plan = YearPlan()
+    want_deaths = wants(event_types, DeathEvent)
+    birth_years = snapshot.birth_years
+    dead = snapshot.dead
+    
+    # Process each family member
+    for index, person_id in enumerate(snapshot.ids):
+        age = year - birth_years[index]
+        
+        # Check for death
+        if dead[index]:
+            if want_deaths:
+                plan.steps.append((EVENT_STEP, DeathEvent(
+                    year=year,
+                    person_name=snapshot.names[index],
+                    age=age,
+                    person_id=person_id
+                )))
+            plan.removed.append(person_id)
+            
+            # Handle succession if monarch dies
+            if person_id == snapshot.monarch:
+                plan.steps.append((SUCCESSION_STEP, person_id))
+            continue
+            
+        # Handle marriage
+        if (not snapshot.married[index] and
+            age >= MARRIAGE["min_age"] and
+            rng.random() < MARRIAGE["marriage_chance_base"] +
+                (age - MARRIAGE["min_age"]) * MARRIAGE["marriage_chance_increase"]):
+            plan.steps.append((MARRIAGE_STEP, person_id))
+            
+        # Handle childbirth of women with a living partner
+        partner = snapshot.partners.get(index)
+        if partner is not None and CHILDBIRTH["min_age"] < age < CHILDBIRTH["max_age"]:
+            if rng.random() < CHILDBIRTH["chance"]:
+                # Choose random gender
+                child_gender = rng.choice(["male", "female"])
+                child_name = Person.generate_random_name(child_gender, rng)
+                plan.steps.append((BIRTH_STEP, person_id, partner[0], child_gender, child_name))
+                
+    return plan
+
 class Dynasty:
     """
     Represents a noble dynasty in the simulation.
@@ -15,10 +131,12 @@ class Dynasty:
         founding_king: The first king of the dynasty
         founding_queen: The first queen of the dynasty
         monarch: The current monarch
-        family: List of all family members
+        family: All living family members in the order they joined
+        heirs: Living men of the family who never reigned, oldest first
+        rng: Random stream of the dynasty
     """
     
-    def __init__(self, name: str, king: Person, queen: Person):
+    def __init__(self, name: str, king: Person, queen: Person, rng=None):
         """
         Initializes a new dynasty.
         
@@ -26,160 +144,213 @@ class Dynasty:
             name: Name of the dynasty
             king: The founding king
             queen: The founding queen
+            rng: Random stream of the dynasty (the random module if None)
         """
+        self.rng = rng if rng is not None else random
         self.name = name
         self.founding_king = king
         self.founding_queen = queen
         self.monarch = king  # Only one monarch
         self.monarch.was_king = True
-        self.family = [king, queen]
-        world_logger.info(f"Created new dynasty: {name}")
+        self.set_family([king, queen])
+        world_logger.info("Created new dynasty: %s", name)
+
+    def set_family(self, members: Iterable[Person]) -> None:
+        """
+        Replaces the family and rebuilds the heir index.
+        
+        Args:
+            members: The living members in the order they joined
+        """
+        self.family = Family()
+        self.heirs = HeirIndex()
+        for person in members:
+            self.add_member(person)
+            
+    def add_member(self, person: Person) -> None:
+        """
+        Adds a person to the family, and to the heirs if he may inherit.
+        
+        Args:
+            person: The new member
+        """
+        self.family.append(person)
+        if person.gender == "male" and not person.was_king:
+            self.heirs.add(person.id, person.birth_year)
+            
+    def remove_member(self, person: Person) -> None:
+        """
+        Removes a deceased person from the family and the heirs in O(1).
+        
+        Args:
+            person: The member to remove
+        """
+        self.family.remove(person)
+        self.heirs.discard(person.id)
+        
+    def succeed(self, year: int) -> Event:
+        """
+        Crowns the heir after the monarch died.
+        
+        The heir is the oldest man of the family who never reigned and was
+        born before the year of succession; dead members must have been
+        removed before.
+        
+        Args:
+            year: The year of succession
+            
+        Returns:
+            A succession event, or a no-successor event if there is no heir
+        """
+        old_monarch = self.monarch
+        heir = self.heirs.peek()
+        if heir is None or heir[1] >= year:
+            return NoSuccessorEvent(
+                year=year,
+                monarch_name=old_monarch.name,
+                is_king=True,
+                dynasty_name=self.name
+            )
+        self.heirs.pop()
+        self.monarch = Person.view(old_monarch.population, heir[0])
+        self.monarch.was_king = True
+        return SuccessionEvent(
+            year=year,
+            old_monarch=old_monarch.name,
+            new_monarch=self.monarch.name,
+            is_king=True,
+            dynasty_name=self.name,
+            new_monarch_id=self.monarch.id
+        )
 
-    def simulate_year(self, year: int, marriage_market: MarriageMarket) -> List[Event]:
+    def simulate_year(self, year: int, marriage_market: MarriageMarket,
+                      event_types: EventTypes = None) -> List[Event]:
         """
         Simulates a year for the dynasty.
         
+        The year is planned from a snapshot of the family with the dynasty's
+        own random stream and then applied against the shared marriage
+        market.
+        
         Args:
             year: The current year
             marriage_market: The marriage market for finding partners
+            event_types: Event classes to produce (all if None); the simulation
+                itself is the same, unwanted events are just not built
             
         Returns:
             List of events that occurred during the year
         """
-        events = []
+        plan = plan_year(self.snapshot(), year, self.rng, event_types)
+        return self.apply_plan(plan, year, marriage_market, event_types)
         
-        # Process each family member
-        for person in self.family[:]:  # Copy list to allow modification during iteration
-            # Check for death
-            if person.is_dead(year):
-                age = year - person.birth_year
-                events.append(DeathEvent(
-                    year=year,
-                    message=f"{person.name} has died at the age of {age}",
-                    person_name=person.name,
-                    age=age
-                ))
-                self.family.remove(person)
-                
-                # Handle succession if monarch dies
-                if person == self.monarch:
-                    succession_event = self._replace_monarch(year)
-                    if succession_event:
-                        events.append(succession_event)
+    def snapshot(self) -> FamilySnapshot:
+        """
+        Copies everything the planning step reads from the population.
+        
+        Returns:
+            Plain-value snapshot of the family
+        """
+        population = self.founding_king.population
+        ids = self.family.ids()
+        # Families are small, so scalar reads beat gathering every column with NumPy
+        death_year = population.death_year.item
+        health = population.health.item
+        dead = [death_year(person_id) != NO_YEAR or health(person_id) <= 0 for person_id in ids]
+        married = [population.partner_count.item(person_id) > 0 for person_id in ids]
+        
+        # First living partner of every woman who may have a child this year
+        partners = {}
+        gender = population.gender.item
+        for index, person_id in enumerate(ids):
+            if dead[index] or not married[index] or gender(person_id) != FEMALE:
                 continue
+            for partner_id in population.partners.neighbors(person_id):
+                if death_year(partner_id) == NO_YEAR and health(partner_id) > 0:
+                    partners[index] = (partner_id, population.names[partner_id])
+                    break
+        return FamilySnapshot(
+            name=self.name,
+            monarch=self.monarch.id,
+            ids=ids,
+            names=[population.names[person_id] for person_id in ids],
+            birth_years=[population.birth_year.item(person_id) for person_id in ids],
+            dead=dead,
+            married=married,
+            partners=partners
+        )
+        
+    def apply_plan(self, plan: YearPlan, year: int, marriage_market: MarriageMarket,
+                   event_types: EventTypes = None) -> List[Event]:
+        """
+        Applies a planned year to the dynasty and the shared population.
+        
+        Marriages are matched against the marriage market and children are
+        added to the population in plan order, so applying the plans of all
+        dynasties in a fixed order gives the same world no matter where
+        they were planned.
+        
+        Args:
+            plan: The plan of the year
+            year: The current year
+            marriage_market: The marriage market for finding partners
+            event_types: Event classes to produce (all if None)
             
-            # Handle marriage
-            if (len(person.partners) == 0 and 
-                year - person.birth_year >= MARRIAGE["min_age"] and 
-                random.random() < MARRIAGE["marriage_chance_base"] + 
-                    (year - person.birth_year - MARRIAGE["min_age"]) * MARRIAGE["marriage_chance_increase"]):
-                partner = marriage_market.find_partner(person)
+        Returns:
+            List of events that occurred during the year
+        """
+        population = self.founding_king.population
+        for person_id in plan.removed:
+            self.remove_member(Person.view(population, person_id))
+            
+        events = []
+        want_marriages = wants(event_types, MarriageEvent)
+        want_births = wants(event_types, BirthEvent)
+        for step in plan.steps:
+            if step[0] == EVENT_STEP:
+                events.append(step[1])
+            elif step[0] == SUCCESSION_STEP:
+                succession_event = self.succeed(year)
+                if wants(event_types, type(succession_event)):
+                    events.append(succession_event)
+            elif step[0] == MARRIAGE_STEP:
+                person = Person.view(population, step[1])
+                partner = marriage_market.find_partner(person, year)
                 if partner:
                     person.marry(partner)
                     marriage_market.remove(partner)
-                    events.append(MarriageEvent(
-                        year=year,
-                        message=f"{person.name} marries {partner.name}",
-                        person1=person.name,
-                        person2=partner.name,
-                        age=year - person.birth_year
-                    ))
-            
-            # Handle childbirth
-            if person.can_have_child(year):
-                # Find living partner
-                living_partners = [p for p in person.partners if not p.is_dead(year)]
-                if living_partners:
-                    if random.random() < CHILDBIRTH["chance"]:
-                        # Choose random gender
-                        child_gender = random.choice(["male", "female"])
-                        child_name = Person.generate_random_name(child_gender)
-                        child = Person(child_name, child_gender, year, person.faction, person.region)
-                        
-                        # Add child to both parents
-                        person.children.append(child)
-                        living_partners[0].children.append(child)
-                        self.family.append(child)
-                        
-                        events.append(BirthEvent(
+                    if want_marriages:
+                        events.append(MarriageEvent(
                             year=year,
-                            message=f"{person.name} and {living_partners[0].name} have a new child: {child_name}",
-                            child_name=child_name,
-                            mother_name=person.name if person.gender == "female" else living_partners[0].name,
-                            father_name=person.name if person.gender == "male" else living_partners[0].name
+                            person1=person.name,
+                            person2=partner.name,
+                            age=year - person.birth_year,
+                            person1_id=person.id,
+                            person2_id=partner.id
                         ))
-
-        return events
-
-    def _replace_monarch(self, year: int) -> Optional[Event]:
-        """
-        Replaces the monarch after death.
-        
-        Args:
-            year: The current year
+            else:
+                _, mother_id, father_id, child_gender, child_name = step
+                mother = Person.view(population, mother_id)
+                father = Person.view(population, father_id)
+                child = Person(child_name, child_gender, year, mother.faction, mother.region,
+                               population=population)
             
-        Returns:
-            A succession event or None if no successor is found
-        """
-        # Find oldest living male child
-        successor = None
-        for person in self.family:
-            if (person.gender == "male" and 
-                not person.is_dead(year) and 
-                not getattr(person, 'was_king', False) and
-                (successor is None or person.birth_year < successor.birth_year)):
-                successor = person
-
-        if successor:
-            old_monarch = self.monarch.name
-            self.monarch = successor
-            successor.was_king = True
-            # Add crown to the new monarch
-            self.monarch.was_king = True
-            return SuccessionEvent(
-                year=year,
-                message=f"{successor.name} becomes the new monarch of {self.name}",
-                old_monarch=old_monarch,
-                new_monarch=successor.name,
-                is_king=True
-            )
-        else:
-            return NoSuccessorEvent(
-                year=year,
-                message=f"Dynasty {self.name} has no eligible successor",
-                monarch_name=self.monarch.name,
-                is_king=True
-            )
+                # Add child to both parents
+                mother.add_child(child)
+                father.add_child(child)
+                self.add_member(child)
+                        
+                if want_births:
+                    events.append(BirthEvent(
+                        year=year,
+                        child_name=child_name,
+                        mother_name=mother.name,
+                        father_name=father.name,
+                        child_id=child.id
+                    ))
+        return events
 
     def show_family_tree(self):
         print(f"\nFamily tree of the {self.name} dynasty:")
-        self._show_family_tree(self.founding_king, 0)
-
-    def _show_family_tree(self, person, level, shown_persons=None):
-        if shown_persons is None:
-            shown_persons = set()
-            
-        if person in shown_persons:
-            return
-            
-        shown_persons.add(person)
-        
-        status = "†" if person.is_dead() else ""
-        crown = "👑 " if getattr(person, 'was_king', False) else ""
-        gender = "♂ " if person.gender == "male" else "♀ "
-        symbol = "├──" if level > 0 else ""
-        year_info = f"{person.birth_year}–{person.death_year}" if person.death_year else f"{person.birth_year}–"
-        output = "  " * level + f"{symbol}{crown}{gender}{person.name} ({status}{year_info})"
-        if person.partners:
-            partner_infos = []
-            for p in person.partners:
-                p_gender = "♂ " if p.gender == "male" else "♀ "
-                p_status = "†" if p.is_dead() else ""
-                p_year_info = f"{p.birth_year}–{p.death_year}" if p.death_year else f"{p.birth_year}–"
-                partner_infos.append(f"{p_gender}{p.name} ({p_status}{p_year_info})")
-            output += " ⚭ " + ", ".join(partner_infos)
-        print(output)
-        
-        # Show children
-        for child in person.children:
-            self._show_family_tree(child, level + 1, shown_persons)
+        for line in family_tree(self.founding_king.population, self.founding_king.id):
+            print(line)
@@ -0,0 +1,237 @@
+import math
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from .event_processor import EventProcessor
+from .fantasy_events import FantasyEvent
+from .fantasy_world import EVENT_FILE
+from .simulation import Simulation
+
+DEFAULT_DYNASTIES = ("House Nerdival",)
+
+@dataclass
+class WorldSummary:
+    """
+    Compact result of one simulated world.
+    
+    Only plain values are kept, so summaries are cheap to send between
+    processes instead of the simulation's object graph.
+    
+    Attributes:
+        seed: Seed the world was simulated with
+        start_year: First simulated year
+        years: Number of simulated years
+        dynasties: Per dynasty: survived (monarch alive at the end) and living members
+        event_types: Number of events per event class
+        fantasy_events: Number of fantasy events per event name
+        stat_trajectories: Per stat ("regions/<name>/<stat>" or "factions/<name>/<stat>"), the value after each year
+    """
+    seed: int
+    start_year: int
+    years: int
+    dynasties: Dict[str, dict] = field(default_factory=dict)
+    event_types: Dict[str, int] = field(default_factory=dict)
+    fantasy_events: Dict[str, int] = field(default_factory=dict)
+    stat_trajectories: Dict[str, List[int]] = field(default_factory=dict)
+
+def derive_seeds(n_worlds: int, base_seed: int = 0) -> List[int]:
+    """
+    Derives independent, deterministic per-world seeds from one base seed.
+    
+    Args:
+        n_worlds: Number of worlds
+        base_seed: Seed of the whole ensemble
+        
+    Returns:
+        List of per-world seeds
+    """
+    return [int(seed) for seed in np.random.SeedSequence(base_seed).generate_state(n_worlds, dtype=np.uint64)]
+
+def run_world(seed: int, years: int, start_year: int = 1000,
+              dynasty_names: Sequence[str] = DEFAULT_DYNASTIES) -> WorldSummary:
+    """
+    Simulates one world and summarizes it.
+    
+    Args:
+        seed: Seed for the world
+        years: Number of years to simulate
+        start_year: First year of the simulation
+        dynasty_names: Names of the dynasties to found
+        
+    Returns:
+        The summary of the world
+    """
+    sim = Simulation(start_year=start_year, duration=years, seed=seed)
+    for name in dynasty_names:
+        sim.create_dynasty(name)
+        
+    summary = WorldSummary(seed=seed, start_year=start_year, years=years)
+    world = sim.fantasy_world
+    snapshots = []
+    while sim.year < sim.end_year:
+        for event in sim.simulate_year():
+            event_type = type(event).__name__
+            summary.event_types[event_type] = summary.event_types.get(event_type, 0) + 1
+            if isinstance(event, FantasyEvent):
+                summary.fantasy_events[event.name] = summary.fantasy_events.get(event.name, 0) + 1
+        snapshots.append(world.stats.snapshot())
+        sim.increment_year()
+        
+    # Stats created by an effect are 0 in the snapshots of the years before
+    stats = world.stats
+    trajectories = stats.stack(snapshots)
+    for row, column in zip(*stats.present.nonzero()):
+        section, name = stats.layout.entities[row]
+        stat = stats.layout.stats[column]
+        summary.stat_trajectories[f"{section}/{name}/{stat}"] = trajectories[:, row, column].tolist()
+        
+    for dynasty in sim.dynasties:
+        summary.dynasties[dynasty.name] = {
+            "survived": not dynasty.monarch.is_dead(),
+            "members": len(dynasty.family)
+        }
+    return summary
+
+def _run_world_task(task: tuple) -> WorldSummary:
+    return run_world(*task)
+
+def warm_catalogue_cache() -> None:
+    """
+    Validates the bundled event catalogue in this process.
+    
+    This writes the catalogue's binary form next to the event file, so
+    workers started afterwards skip validation. It does not share memory:
+    every worker still holds its own parsed definitions and compiled
+    events (about 270 KiB for the bundled catalogue), and forked workers
+    copy the inherited pages as soon as reference counts change. Worker
+    memory therefore grows with the number of workers and is dominated by
+    the interpreter and NumPy (about 28 MiB peak RSS per worker).
+    """
+    EventProcessor(EVENT_FILE)
+
+def iter_ensemble(n_worlds: int, seeds: Optional[Sequence[int]] = None, years: int = 50,
+                  workers: Optional[int] = None, start_year: int = 1000,
+                  dynasty_names: Sequence[str] = DEFAULT_DYNASTIES,
+                  base_seed: int = 0) -> Iterator[WorldSummary]:
+    """
+    Simulates many independent worlds and yields their summaries as they finish.
+    
+    Worlds are fanned out over a process pool; results are yielded in seed
+    order, and each world only depends on its own seed, so the output does
+    not depend on the number of workers. The event catalogue is validated
+    once in the parent (see warm_catalogue_cache), which saves validation
+    time in the workers but not memory: each worker keeps its own copy.
+    
+    Args:
+        n_worlds: Number of worlds to simulate
+        seeds: Per-world seeds (derived from base_seed if None)
+        years: Number of years per world
+        workers: Number of worker processes (CPU count if None, 1 runs inline)
+        start_year: First year of every simulation
+        dynasty_names: Names of the dynasties to found in every world
+        base_seed: Seed to derive per-world seeds from
+        
+    Yields:
+        One WorldSummary per world
+    """
+    if seeds is None:
+        seeds = derive_seeds(n_worlds, base_seed)
+    elif len(seeds) != n_worlds:
+        raise ValueError(f"Expected {n_worlds} seeds, got {len(seeds)}")
+    tasks = [(seed, years, start_year, tuple(dynasty_names)) for seed in seeds]
+    
+    workers = workers or multiprocessing.cpu_count()
+    if workers <= 1 or n_worlds <= 1:
+        for task in tasks:
+            yield _run_world_task(task)
+        return
+    warm_catalogue_cache()
+    with multiprocessing.Pool(processes=min(workers, n_worlds)) as pool:
+        yield from pool.imap(_run_world_task, tasks, chunksize=1)
+
+class EnsembleStatistics:
+    """
+    Aggregates world summaries into ensemble-wide statistics.
+    
+    Summaries are added one at a time, so results can be aggregated while
+    they stream in without keeping them all.
+    """
+    
+    def __init__(self):
+        """Initializes empty statistics."""
+        self.worlds = 0
+        self._survivals: Dict[str, int] = {}
+        self._members: Dict[str, int] = {}
+        self._event_types: Dict[str, int] = {}
+        self._fantasy_events: Dict[str, int] = {}
+        # Per stat: running sums of values and squared values per year
+        self._stat_sums: Dict[str, np.ndarray] = {}
+        self._stat_squares: Dict[str, np.ndarray] = {}
+        
+    def add(self, summary: WorldSummary) -> None:
+        """
+        Adds the summary of one world.
+        
+        Args:
+            summary: The world summary
+        """
+        self.worlds += 1
+        for name, dynasty in summary.dynasties.items():
+            self._survivals[name] = self._survivals.get(name, 0) + int(dynasty["survived"])
+            self._members[name] = self._members.get(name, 0) + dynasty["members"]
+        for counts, target in ((summary.event_types, self._event_types),
+                               (summary.fantasy_events, self._fantasy_events)):
+            for key, count in counts.items():
+                target[key] = target.get(key, 0) + count
+        for key, values in summary.stat_trajectories.items():
+            values = np.asarray(values, dtype=np.float64)
+            if key not in self._stat_sums:
+                self._stat_sums[key] = np.zeros_like(values)
+                self._stat_squares[key] = np.zeros_like(values)
+            self._stat_sums[key] += values
+            self._stat_squares[key] += values * values
+            
+    def to_dict(self) -> dict:
+        """
+        Returns the aggregated statistics.
+        
+        Returns:
+            Dictionary with dynasty survival rates and mean living members,
+            mean event frequencies per world, and mean/standard deviation of
+            every stat per year
+        """
+        worlds = max(self.worlds, 1)
+        trajectories = {}
+        for key, sums in self._stat_sums.items():
+            mean = sums / worlds
+            variance = np.maximum(self._stat_squares[key] / worlds - mean * mean, 0.0)
+            trajectories[key] = {
+                "mean": [round(value, 4) for value in mean.tolist()],
+                "std": [round(math.sqrt(value), 4) for value in variance.tolist()]
+            }
+        return {
+            "worlds": self.worlds,
+            "dynasty_survival": {name: survived / worlds for name, survived in self._survivals.items()},
+            "dynasty_members": {name: members / worlds for name, members in self._members.items()},
+            "event_types_per_world": {key: count / worlds for key, count in sorted(self._event_types.items())},
+            "fantasy_events_per_world": {key: count / worlds for key, count in sorted(self._fantasy_events.items())},
+            "stat_trajectories": trajectories
+        }
+
+def run_ensemble(n_worlds: int, seeds: Optional[Sequence[int]] = None, years: int = 50,
+                 workers: Optional[int] = None, start_year: int = 1000,
+                 dynasty_names: Sequence[str] = DEFAULT_DYNASTIES,
+                 base_seed: int = 0) -> EnsembleStatistics:
+    """
+    Simulates many independent worlds and aggregates their summaries.
+    
+    See iter_ensemble for the arguments.
+    
+    Returns:
+        The aggregated statistics
+    """
+    statistics = EnsembleStatistics()
+    for summary in iter_ensemble(n_worlds, seeds, years, workers, start_year, dynasty_names, base_seed):
+        statistics.add(summary)
+    return statistics
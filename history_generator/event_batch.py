@@ -0,0 +1,326 @@
+from typing import Dict, List, Mapping, Optional, Tuple
+import numpy as np
+from .event_compiler import OPERATORS, CompiledEvent
+from .rng import RandomStream
+from .world_stats import SECTIONS, STAT_MAX, STAT_MIN, WorldStats, is_whole
+
+# NumPy counterparts of the condition operators
+_UFUNCS = {
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal
+}
+
+class _Clauses:
+    """The conditions of one event, split into stat comparisons and checks that are the same for all worlds."""
+    
+    __slots__ = ("never", "stats", "years", "seasons")
+    
+    def __init__(self):
+        self.never = False
+        # (section, name, stat, operator, value) per stat condition
+        self.stats: List[Tuple[str, str, str, str, object]] = []
+        # (operator, value) per year and season condition
+        self.years: List[Tuple[str, object]] = []
+        self.seasons: List[Tuple[str, object]] = []
+        
+    def add(self, condition: Mapping, common_conditions: Dict[str, dict]) -> None:
+        """Adds a condition, resolving common conditions like compile_condition."""
+        condition_type = condition.get("type")
+        if condition_type == "common":
+            common_condition = common_conditions.get(condition.get("value"))
+            if common_condition:
+                self.add(common_condition, common_conditions)
+            else:
+                self.never = True
+            return
+            
+        operator_symbol = condition.get("operator")
+        if operator_symbol not in OPERATORS:
+            self.never = True
+        elif condition_type == "year":
+            self.years.append((operator_symbol, condition.get("value", 0)))
+        elif condition_type == "season":
+            self.seasons.append((operator_symbol, condition.get("value")))
+        elif condition_type == "region":
+            self.stats.append(("regions", condition.get("region"), condition.get("stat"),
+                               operator_symbol, condition.get("value", 0)))
+        elif condition_type == "faction":
+            self.stats.append(("factions", condition.get("faction"), condition.get("stat"),
+                               operator_symbol, condition.get("value", 0)))
+        else:
+            self.never = True
+            
+    def holds(self, year: int, season) -> bool:
+        """Evaluates the year and season conditions, which are shared by all worlds of a batch."""
+        if self.never:
+            return False
+        for operator_symbol, value in self.years:
+            if not OPERATORS[operator_symbol](year, value):
+                return False
+        for operator_symbol, value in self.seasons:
+            if season is None or not OPERATORS[operator_symbol](season, value):
+                return False
+        return True
+
+class BatchEventProcessor:
+    """
+    Processes the events of many worlds at once.
+    
+    The stats of all worlds are one (world x stat) array whose columns are
+    the cells of a WorldStats layout. For every category, the stat
+    conditions of all its events are evaluated for all worlds in one
+    comparison per operator, and a matrix product with the event/condition
+    incidence turns the results into a (world x event) eligibility mask.
+    Every world then picks one eligible event uniformly, effects are
+    applied to all worlds that picked an event at once, and follow-ups are
+    triggered or scheduled per picked event for all affected worlds.
+    
+    Categories are processed in order and see the effects of earlier
+    categories, delayed follow-ups are processed first, and effects are
+    clamped after each effect, all as in EventProcessor.process_events.
+    The random draws differ, so a batch matches the single-world processor
+    in distribution, not world by world.
+    
+    Attributes:
+        events: Compiled events, one per column of the results
+        event_ids: ID per event column
+        stats: The layout owner; its values are the initial stats of every world
+        values: Stat values (world x cell)
+        present: Whether a world has a stat (world x cell)
+    """
+    
+    def __init__(self, compiled_events: Dict[str, List[CompiledEvent]], common_conditions: Dict[str, dict],
+                 stats: WorldStats, n_worlds: int, rng: Optional[RandomStream] = None):
+        """
+        Sets up a batch of identical worlds.
+        
+        Args:
+            compiled_events: Compiled events per category
+            common_conditions: Named reusable conditions
+            stats: Initial stats of every world
+            n_worlds: Number of worlds
+            rng: Random stream whose NumPy generator makes all draws (fresh entropy if None)
+        """
+        self.rng = rng if rng is not None else RandomStream()
+        self.events: List[CompiledEvent] = [event for events in compiled_events.values() for event in events]
+        self.event_ids = [event.event_id for event in self.events]
+        definitions = {"events": {}}
+        for event in self.events:
+            definitions["events"].setdefault(event.category, {})[event.event_id] = event.data
+        # Lay out every stat the events read or change
+        self.stats = WorldStats.from_sections({section: stats.to_dict(section) for section in SECTIONS}, definitions)
+        self.values = np.tile(self.stats.values.reshape(-1), (n_worlds, 1))
+        self.present = np.tile(self.stats.present.reshape(-1), (n_worlds, 1))
+        
+        # Event columns per category, in definition order
+        self._categories: List[np.ndarray] = []
+        position = 0
+        for events in compiled_events.values():
+            self._categories.append(np.arange(position, position + len(events)))
+            position += len(events)
+        self._clauses = []
+        for event in self.events:
+            clauses = _Clauses()
+            for condition in event.data.get("conditions", ()):
+                clauses.add(condition, common_conditions)
+            self._clauses.append(clauses)
+        self._condition_tables = [self._compile_conditions(columns) for columns in self._categories]
+        self._compile_effects()
+        self._compile_followups()
+        # Scheduled follow-ups: trigger year -> [(worlds, event column, probability)]
+        self._delayed: Dict[int, List[Tuple[np.ndarray, int, float]]] = {}
+        
+    @property
+    def n_worlds(self) -> int:
+        """Number of worlds in the batch."""
+        return len(self.values)
+        
+    def _cell(self, section: str, name: str, stat: str) -> Optional[int]:
+        """Returns the column of a stat, or None if no event changes it and no world has it."""
+        cell = self.stats.index(section, name, stat)
+        if cell is None:
+            return None
+        return cell[0] * len(self.stats.layout.stats) + cell[1]
+        
+    def _compile_conditions(self, columns: np.ndarray) -> dict:
+        """
+        Builds the comparison tables of one category.
+        
+        Returns:
+            Cells, thresholds and clause indices per operator, the
+            clause/event incidence matrix and events that can never hold
+        """
+        cells, thresholds, operators, owners = [], [], [], []
+        never = np.zeros(len(columns), dtype=bool)
+        for local, column in enumerate(columns.tolist()):
+            clauses = self._clauses[column]
+            for section, name, stat, operator_symbol, value in clauses.stats:
+                cell = self._cell(section, name, stat)
+                if cell is None:
+                    # Unknown stats read as 0 in every world
+                    never[local] |= not OPERATORS[operator_symbol](0, value)
+                    continue
+                cells.append(cell)
+                thresholds.append(value)
+                operators.append(operator_symbol)
+                owners.append(local)
+        incidence = np.zeros((len(cells), len(columns)), dtype=np.float32)
+        incidence[np.arange(len(cells)), owners] = 1
+        groups = []
+        for operator_symbol in _UFUNCS:
+            positions = np.array([index for index, symbol in enumerate(operators) if symbol == operator_symbol],
+                                 dtype=np.int64)
+            if len(positions):
+                groups.append((_UFUNCS[operator_symbol], positions,
+                               np.array(cells, dtype=np.int64)[positions],
+                               np.array(thresholds, dtype=np.float64)[positions]))
+        return {"groups": groups, "incidence": incidence, "never": never, "size": len(cells)}
+        
+    def _compile_effects(self) -> None:
+        """Builds (event x effect position) arrays of target cells and deltas."""
+        targets = []
+        for event in self.events:
+            event_targets = []
+            for effect in event.data.get("effects", ()):
+                if effect.get("type") != "modify_stat":
+                    continue
+                if effect.get("region"):
+                    section, name = "regions", effect.get("region")
+                elif effect.get("faction"):
+                    section, name = "factions", effect.get("faction")
+                else:
+                    continue
+                event_targets.append((self._cell(section, name, effect.get("stat")), effect.get("value", 0)))
+            targets.append(event_targets)
+        width = max((len(event_targets) for event_targets in targets), default=0)
+        # Stats stay integers unless a change is not a whole number, as in WorldStats
+        if not all(is_whole(delta) for event_targets in targets for _, delta in event_targets):
+            self.values = self.values.astype(np.float64)
+        self._effect_cells = np.full((len(self.events), width), -1, dtype=np.int64)
+        self._effect_deltas = np.zeros((len(self.events), width), dtype=self.values.dtype)
+        for column, event_targets in enumerate(targets):
+            for position, (cell, delta) in enumerate(event_targets):
+                self._effect_cells[column, position] = cell
+                self._effect_deltas[column, position] = delta
+                
+    def _compile_followups(self) -> None:
+        """Resolves follow-up IDs to event columns; the first definition of an ID wins."""
+        columns_by_id: Dict[str, int] = {}
+        for column, event_id in enumerate(self.event_ids):
+            columns_by_id.setdefault(event_id, column)
+        self._followups: List[List[Tuple[int, int, float]]] = []
+        for event in self.events:
+            followups = []
+            for followup in event.data.get("followup_events", ()):
+                column = columns_by_id.get(followup["id"])
+                if column is not None:
+                    followups.append((column, followup.get("delay", 0), followup.get("probability", 0.5)))
+            self._followups.append(followups)
+            
+    def eligibility(self, category_index: int, year: int, season=None) -> np.ndarray:
+        """
+        Evaluates the events of one category for all worlds.
+        
+        Args:
+            category_index: Position of the category in the catalogue
+            year: The current year
+            season: The current season (None if worlds have no seasons)
+            
+        Returns:
+            (world x event) mask over the category's events
+        """
+        columns = self._categories[category_index]
+        table = self._condition_tables[category_index]
+        shared = np.array([self._clauses[column].holds(year, season) for column in columns.tolist()], dtype=bool)
+        shared &= ~table["never"]
+        if not table["size"]:
+            return np.broadcast_to(shared, (self.n_worlds, len(columns))).copy()
+        failed = np.empty((self.n_worlds, table["size"]), dtype=np.float32)
+        for ufunc, positions, cells, thresholds in table["groups"]:
+            failed[:, positions] = ~ufunc(self.values[:, cells], thresholds)
+        return (failed @ table["incidence"] == 0) & shared
+        
+    def _apply(self, worlds: np.ndarray, columns: np.ndarray, counts: np.ndarray) -> None:
+        """Applies the effects of one event per world, clamping after each effect."""
+        counts[worlds, columns] += 1
+        for position in range(self._effect_cells.shape[1]):
+            cells = self._effect_cells[columns, position]
+            selected = cells >= 0
+            if not selected.any():
+                break
+            rows, cells = worlds[selected], cells[selected]
+            updated = self.values[rows, cells] + self._effect_deltas[columns[selected], position]
+            self.values[rows, cells] = np.clip(updated, STAT_MIN, STAT_MAX)
+            self.present[rows, cells] = True
+            
+    def _trigger_followups(self, worlds: np.ndarray, column: int, year: int, counts: np.ndarray) -> None:
+        """Triggers or schedules the follow-ups of an event that the given worlds picked."""
+        generator = self.rng.generator
+        for target, delay, probability in self._followups[column]:
+            if delay > 0:
+                self._delayed.setdefault(year + delay, []).append((worlds, target, probability))
+            else:
+                hits = worlds[generator.random(len(worlds)) < probability]
+                if len(hits):
+                    self._apply(hits, np.full(len(hits), target), counts)
+                    
+    def process_year(self, year: int, season=None) -> np.ndarray:
+        """
+        Processes one year of events in every world.
+        
+        Args:
+            year: The current year
+            season: The current season (None if worlds have no seasons)
+            
+        Returns:
+            (world x event) counts of triggered events, in the column order of event_ids
+        """
+        generator = self.rng.generator
+        counts = np.zeros((self.n_worlds, len(self.events)), dtype=np.int32)
+        
+        # Delayed follow-ups first, including any whose year was skipped
+        for trigger_year in sorted(trigger_year for trigger_year in self._delayed if trigger_year <= year):
+            for worlds, target, probability in self._delayed.pop(trigger_year):
+                hits = worlds[generator.random(len(worlds)) < probability]
+                if len(hits):
+                    self._apply(hits, np.full(len(hits), target), counts)
+                    
+        for category_index, columns in enumerate(self._categories):
+            if not len(columns):
+                continue
+            mask = self.eligibility(category_index, year, season)
+            eligible = mask.sum(axis=1)
+            worlds = np.flatnonzero(eligible)
+            if not len(worlds):
+                continue
+            # Uniform pick: the k-th eligible event of each world
+            ranks = (generator.random(len(worlds)) * eligible[worlds]).astype(np.int64)
+            picks = columns[(mask[worlds].cumsum(axis=1) > ranks[:, None]).argmax(axis=1)]
+            self._apply(worlds, picks, counts)
+            for column in np.unique(picks).tolist():
+                if self._followups[column]:
+                    self._trigger_followups(worlds[picks == column], column, year, counts)
+        return counts
+        
+    def sections(self, world: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns the stats of one world as nested dictionaries.
+        
+        Args:
+            world: Index of the world
+            
+        Returns:
+            {section: {name: {stat: value}}}, like WorldStats.to_dict
+        """
+        stats = WorldStats(self.stats.layout)
+        shape = stats.values.shape
+        present = self.present[world].reshape(shape)
+        values = self.values[world].reshape(shape)
+        for row, column in zip(*present.nonzero()):
+            section, name = stats.layout.entities[row]
+            stats.set(section, name, stats.layout.stats[column], values[row, column].item())
+        return {section: stats.to_dict(section) for section in SECTIONS}
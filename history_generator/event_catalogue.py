@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import struct
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from .event_compiler import CompiledEvent, build_event_index, compile_events
+from .fantasy_events import DEFINITIONS
+from .logger_config import event_logger
+
+# Binary form next to the JSON file: magic, format version, reserved flags,
+# cache key, then the validated definitions as compact UTF-8 JSON. Plain
+# data only, so a planted cache file can at worst skip validation
+CACHE_SUFFIX = ".cache"
+MAGIC = b"HGEC"
+FORMAT_VERSION = 2
+_PREAMBLE = struct.Struct("<4sHH32s")
+
+class EventCatalogue:
+    """
+    Validated event definitions of one event file content.
+    
+    Catalogues are shared by every EventProcessor that loads the same
+    content, so the definitions must be treated as read-only. Compiled
+    conditions are built once per set of common conditions and shared as
+    well; they are immutable, and per-world state lives in the processor.
+    
+    Attributes:
+        digest: SHA-256 of the JSON content (empty for the empty catalogue)
+        events: The validated definitions ({"events": {category: {id: event}}})
+    """
+    
+    def __init__(self, digest: bytes, events: dict):
+        """
+        Initializes a catalogue.
+        
+        Args:
+            digest: SHA-256 of the JSON content
+            events: The validated definitions
+        """
+        self.digest = digest
+        self.events = events
+        self._compiled: Dict[str, Tuple[Dict[str, List[CompiledEvent]], Dict[str, Mapping]]] = {}
+        
+    def compiled(self, common_conditions: Dict[str, dict]):
+        """
+        Returns the compiled events and the event index for common conditions.
+        
+        Args:
+            common_conditions: Named reusable conditions
+            
+        Returns:
+            Tuple of compiled events per category and frozen definitions by ID
+        """
+        key = json.dumps(common_conditions, sort_keys=True)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled_events = compile_events(self.events, common_conditions)
+            compiled = (compiled_events, build_event_index(compiled_events))
+            # Fantasy events refer to these definitions by catalogue and event ID
+            DEFINITIONS.register(self.digest, compiled[1])
+            self._compiled[key] = compiled
+        return compiled
+
+# Process-wide catalogues by content digest
+_CATALOGUES: Dict[bytes, EventCatalogue] = {}
+
+def clear_catalogue_cache() -> None:
+    """Forgets all catalogues loaded by this process."""
+    _CATALOGUES.clear()
+
+def cache_path(path: str) -> str:
+    """Returns the path of the binary form of an event file."""
+    return path + CACHE_SUFFIX
+
+def cache_key(digest: bytes, schema_version: int) -> bytes:
+    """
+    Returns the key of the binary form of a file content.
+    
+    Args:
+        digest: SHA-256 of the JSON content
+        schema_version: Version of the validation rules the definitions passed
+        
+    Returns:
+        SHA-256 of the cache format version, the schema version and the digest
+    """
+    return hashlib.sha256(struct.pack("<HI", FORMAT_VERSION, schema_version) + digest).digest()
+
+def _read_cache(path: str, key: bytes) -> Optional[dict]:
+    """Returns the definitions from the binary form if it matches the key; any failure is a miss."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, _, stored_key = _PREAMBLE.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION or stored_key != key:
+            return None
+        events = json.loads(data[_PREAMBLE.size:].decode("utf-8"))
+        if not isinstance(events, dict):
+            raise ValueError("definitions are not a JSON object")
+        return events
+    except Exception as e:
+        event_logger.warning("Ignoring unreadable event catalogue cache %s: %s", path, e)
+        return None
+
+def _write_cache(path: str, key: bytes, events: dict) -> None:
+    """Writes the binary form; failures (e.g. a read-only data directory) are only logged."""
+    temporary_path = f"{path}.tmp"
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, key))
+            file.write(json.dumps(events, separators=(",", ":")).encode("utf-8"))
+        os.replace(temporary_path, path)
+    except OSError as e:
+        event_logger.debug("Could not write event catalogue cache %s: %s", path, e)
+
+def load_catalogue(path: str, validate: Callable[[dict], None], schema_version: int = 0) -> EventCatalogue:
+    """
+    Loads the catalogue of an event file, parsing and validating it at most once.
+    
+    The file content is hashed on every call. A catalogue with the same
+    hash that this process already loaded is returned as is. Otherwise the
+    validated binary form next to the JSON file is used if its key (the
+    hash, the cache format and the schema version) matches, and only if
+    that fails is the JSON parsed and validated (and the binary form
+    rewritten).
+    
+    Args:
+        path: Path of the JSON event file
+        validate: Raises ValueError if parsed definitions are invalid
+        schema_version: Version of the rules validate checks; changing it
+            invalidates binary forms written under other rules
+        
+    Returns:
+        The catalogue of the current file content
+        
+    Raises:
+        FileNotFoundError: When the event file cannot be found
+        json.JSONDecodeError: When the JSON file is invalid
+        ValueError: When the event definitions are invalid
+    """
+    with open(path, "r") as file:
+        text = file.read()
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    catalogue = _CATALOGUES.get(digest)
+    if catalogue is not None:
+        return catalogue
+        
+    binary_path = cache_path(path)
+    key = cache_key(digest, schema_version)
+    events = _read_cache(binary_path, key)
+    if events is None:
+        events = json.loads(text)
+        validate(events)
+        _write_cache(binary_path, key, events)
+    catalogue = EventCatalogue(digest, events)
+    _CATALOGUES[digest] = catalogue
+    return catalogue
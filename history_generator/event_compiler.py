@@ -0,0 +1,248 @@
+import math
+import operator
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Set, Tuple
+
+# A compiled predicate takes the world state and decides whether it holds
+Predicate = Callable[[dict], bool]
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le
+}
+
+_EMPTY: dict = {}
+
+def freeze(value: Any) -> Any:
+    """
+    Returns a read-only copy of a JSON-like value.
+    
+    Dictionaries become read-only mappings and lists become tuples, recursively.
+    
+    Args:
+        value: The value to freeze
+        
+    Returns:
+        The frozen value
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def _never(world_state: dict) -> bool:
+    return False
+
+def _always(world_state: dict) -> bool:
+    return True
+
+def _compile_stat_condition(section: str, key: str, stat: str, compare, value) -> Predicate:
+    """Builds a predicate for a region or faction stat with all keys resolved."""
+    # Specialize the two operators used by nearly all definitions
+    if compare is operator.ge:
+        def predicate(world_state: dict) -> bool:
+            return world_state.get(section, _EMPTY).get(key, _EMPTY).get(stat, 0) >= value
+    elif compare is operator.le:
+        def predicate(world_state: dict) -> bool:
+            return world_state.get(section, _EMPTY).get(key, _EMPTY).get(stat, 0) <= value
+    else:
+        def predicate(world_state: dict) -> bool:
+            return compare(world_state.get(section, _EMPTY).get(key, _EMPTY).get(stat, 0), value)
+    return predicate
+
+def _compile_year_condition(compare, value) -> Predicate:
+    """Builds a predicate on the current year."""
+    if compare is operator.ge:
+        def predicate(world_state: dict) -> bool:
+            return world_state.get("current_year", 0) >= value
+    else:
+        def predicate(world_state: dict) -> bool:
+            return compare(world_state.get("current_year", 0), value)
+    return predicate
+
+def _compile_season_condition(compare, value) -> Predicate:
+    """Builds a predicate on the current season; worlds without seasons never match."""
+    def predicate(world_state: dict) -> bool:
+        season = world_state.get("current_season")
+        return season is not None and compare(season, value)
+    return predicate
+
+def compile_condition(condition: dict, common_conditions: Dict[str, dict]) -> Predicate:
+    """
+    Compiles a single condition into a predicate.
+    
+    Common conditions are resolved and inlined at compile time. Unknown
+    condition types, operators and common conditions compile to a predicate
+    that is always false, mirroring the interpreter.
+    
+    Args:
+        condition: The condition definition
+        common_conditions: Named reusable conditions
+        
+    Returns:
+        A predicate on the world state
+    """
+    condition_type = condition.get("type")
+    
+    if condition_type == "common":
+        common_condition = common_conditions.get(condition.get("value"))
+        if common_condition:
+            return compile_condition(common_condition, common_conditions)
+        return _never
+        
+    compare = OPERATORS.get(condition.get("operator"))
+    if compare is None:
+        return _never
+        
+    if condition_type == "year":
+        return _compile_year_condition(compare, condition.get("value", 0))
+    elif condition_type == "season":
+        return _compile_season_condition(compare, condition.get("value"))
+    elif condition_type == "region":
+        return _compile_stat_condition("regions", condition.get("region"), condition.get("stat"),
+                                       compare, condition.get("value", 0))
+    elif condition_type == "faction":
+        return _compile_stat_condition("factions", condition.get("faction"), condition.get("stat"),
+                                       compare, condition.get("value", 0))
+    return _never
+
+def compile_conditions(conditions: List[dict], common_conditions: Dict[str, dict]) -> Predicate:
+    """
+    Compiles a list of conditions into one predicate that requires all of them.
+    
+    Args:
+        conditions: The condition definitions
+        common_conditions: Named reusable conditions
+        
+    Returns:
+        A predicate on the world state
+    """
+    predicates = [compile_condition(condition, common_conditions) for condition in conditions]
+    if any(predicate is _never for predicate in predicates):
+        return _never
+    if not predicates:
+        return _always
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda world_state: first(world_state) and second(world_state)
+        
+    def predicate(world_state: dict) -> bool:
+        for check in predicates:
+            if not check(world_state):
+                return False
+        return True
+    return predicate
+
+def _year_thresholds(operator_symbol: str, value) -> Tuple[int, ...]:
+    """Returns the years at which a year condition can change its result."""
+    if not isinstance(value, (int, float)):
+        return ()
+    lower, upper = math.ceil(value), math.floor(value) + 1
+    if operator_symbol in (">=", "<"):
+        return (lower,)
+    if operator_symbol in (">", "<="):
+        return (upper,)
+    return (lower, upper)
+
+def collect_dependencies(conditions: List[dict], common_conditions: Dict[str, dict],
+                         stat_keys: Set[tuple], year_thresholds: Set[int]) -> bool:
+    """
+    Collects the world state values a list of conditions depends on.
+    
+    Stat dependencies are keys of the form (section, name, stat), e.g.
+    ("regions", "Central Valley", "magical_energy").
+    
+    Args:
+        conditions: The condition definitions
+        common_conditions: Named reusable conditions
+        stat_keys: Set to add stat keys to
+        year_thresholds: Set to add years to at which a year condition can flip
+        
+    Returns:
+        True if any condition depends on the season
+    """
+    uses_season = False
+    for condition in conditions:
+        condition_type = condition.get("type")
+        if condition_type == "common":
+            common_condition = common_conditions.get(condition.get("value"))
+            if common_condition:
+                uses_season |= collect_dependencies([common_condition], common_conditions, stat_keys, year_thresholds)
+        elif condition_type == "year":
+            year_thresholds.update(_year_thresholds(condition.get("operator"), condition.get("value", 0)))
+        elif condition_type == "season":
+            uses_season = True
+        elif condition_type == "region":
+            stat_keys.add(("regions", condition.get("region"), condition.get("stat")))
+        elif condition_type == "faction":
+            stat_keys.add(("factions", condition.get("faction"), condition.get("stat")))
+    return uses_season
+
+class CompiledEvent:
+    """
+    An event definition together with its compiled condition predicate.
+    
+    Attributes:
+        event_id: ID of the event
+        category: Category of the event
+        data: The frozen event definition, including its category
+        predicate: Compiled conditions of the event
+        stat_keys: Region/faction stats the conditions read
+        year_thresholds: Years at which the result of a year condition can change
+        uses_season: Whether a condition reads the current season
+    """
+    
+    __slots__ = ("event_id", "category", "data", "predicate", "stat_keys", "year_thresholds", "uses_season")
+    
+    def __init__(self, event_id: str, category: str, data: dict, common_conditions: Dict[str, dict]):
+        self.event_id = event_id
+        self.category = category
+        self.data = freeze(dict(data, category=category))
+        conditions = data.get("conditions", [])
+        self.predicate = compile_conditions(conditions, common_conditions)
+        stat_keys, year_thresholds = set(), set()
+        self.uses_season = collect_dependencies(conditions, common_conditions, stat_keys, year_thresholds)
+        self.stat_keys = tuple(stat_keys)
+        self.year_thresholds = tuple(sorted(year_thresholds))
+
+def compile_events(events: dict, common_conditions: Dict[str, dict]) -> Dict[str, List[CompiledEvent]]:
+    """
+    Compiles all event definitions, grouped by category.
+    
+    Args:
+        events: The loaded event definitions ({"events": {category: {id: event}}})
+        common_conditions: Named reusable conditions
+        
+    Returns:
+        Compiled events per category, in definition order
+    """
+    return {
+        category: [CompiledEvent(event_id, category, event_data, common_conditions)
+                   for event_id, event_data in category_events.items()]
+        for category, category_events in events.get("events", {}).items()
+    }
+
+def build_event_index(compiled_events: Dict[str, List[CompiledEvent]]) -> Dict[str, Mapping]:
+    """
+    Builds a flat index from event ID to frozen event definition.
+    
+    If an ID is defined in several categories, the first definition wins.
+    
+    Args:
+        compiled_events: Compiled events per category
+        
+    Returns:
+        Frozen event definitions by ID
+    """
+    index = {}
+    for events in compiled_events.values():
+        for event in events:
+            index.setdefault(event.event_id, event.data)
+    return index
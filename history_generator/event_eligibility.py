@@ -0,0 +1,129 @@
+import bisect
+from typing import Dict, List, Optional, Set, Tuple
+from .event_compiler import CompiledEvent
+
+class EligibilityCache:
+    """
+    Keeps the eligible events of every category up to date incrementally.
+    
+    A dependency index maps each region/faction stat to the events whose
+    conditions read it. When a stat is marked dirty, or the year crosses a
+    threshold of a year condition, or the season changes, only the affected
+    events are re-evaluated; all other results are reused from the last year.
+    
+    Stats changed outside of EventProcessor._apply_effect must be reported
+    with mark_dirty, or the cache must be invalidated.
+    """
+    
+    def __init__(self, compiled_events: Dict[str, List[CompiledEvent]]):
+        """
+        Builds the dependency indexes for a compiled catalogue.
+        
+        Args:
+            compiled_events: Compiled events per category
+        """
+        self._events = compiled_events
+        self._dependents: Dict[tuple, List[Tuple[str, int]]] = {}
+        self._year_dependents: Dict[int, List[Tuple[str, int]]] = {}
+        self._season_dependents: List[Tuple[str, int]] = []
+        for category, events in compiled_events.items():
+            for index, event in enumerate(events):
+                for key in event.stat_keys:
+                    self._dependents.setdefault(key, []).append((category, index))
+                for year in event.year_thresholds:
+                    self._year_dependents.setdefault(year, []).append((category, index))
+                if event.uses_season:
+                    self._season_dependents.append((category, index))
+        self._thresholds = sorted(self._year_dependents)
+        
+        # Eligible event indices per category, kept sorted in definition order
+        self._eligible: Dict[str, List[int]] = {category: [] for category in compiled_events}
+        self._stale: Dict[str, Set[int]] = {category: set() for category in compiled_events}
+        self._regions = None
+        self._factions = None
+        self._year: Optional[int] = None
+        self._season = None
+        # Number of condition evaluations, read by instrumentation
+        self.evaluations = 0
+        self.invalidate()
+        
+    def invalidate(self) -> None:
+        """Marks every event for re-evaluation."""
+        for category, events in self._events.items():
+            self._stale[category] = set(range(len(events)))
+        self._regions = None
+        self._factions = None
+        self._year = None
+        
+    def _mark(self, dependents: List[Tuple[str, int]]) -> None:
+        for category, index in dependents:
+            self._stale[category].add(index)
+            
+    def mark_dirty(self, section: str, name: str, stat: str) -> None:
+        """
+        Marks all events depending on a stat for re-evaluation.
+        
+        Args:
+            section: "regions" or "factions"
+            name: Name of the region or faction
+            stat: Name of the stat
+        """
+        dependents = self._dependents.get((section, name, stat))
+        if dependents:
+            self._mark(dependents)
+            
+    def begin_year(self, world_state: dict) -> None:
+        """
+        Prepares the cache for evaluating a year.
+        
+        Re-evaluates everything for a different world, events with crossed
+        year thresholds when the year advanced, and season-dependent events
+        when the season changed.
+        
+        Args:
+            world_state: The current state of the world
+        """
+        regions = world_state.get("regions")
+        factions = world_state.get("factions")
+        year = world_state.get("current_year", 0)
+        if regions is not self._regions or factions is not self._factions or self._year is None or year < self._year:
+            self.invalidate()
+            self._regions, self._factions = regions, factions
+        elif year > self._year:
+            start = bisect.bisect_right(self._thresholds, self._year)
+            end = bisect.bisect_right(self._thresholds, year)
+            for threshold in self._thresholds[start:end]:
+                self._mark(self._year_dependents[threshold])
+        self._year = year
+        
+        season = world_state.get("current_season")
+        if season != self._season:
+            self._mark(self._season_dependents)
+            self._season = season
+            
+    def eligible(self, category: str, world_state: dict) -> List[int]:
+        """
+        Returns the indices of all eligible events of a category.
+        
+        Args:
+            category: The event category
+            world_state: The current state of the world
+            
+        Returns:
+            Sorted indices into the category's compiled events
+        """
+        eligible = self._eligible[category]
+        stale = self._stale[category]
+        if stale:
+            events = self._events[category]
+            self.evaluations += len(stale)
+            for index in stale:
+                position = bisect.bisect_left(eligible, index)
+                is_listed = position < len(eligible) and eligible[position] == index
+                if events[index].predicate(world_state):
+                    if not is_listed:
+                        eligible.insert(position, index)
+                elif is_listed:
+                    del eligible[position]
+            stale.clear()
+        return eligible
@@ -0,0 +1,208 @@
+import json
+from typing import Dict, Iterable, Iterator, List, Mapping
+import numpy as np
+from .events import BirthEvent, DeathEvent, Event, MarriageEvent, NoSuccessorEvent, SuccessionEvent
+from .fantasy_events import FantasyEvent, MagicalEvent, NaturalEvent, PoliticalEvent
+from .population import StringTable
+
+# Event classes that can be stored in a log, by name
+EVENT_CLASSES = {
+    event_class.__name__: event_class
+    for event_class in (MarriageEvent, BirthEvent, DeathEvent, SuccessionEvent, NoSuccessorEvent,
+                        NaturalEvent, MagicalEvent, PoliticalEvent)
+}
+
+# Sentinel stored in the number columns for missing values (e.g. unknown IDs)
+NO_VALUE = np.iinfo(np.int64).min
+
+TEXT_COLUMNS = 3
+NUMBER_COLUMNS = 3
+
+class EventLog:
+    """
+    Append-only, array-backed archive of events.
+
+    Every event is a row in a few NumPy columns: year, event class code,
+    up to three string codes (names) and up to three integers (ages, IDs,
+    flags). Strings are stored once in a string table. Fantasy events
+    store a code for their shared definition. Events are rebuilt from
+    their row when read, so a log of millions of events needs a few
+    dozen bytes per event.
+
+    Attributes:
+        year: Year per row
+        kind: Event class code per row
+        text: String codes per row (-1 if unused)
+        number: Integer values per row (NO_VALUE if unused)
+        message: Code of an explicit message per row (-1 if rendered)
+        kinds: String table of event class names
+        strings: String table of names and messages
+        definitions: Event definitions referenced by fantasy events
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initializes an empty log.
+
+        Args:
+            capacity: Number of rows to preallocate
+        """
+        self._size = 0
+        self._capacity = max(1, capacity)
+        self.year = np.zeros(self._capacity, dtype=np.int32)
+        self.kind = np.zeros(self._capacity, dtype=np.int16)
+        self.text = np.full((self._capacity, TEXT_COLUMNS), -1, dtype=np.int32)
+        self.number = np.full((self._capacity, NUMBER_COLUMNS), NO_VALUE, dtype=np.int64)
+        self.message = np.full(self._capacity, -1, dtype=np.int32)
+        self.kinds = StringTable()
+        self.strings = StringTable()
+        self.definitions: List[Mapping] = []
+        self._definition_codes: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        """Doubles the capacity of all columns."""
+        self._capacity *= 2
+        for column, fill in (("year", 0), ("kind", 0), ("text", -1), ("number", NO_VALUE), ("message", -1)):
+            old = getattr(self, column)
+            new = np.full((self._capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, column, new)
+
+    def _definition_code(self, definition: Mapping) -> int:
+        """Returns the code of a definition, registering it on first use."""
+        code = self._definition_codes.get(id(definition))
+        if code is None:
+            code = len(self.definitions)
+            self.definitions.append(definition)
+            self._definition_codes[id(definition)] = code
+        return code
+
+    def append(self, event: Event) -> None:
+        """
+        Stores an event.
+
+        Args:
+            event: The event to store
+
+        Raises:
+            ValueError: If the event class cannot be stored
+        """
+        name = type(event).__name__
+        if name not in EVENT_CLASSES:
+            raise ValueError(f"Cannot store events of type {name}")
+        if self._size == self._capacity:
+            self._grow()
+        row = self._size
+        self.year[row] = event.year
+        self.kind[row] = self.kinds.code(name)
+        if isinstance(event, FantasyEvent):
+            self.number[row, 0] = self._definition_code(event.event_data)
+        else:
+            for column, field in enumerate(event.TEXT_FIELDS):
+                self.text[row, column] = self.strings.code(getattr(event, field))
+            for column, field in enumerate(event.NUMBER_FIELDS):
+                value = getattr(event, field)
+                self.number[row, column] = NO_VALUE if value is None else int(value)
+            if event._message is not None:
+                self.message[row] = self.strings.code(event._message)
+        self._size += 1
+
+    def extend(self, events: Iterable[Event]) -> None:
+        """
+        Stores several events.
+
+        Args:
+            events: The events to store
+        """
+        for event in events:
+            self.append(event)
+
+    def __getitem__(self, row: int) -> Event:
+        """
+        Rebuilds the event stored in a row.
+
+        Args:
+            row: The row
+
+        Returns:
+            The event
+        """
+        if not -self._size <= row < self._size:
+            raise IndexError("event log index out of range")
+        row %= self._size
+        event_class = EVENT_CLASSES[self.kinds.names[self.kind[row]]]
+        year = int(self.year[row])
+        if issubclass(event_class, FantasyEvent):
+            return event_class(year, self.definitions[int(self.number[row, 0])])
+        strings = self.strings.names
+        values = {}
+        for column, field in enumerate(event_class.TEXT_FIELDS):
+            values[field] = strings[self.text[row, column]]
+        for column, field in enumerate(event_class.NUMBER_FIELDS):
+            value = int(self.number[row, column])
+            values[field] = None if value == NO_VALUE else value
+        message = strings[self.message[row]] if self.message[row] >= 0 else None
+        return event_class(year, message, **values)
+
+    def __iter__(self) -> Iterator[Event]:
+        for row in range(self._size):
+            yield self[row]
+
+    def view(self, column: str) -> np.ndarray:
+        """
+        Returns the filled part of a column.
+
+        Args:
+            column: Name of the column
+
+        Returns:
+            A view on the column restricted to stored rows
+        """
+        return getattr(self, column)[:self._size]
+
+    def save(self, path: str) -> None:
+        """
+        Writes the log to a compressed .npz archive.
+
+        Args:
+            path: Path of the archive
+        """
+        np.savez_compressed(
+            path,
+            year=self.view("year"),
+            kind=self.view("kind"),
+            text=self.view("text"),
+            number=self.view("number"),
+            message=self.view("message"),
+            kinds=np.array(self.kinds.names, dtype=str),
+            strings=np.array(self.strings.names, dtype=str),
+            definitions=np.array([json.dumps(definition, default=dict) for definition in self.definitions], dtype=str)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "EventLog":
+        """
+        Reads a log written by save.
+
+        Args:
+            path: Path of the archive
+
+        Returns:
+            The restored log
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            size = len(archive["year"])
+            log = cls(capacity=size)
+            for column in ("year", "kind", "text", "number", "message"):
+                getattr(log, column)[:size] = archive[column]
+            for name in archive["kinds"].tolist():
+                log.kinds.code(name)
+            for name in archive["strings"].tolist():
+                log.strings.code(name)
+            for definition in archive["definitions"].tolist():
+                log._definition_code(json.loads(definition))
+        log._size = size
+        return log
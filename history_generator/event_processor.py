@@ -1,7 +1,13 @@
 import json
+import logging
 from enum import Enum
 import random
-from .logger_config import event_logger, world_logger
+from .event_batch import BatchEventProcessor
+from .event_catalogue import EventCatalogue, load_catalogue
+from .event_compiler import OPERATORS, build_event_index, compile_events
+from .event_eligibility import EligibilityCache
+from .event_queue import DelayedEvent, EventQueue
+from .logger_config import configure_logging, event_logger, world_logger
 
 class ConditionType(Enum):
     SEASON = "season"
@@ -17,9 +23,17 @@ class EffectType(Enum):
     TRIGGER_EVENT = "trigger_event"
 
 class EventProcessor:
-    def __init__(self, event_file_path):
+    # Version of the rules checked by _validate_events; bump it whenever they
+    # change so that cached validated catalogues are validated again
+    SCHEMA_VERSION = 1
+    
+    def __init__(self, event_file_path, rng=None):
+        configure_logging()
         self.event_file_path = event_file_path
-        self.events = self._load_events()
+        # Random stream for event selection (the random module if None)
+        self.rng = rng if rng is not None else random
+        # Number of triggered events, read by instrumentation
+        self.triggered = 0
         self.common_conditions = {
             "realm_in_crisis": {
                 "type": "faction",
@@ -36,8 +50,58 @@ class EventProcessor:
                 "value": 80
             }
         }
+        # Validated definitions shared by all processors that load the same file content
+        self.catalogue = self._load_catalogue()
+        self.events = self.catalogue.events
         event_logger.info("EventProcessor initialized")
 
+    @property
+    def events(self):
+        """The loaded event definitions."""
+        return self._events
+
+    @events.setter
+    def events(self, events):
+        # Conditions are compiled once whenever the definitions change; the
+        # catalogue's definitions are compiled once per process
+        self._events = events
+        if events is self.catalogue.events:
+            self._compiled_events, self._event_index = self.catalogue.compiled(self.common_conditions)
+        else:
+            self._compiled_events = compile_events(events, self.common_conditions)
+            self._event_index = build_event_index(self._compiled_events)
+        self._eligibility = EligibilityCache(self._compiled_events)
+        # Stat effects compiled against the layout of a world's stat store, by event definition
+        self._stat_effects = {}
+        self._stat_layout = None
+
+    @property
+    def evaluations(self):
+        """Number of event condition evaluations since the definitions were set."""
+        return self._eligibility.evaluations
+        
+    def batch(self, stats, n_worlds, rng=None):
+        """
+        Creates a processor that runs the loaded events for many worlds at once.
+        
+        Args:
+            stats: WorldStats every world starts with (e.g. FantasyWorld().stats)
+            n_worlds: Number of worlds
+            rng: RandomStream for the batched draws (fresh entropy if None)
+            
+        Returns:
+            BatchEventProcessor: The batched processor
+        """
+        return BatchEventProcessor(self._compiled_events, self.common_conditions, stats, n_worlds, rng)
+
+    def invalidate_eligibility(self):
+        """
+        Forces all event conditions to be re-evaluated in the next year.
+        
+        Needed only when world stats are changed outside of event effects.
+        """
+        self._eligibility.invalidate()
+
     def _validate_event_structure(self, events: dict) -> None:
         """
         Validates the basic structure of event definitions.
@@ -186,12 +250,39 @@ class EventProcessor:
             if "value" not in effect:
                 raise ValueError(f"Event '{event_id}' modify_stat effect is missing 'value'")
                 
-    def _load_events(self):
+    def _validate_events(self, events: dict) -> None:
         """
-        Loads event definitions from the JSON file.
+        Validates event definitions, including all follow-up references.
+        
+        Args:
+            events: The parsed event definitions
+            
+        Raises:
+            ValueError: If the event definitions are invalid
+        """
+        # Validate event structure
+        self._validate_event_structure(events)
+        
+        # Validate followup event references against the set of all event IDs
+        known_ids = set()
+        for category_events in events.get("events", {}).values():
+            known_ids.update(category_events)
+        for category_events in events.get("events", {}).values():
+            for event_id, event_data in category_events.items():
+                for followup in event_data.get("followup_events", []):
+                    if followup["id"] not in known_ids:
+                        raise ValueError(f"Event '{event_id}' references non-existent followup event '{followup['id']}'")
+                        
+    def _load_catalogue(self):
+        """
+        Loads the event catalogue of the JSON file.
+        
+        Identical file content is parsed and validated only once per process,
+        and a validated binary form next to the file spares new processes the
+        JSON parsing and validation as well.
         
         Returns:
-            dict: The loaded event definitions or an empty dictionary in case of error
+            EventCatalogue: The loaded catalogue, or an empty one if no path is given
             
         Raises:
             FileNotFoundError: When the event file cannot be found
@@ -201,41 +292,21 @@ class EventProcessor:
         try:
             if not self.event_file_path:
                 event_logger.warning("No event file path provided, using empty event definitions")
-                return {"events": {}}
-                
-            with open(self.event_file_path, 'r') as file:
-                events = json.load(file)
+                return EventCatalogue(b"", {"events": {}})
                 
-            # Validate event structure
-            self._validate_event_structure(events)
-            
-            # Validate followup event references
-            for category_events in events.get("events", {}).values():
-                for event_id, event_data in category_events.items():
-                    if "followup_events" in event_data:
-                        for followup in event_data["followup_events"]:
-                            referenced_event = None
-                            for cat_events in events.get("events", {}).values():
-                                if followup["id"] in cat_events:
-                                    referenced_event = cat_events[followup["id"]]
-                                    break
-                                    
-                            if referenced_event is None:
-                                raise ValueError(f"Event '{event_id}' references non-existent followup event '{followup['id']}'")
-            
-            return events
+            return load_catalogue(self.event_file_path, self._validate_events, self.SCHEMA_VERSION)
             
         except FileNotFoundError:
-            event_logger.error(f"Event file not found: {self.event_file_path}")
+            event_logger.error("Event file not found: %s", self.event_file_path)
             raise
         except json.JSONDecodeError as e:
-            event_logger.error(f"Invalid JSON format in event file: {e}")
+            event_logger.error("Invalid JSON format in event file: %s", e)
             raise
         except ValueError as e:
-            event_logger.error(f"Invalid event definitions: {e}")
+            event_logger.error("Invalid event definitions: %s", e)
             raise
         except Exception as e:
-            event_logger.error(f"Unexpected error while loading events: {e}")
+            event_logger.error("Unexpected error while loading events: %s", e)
             raise
 
     def process_events(self, world_state, current_year):
@@ -247,47 +318,39 @@ class EventProcessor:
             current_year: The current year
             
         Returns:
-            list: The triggered events
+            list: The triggered events as frozen, shared event definitions
         """
         triggered_events = []
-        world_logger.info(f"Processing events for year {current_year}")
-        world_logger.debug(f"Current world state: {world_state}")
+        world_logger.info("Processing events for year %d", current_year)
+        # Formatting the whole world is expensive, so only do it when debug output is on
+        if world_logger.isEnabledFor(logging.DEBUG):
+            world_logger.debug("Current world state: %s", world_state)
+        log_events = event_logger.isEnabledFor(logging.INFO)
 
-        # Process delayed events first
-        delayed_events = world_state.get("delayed_events", [])
-        new_delayed_events = []
-        
-        for delayed_event in delayed_events:
-            if delayed_event["trigger_year"] <= current_year:
-                if random.random() < delayed_event.get("probability", 0.5):
-                    event_data = self._get_event_by_id(delayed_event["event_id"])
-                    if event_data:
-                        event_data['category'] = delayed_event.get('category', 'unknown')
-                        event_logger.info(f"Delayed event triggered: {event_data['name']}")
-                        for effect in event_data.get("effects", []):
-                            self._apply_effect(effect, world_state)
-                        triggered_events.append(event_data)
-            else:
-                new_delayed_events.append(delayed_event)
-        
-        world_state["delayed_events"] = new_delayed_events
+        # Process delayed events first; only due entries are taken from the queue
+        delayed_events = self._delayed_event_queue(world_state)
+        for delayed_event in delayed_events.pop_due(current_year):
+            if self.rng.random() < delayed_event.probability:
+                event_data = self._get_event_by_id(delayed_event.event_id)
+                if event_data:
+                    if log_events:
+                        event_logger.info("Delayed event triggered: %s", event_data['name'])
+                    self._apply_effects(event_data, world_state)
+                    triggered_events.append(event_data)
 
-        # Process regular events
-        for category, category_events in self.events.get("events", {}).items():
-            possible_events = []
-            for event_id, event_data in category_events.items():
-                if self._check_conditions(event_data.get("conditions", []), world_state):
-                    possible_events.append((event_id, event_data))
+        # Process regular events; only events whose inputs changed are re-evaluated
+        self._eligibility.begin_year(world_state)
+        for category, compiled_events in self._compiled_events.items():
+            possible_events = self._eligibility.eligible(category, world_state)
 
             if possible_events:
                 # Randomly select an event from possible events
-                event_id, event_data = random.choice(possible_events)
-                event_data['category'] = category  # Add category to event data
-                event_logger.info(f"Event triggered: {event_data['name']} ({category})")
+                event_data = compiled_events[self.rng.choice(possible_events)].data
+                if log_events:
+                    event_logger.info("Event triggered: %s (%s)", event_data['name'], category)
                 
                 # Apply effects
-                for effect in event_data.get("effects", []):
-                    self._apply_effect(effect, world_state)
+                self._apply_effects(event_data, world_state)
                 
                 triggered_events.append(event_data)
                 
@@ -296,26 +359,44 @@ class EventProcessor:
                     delay = followup.get("delay", 0)
                     if delay > 0:
                         # Schedule for future
-                        delayed_event = {
-                            "event_id": followup["id"],
-                            "trigger_year": current_year + delay,
-                            "probability": followup.get("probability", 0.5),
-                            "category": category
-                        }
-                        world_state.setdefault("delayed_events", []).append(delayed_event)
+                        delayed_events.push(DelayedEvent(
+                            event_id=followup["id"],
+                            trigger_year=current_year + delay,
+                            probability=followup.get("probability", 0.5),
+                            category=category
+                        ))
                     else:
                         # Trigger immediately
-                        if random.random() < followup.get("probability", 0.5):
+                        if self.rng.random() < followup.get("probability", 0.5):
                             followup_event = self._get_event_by_id(followup["id"])
                             if followup_event:
-                                followup_event['category'] = category
-                                event_logger.info(f"Followup event triggered: {followup_event['name']}")
-                                for effect in followup_event.get("effects", []):
-                                    self._apply_effect(effect, world_state)
+                                if log_events:
+                                    event_logger.info("Followup event triggered: %s", followup_event['name'])
+                                self._apply_effects(followup_event, world_state)
                                 triggered_events.append(followup_event)
 
+        self.triggered += len(triggered_events)
         return triggered_events
 
+    def _delayed_event_queue(self, world_state):
+        """
+        Returns the delayed event queue of a world state, creating it if needed.
+        
+        A serialized list of delayed events (as produced by EventQueue.to_list)
+        is converted into a queue in place.
+        
+        Args:
+            world_state: The current state of the world
+            
+        Returns:
+            EventQueue: The queue stored under "delayed_events"
+        """
+        delayed_events = world_state.get("delayed_events")
+        if not isinstance(delayed_events, EventQueue):
+            delayed_events = EventQueue.from_list(delayed_events or [])
+            world_state["delayed_events"] = delayed_events
+        return delayed_events
+
     def _check_conditions(self, conditions, world_state):
         for condition in conditions:
             if not self._evaluate_condition(condition, world_state):
@@ -333,53 +414,78 @@ class EventProcessor:
             
         elif condition_type == "year":
             current_year = world_state.get("current_year", 0)
-            operator = condition.get("operator")
-            value = condition.get("value", 0)
-            
-            if operator == ">=":
-                return current_year >= value
-            elif operator == "<=":
-                return current_year <= value
-            elif operator == "==":
-                return current_year == value
-            return False
+            return self._compare(current_year, condition.get("operator"), condition.get("value", 0))
+            
+        elif condition_type == "season":
+            current_season = world_state.get("current_season")
+            if current_season is None:
+                return False
+            return self._compare(current_season, condition.get("operator"), condition.get("value"))
             
         elif condition_type == "region":
             region = condition.get("region")
             stat = condition.get("stat")
-            operator = condition.get("operator")
-            value = condition.get("value", 0)
             
             region_data = world_state.get("regions", {}).get(region, {})
             current_value = region_data.get(stat, 0)
-            
-            if operator == ">=":
-                return current_value >= value
-            elif operator == "<=":
-                return current_value <= value
-            elif operator == "==":
-                return current_value == value
-            return False
+            return self._compare(current_value, condition.get("operator"), condition.get("value", 0))
             
         elif condition_type == "faction":
             faction = condition.get("faction")
             stat = condition.get("stat")
-            operator = condition.get("operator")
-            value = condition.get("value", 0)
             
             faction_data = world_state.get("factions", {}).get(faction, {})
             current_value = faction_data.get(stat, 0)
-            
-            if operator == ">=":
-                return current_value >= value
-            elif operator == "<=":
-                return current_value <= value
-            elif operator == "==":
-                return current_value == value
-            return False
+            return self._compare(current_value, condition.get("operator"), condition.get("value", 0))
             
         return False
 
+    def _compare(self, current_value, operator, value):
+        compare = OPERATORS.get(operator)
+        if compare is None:
+            return False
+        return compare(current_value, value)
+
+    def _apply_effects(self, event_data, world_state):
+        """
+        Applies all effects of an event.
+        
+        Worlds with a stat store ("stats" in the world state) get the effects
+        compiled once per event into (index, delta) pairs, so applying them
+        needs no dictionary lookups. Events with fewer than VECTOR_THRESHOLD
+        changes, which includes every bundled event, are clamped one stat at
+        a time; only larger ones use a single clamped array add. Plain nested
+        dictionaries are updated effect by effect.
+        
+        Args:
+            event_data: The event definition
+            world_state: The current state of the world
+        """
+        stats = world_state.get("stats")
+        if stats is None:
+            for effect in event_data.get("effects", []):
+                self._apply_effect(effect, world_state)
+            return
+            
+        if stats.layout is not self._stat_layout:
+            self._stat_effects.clear()
+            self._stat_layout = stats.layout
+        # Keyed by identity: definitions are the frozen objects of the compiled catalogue
+        effects = self._stat_effects.get(id(event_data))
+        if effects is None:
+            effects = stats.compile_effects(event_data.get("effects", ()))
+            if stats.layout is not self._stat_layout:
+                # Compiling added entities or stats to the layout
+                self._stat_effects.clear()
+                self._stat_layout = stats.layout
+            self._stat_effects[id(event_data)] = effects
+            
+        for position in stats.apply(effects):
+            self._eligibility.mark_dirty(*effects.keys[position])
+        if world_logger.isEnabledFor(logging.DEBUG):
+            for section, name, stat in effects.keys:
+                world_logger.debug("%s %s %s: %s", section, name, stat, stats.get(section, name, stat))
+                
     def _apply_effect(self, effect, world_state):
         effect_type = effect.get("type")
         
@@ -392,26 +498,25 @@ class EventProcessor:
                 current_value = world_state.get("regions", {}).get(target_type, {}).get(stat, 0)
                 new_value = max(0, min(100, current_value + value))
                 world_state.setdefault("regions", {}).setdefault(target_type, {})[stat] = new_value
-                world_logger.debug(f"Region {target_type} {stat}: {current_value} -> {new_value}")
+                if new_value != current_value:
+                    self._eligibility.mark_dirty("regions", target_type, stat)
+                world_logger.debug("Region %s %s: %s -> %s", target_type, stat, current_value, new_value)
             elif effect.get("faction"):
                 current_value = world_state.get("factions", {}).get(target_type, {}).get(stat, 0)
                 new_value = max(0, min(100, current_value + value))
                 world_state.setdefault("factions", {}).setdefault(target_type, {})[stat] = new_value
-                world_logger.debug(f"Faction {target_type} {stat}: {current_value} -> {new_value}")
+                if new_value != current_value:
+                    self._eligibility.mark_dirty("factions", target_type, stat)
+                world_logger.debug("Faction %s %s: %s -> %s", target_type, stat, current_value, new_value)
 
     def _get_event_by_id(self, event_id):
         """
-        Gets an event by its ID and marks it as a followup event.
+        Gets an event by its ID.
         
         Args:
             event_id: The ID of the event to get
             
         Returns:
-            dict: The event data, or None if not found
+            Mapping: The frozen event definition (including its category), or None if not found
         """
-        for category_events in self.events.get("events", {}).values():
-            if event_id in category_events:
-                event_data = category_events[event_id].copy()  # Create a copy to avoid modifying the original
-                event_data["is_followup"] = True  # Mark as followup event
-                return event_data
-        return None 
\ No newline at end of file
+        return self._event_index.get(event_id) 
\ No newline at end of file
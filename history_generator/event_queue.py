@@ -0,0 +1,128 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+
+@dataclass
+class DelayedEvent:
+    """
+    A follow-up event scheduled for a later year.
+    
+    Attributes:
+        event_id: ID of the event to trigger
+        trigger_year: Year in which the event is due
+        probability: Probability of the event triggering when due
+        category: Category of the event that scheduled it
+    """
+    event_id: str
+    trigger_year: int
+    probability: float = 0.5
+    category: str = "unknown"
+    
+    def to_dict(self) -> dict:
+        """Returns the serializable form of the entry."""
+        return {
+            "event_id": self.event_id,
+            "trigger_year": self.trigger_year,
+            "probability": self.probability,
+            "category": self.category
+        }
+
+class EventQueue:
+    """
+    Timed queue of delayed follow-up events.
+    
+    Entries are kept in a binary heap ordered by trigger year (ties in
+    scheduling order), so scheduling is O(log n) and each year only the due
+    entries are popped.
+    
+    Attributes:
+        max_depth: Largest number of pending entries seen
+        scheduled: Total number of scheduled entries
+        popped: Total number of entries that became due
+    """
+    
+    def __init__(self):
+        """Initializes an empty queue."""
+        self._heap: List[tuple] = []
+        self._sequence = 0
+        self.max_depth = 0
+        self.scheduled = 0
+        self.popped = 0
+        
+    def __len__(self) -> int:
+        return len(self._heap)
+        
+    def push(self, event: DelayedEvent) -> None:
+        """
+        Schedules a delayed event.
+        
+        Args:
+            event: The entry to schedule
+        """
+        heapq.heappush(self._heap, (event.trigger_year, self._sequence, event))
+        self._sequence += 1
+        self.scheduled += 1
+        self.max_depth = max(self.max_depth, len(self._heap))
+        
+    def pop_due(self, year: int) -> Iterator[DelayedEvent]:
+        """
+        Removes and yields all entries due in or before a year.
+        
+        Args:
+            year: The current year
+            
+        Yields:
+            Due entries in trigger order
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= year:
+            self.popped += 1
+            yield heapq.heappop(heap)[2]
+            
+    def next_trigger_year(self):
+        """Returns the trigger year of the earliest entry or None if the queue is empty."""
+        return self._heap[0][0] if self._heap else None
+        
+    def metrics(self) -> Dict[str, int]:
+        """
+        Returns queue depth metrics.
+        
+        Returns:
+            Dictionary with the current depth, maximum depth and counters
+        """
+        return {
+            "depth": len(self._heap),
+            "max_depth": self.max_depth,
+            "scheduled": self.scheduled,
+            "popped": self.popped
+        }
+        
+    def to_list(self) -> List[dict]:
+        """
+        Serializes the pending entries in trigger order.
+        
+        Returns:
+            List of entry dictionaries
+        """
+        return [entry[2].to_dict() for entry in sorted(self._heap)]
+        
+    @classmethod
+    def from_list(cls, entries: List[dict]) -> "EventQueue":
+        """
+        Restores a queue from serialized entries.
+        
+        Args:
+            entries: Entry dictionaries as produced by to_list
+            
+        Returns:
+            A queue containing the entries
+        """
+        queue = cls()
+        for entry in entries:
+            queue.push(DelayedEvent(
+                event_id=entry["event_id"],
+                trigger_year=entry["trigger_year"],
+                probability=entry.get("probability", 0.5),
+                category=entry.get("category", "unknown")
+            ))
+        return queue
@@ -0,0 +1,414 @@
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Type
+import numpy as np
+from .events import Event, EventTypes
+from .event_log import NO_VALUE
+from .population import StringTable
+
+def event_record(event: Event) -> dict:
+    """
+    Converts an event into a flat, JSON-serializable record.
+    
+    Args:
+        event: The event to convert
+        
+    Returns:
+        Dictionary with year, type, message and the event's own fields
+    """
+    record = {"year": event.year, "type": type(event).__name__, "message": event.message}
+    for name in event.fields():
+        record[name] = getattr(event, name)
+    return record
+
+class EventSink:
+    """
+    Base class of all event sinks.
+    
+    A sink receives events one at a time and may subscribe to a subset of
+    event classes; events of other classes are never passed to it. Sinks
+    are context managers and must be closed to flush buffered output.
+    
+    Attributes:
+        event_types: Subscribed event classes (None for all)
+    """
+    
+    def __init__(self, event_types: Optional[Iterable[Type[Event]]] = None):
+        """
+        Initializes the sink.
+        
+        Args:
+            event_types: Event classes to receive (all if None)
+        """
+        self.event_types: EventTypes = tuple(event_types) if event_types is not None else None
+        
+    def accepts(self, event: Event) -> bool:
+        """Returns True if the sink subscribed to the event's class."""
+        return self.event_types is None or isinstance(event, self.event_types)
+        
+    def write(self, event: Event) -> None:
+        """
+        Receives one event.
+        
+        Args:
+            event: The event
+        """
+        raise NotImplementedError
+        
+    def flush(self) -> None:
+        """Writes buffered events to the underlying storage."""
+        
+    def close(self) -> None:
+        """Flushes and releases the underlying storage."""
+        self.flush()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class CallbackSink(EventSink):
+    """Passes every subscribed event to a callback."""
+    
+    def __init__(self, callback: Callable[[Event], None], event_types: Optional[Iterable[Type[Event]]] = None):
+        """
+        Initializes the sink.
+        
+        Args:
+            callback: Function called with each event
+            event_types: Event classes to receive (all if None)
+        """
+        super().__init__(event_types)
+        self.callback = callback
+        
+    def write(self, event: Event) -> None:
+        self.callback(event)
+
+class _BufferedSink(EventSink):
+    """Collects records and hands them to _write_records in bulk."""
+    
+    def __init__(self, event_types: Optional[Iterable[Type[Event]]] = None, buffer_size: int = 1000):
+        super().__init__(event_types)
+        self.buffer_size = max(1, buffer_size)
+        self._buffer: List[dict] = []
+        self._closed = False
+        
+    def write(self, event: Event) -> None:
+        self._buffer.append(event_record(event))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+            
+    def flush(self) -> None:
+        if self._buffer:
+            self._write_records(self._buffer)
+            self._buffer = []
+            
+    def _write_records(self, records: List[dict]) -> None:
+        raise NotImplementedError
+        
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._close()
+        self._closed = True
+        
+    def _close(self) -> None:
+        pass
+
+class JsonLinesSink(_BufferedSink):
+    """
+    Writes one JSON object per event (JSON Lines / NDJSON).
+    
+    With compress=True, or a path ending in ".gz", the output is written
+    as gzip-compressed NDJSON.
+    """
+    
+    def __init__(self, path: str, event_types: Optional[Iterable[Type[Event]]] = None,
+                 buffer_size: int = 1000, compress: Optional[bool] = None):
+        """
+        Initializes the sink.
+        
+        Args:
+            path: Path of the output file
+            event_types: Event classes to receive (all if None)
+            buffer_size: Number of events written per bulk write
+            compress: Whether to gzip the output (derived from the path if None)
+        """
+        super().__init__(event_types, buffer_size)
+        if compress is None:
+            compress = path.endswith(".gz")
+        # Output format modules are imported by the sinks that use them
+        import gzip
+        self._file = gzip.open(path, "wt", encoding="utf-8") if compress else open(path, "w", encoding="utf-8")
+        
+    def _write_records(self, records: List[dict]) -> None:
+        self._file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+        
+    def _close(self) -> None:
+        self._file.close()
+
+class CsvSink(_BufferedSink):
+    """
+    Writes one CSV row per event.
+    
+    The columns are year, type and message; all other fields of an event
+    are stored as a JSON object in the fields column.
+    """
+    
+    COLUMNS = ("year", "type", "message", "fields")
+    
+    def __init__(self, path: str, event_types: Optional[Iterable[Type[Event]]] = None, buffer_size: int = 1000):
+        """
+        Initializes the sink.
+        
+        Args:
+            path: Path of the output file
+            event_types: Event classes to receive (all if None)
+            buffer_size: Number of events written per bulk write
+        """
+        super().__init__(event_types, buffer_size)
+        import csv
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.COLUMNS)
+        
+    def _write_records(self, records: List[dict]) -> None:
+        rows = []
+        for record in records:
+            extra = {key: value for key, value in record.items() if key not in ("year", "type", "message")}
+            rows.append((record["year"], record["type"], record["message"], json.dumps(extra, ensure_ascii=False)))
+        self._writer.writerows(rows)
+        
+    def _close(self) -> None:
+        self._file.close()
+
+class NpzSink(_BufferedSink):
+    """
+    Writes events column by column into a NumPy .npz archive.
+    
+    Every full buffer is written as one chunk of column arrays: year,
+    type code, message and one column per record field. Text fields are
+    stored as codes into a string table (-1 if a row has no such field),
+    all other fields as integers (NO_VALUE if missing). Memory stays
+    bounded by the buffer size no matter how many events are written.
+    The type names, the string table and the fields of every type are
+    stored once when the sink is closed. Use read_npz_events to load the
+    columns or read_npz_records to get the records back.
+    """
+    
+    def __init__(self, path: str, event_types: Optional[Iterable[Type[Event]]] = None, buffer_size: int = 10000):
+        """
+        Initializes the sink.
+        
+        Args:
+            path: Path of the output file
+            event_types: Event classes to receive (all if None)
+            buffer_size: Number of events per chunk
+        """
+        super().__init__(event_types, buffer_size)
+        import zipfile
+        self._archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._types: Dict[str, int] = {}
+        self._strings = StringTable()
+        # Field names per event type, and the names of all text fields
+        self._fields: Dict[str, List[str]] = {}
+        self._text_fields = set()
+        self._chunks = 0
+        
+    def write(self, event: Event) -> None:
+        name = type(event).__name__
+        if name not in self._fields:
+            self._fields[name] = list(event.fields())
+            self._text_fields.update(event.TEXT_FIELDS)
+        super().write(event)
+        
+    def _write_array(self, name: str, array: np.ndarray) -> None:
+        with self._archive.open(f"{name}.npy", "w", force_zip64=True) as file:
+            np.lib.format.write_array(file, array, allow_pickle=False)
+            
+    def _write_records(self, records: List[dict]) -> None:
+        chunk = f"{self._chunks:06d}"
+        self._write_array(f"year_{chunk}", np.array([record["year"] for record in records], dtype=np.int32))
+        self._write_array(f"type_{chunk}", np.array(
+            [self._types.setdefault(record["type"], len(self._types)) for record in records], dtype=np.int16))
+        self._write_array(f"message_{chunk}", np.array([record["message"] for record in records], dtype=str))
+        for field in dict.fromkeys(field for record in records for field in record):
+            if field in ("year", "type", "message"):
+                continue
+            values = [record.get(field) for record in records]
+            if field in self._text_fields:
+                column = np.array([-1 if value is None else self._strings.code(value) for value in values],
+                                  dtype=np.int32)
+            else:
+                column = np.array([NO_VALUE if value is None else int(value) for value in values], dtype=np.int64)
+            self._write_array(f"field.{field}_{chunk}", column)
+        self._chunks += 1
+        
+    def _close(self) -> None:
+        self._write_array("types", np.array(list(self._types), dtype=str))
+        self._write_array("strings", np.array(self._strings.names, dtype=str))
+        self._write_array("fields", np.array(json.dumps({"types": self._fields,
+                                                         "text": sorted(self._text_fields)})))
+        self._archive.close()
+
+def read_npz_events(path: str) -> Dict[str, np.ndarray]:
+    """
+    Loads an archive written by NpzSink.
+    
+    Text fields are decoded to strings ("" where a row has no such
+    field); other fields stay integers with NO_VALUE for missing values.
+    
+    Args:
+        path: Path of the archive
+        
+    Returns:
+        Dictionary with the year, type (names) and message columns and
+        one column per record field
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        chunks = sorted(name[len("year_"):] for name in archive.files if name.startswith("year_"))
+        types = archive["types"]
+        strings = np.append(archive["strings"], "") if "strings" in archive.files else np.array([""])
+        layout = json.loads(str(archive["fields"])) if "fields" in archive.files else {"types": {}, "text": []}
+        text_fields = set(layout["text"])
+        sizes = [len(archive[f"year_{chunk}"]) for chunk in chunks]
+        columns = {
+            "year": [archive[f"year_{chunk}"] for chunk in chunks],
+            "type": [types[archive[f"type_{chunk}"]] for chunk in chunks],
+            "message": [archive[f"message_{chunk}"] for chunk in chunks]
+        }
+        fields = dict.fromkeys(field for names in layout["types"].values() for field in names)
+        for field in fields:
+            parts = []
+            for chunk, size in zip(chunks, sizes):
+                name = f"field.{field}_{chunk}"
+                if field in text_fields:
+                    # Code -1 picks the "" appended to the string table
+                    parts.append(strings[archive[name]] if name in archive.files else np.full(size, "", dtype=str))
+                else:
+                    parts.append(archive[name] if name in archive.files else np.full(size, NO_VALUE, dtype=np.int64))
+            columns[field] = parts
+    if not chunks:
+        return {"year": np.zeros(0, dtype=np.int32), "type": np.zeros(0, dtype=str), "message": np.zeros(0, dtype=str)}
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
+
+def read_npz_records(path: str) -> Iterator[dict]:
+    """
+    Reads the events of an archive written by NpzSink as records.
+    
+    Args:
+        path: Path of the archive
+        
+    Yields:
+        One dictionary per event, like event_record returns it
+    """
+    columns = read_npz_events(path)
+    with np.load(path, allow_pickle=False) as archive:
+        layout = json.loads(str(archive["fields"]))
+    text_fields = set(layout["text"])
+    lists = {name: column.tolist() for name, column in columns.items()}
+    for row in range(len(lists["year"])):
+        event_type = lists["type"][row]
+        record = {"year": lists["year"][row], "type": event_type, "message": lists["message"][row]}
+        for field in layout["types"][event_type]:
+            value = lists[field][row]
+            record[field] = value if field in text_fields or value != NO_VALUE else None
+        yield record
+
+def open_sink(path: str, event_types: Optional[Iterable[Type[Event]]] = None) -> EventSink:
+    """
+    Opens a file sink chosen by the file extension.
+    
+    ".jsonl"/".ndjson" give JSON Lines, a further ".gz" compresses it,
+    ".csv" gives CSV and ".npz" the columnar archive.
+    
+    Args:
+        path: Path of the output file
+        event_types: Event classes to receive (all if None)
+        
+    Returns:
+        The opened sink
+        
+    Raises:
+        ValueError: If the extension is not supported
+    """
+    lower = path.lower()
+    if lower.endswith((".jsonl", ".ndjson", ".jsonl.gz", ".ndjson.gz")):
+        return JsonLinesSink(path, event_types)
+    if lower.endswith(".csv"):
+        return CsvSink(path, event_types)
+    if lower.endswith(".npz"):
+        return NpzSink(path, event_types)
+    raise ValueError(f"Unsupported event output format: {path}")
+
+class EventPipeline:
+    """
+    Fans events out to a set of sinks.
+    
+    The union of the sinks' subscriptions is exposed as event_types, so a
+    producer can skip building events no sink wants.
+    
+    Attributes:
+        sinks: The connected sinks
+    """
+    
+    def __init__(self, sinks: Sequence[EventSink] = ()):
+        """
+        Initializes the pipeline.
+        
+        Args:
+            sinks: The sinks to connect
+        """
+        self.sinks = list(sinks)
+        
+    def add(self, sink: EventSink) -> EventSink:
+        """
+        Connects a sink.
+        
+        Args:
+            sink: The sink to connect
+            
+        Returns:
+            The sink
+        """
+        self.sinks.append(sink)
+        return sink
+        
+    @property
+    def event_types(self) -> EventTypes:
+        """Event classes any sink subscribed to (None if a sink wants all)."""
+        subscribed = []
+        for sink in self.sinks:
+            if sink.event_types is None:
+                return None
+            subscribed.extend(event_type for event_type in sink.event_types if event_type not in subscribed)
+        return tuple(subscribed)
+        
+    def write_all(self, events: Iterable[Event]) -> None:
+        """
+        Passes events to every sink that subscribed to them.
+        
+        Args:
+            events: The events
+        """
+        for event in events:
+            for sink in self.sinks:
+                if sink.accepts(event):
+                    sink.write(event)
+                    
+    def flush(self) -> None:
+        """Flushes all sinks."""
+        for sink in self.sinks:
+            sink.flush()
+            
+    def close(self) -> None:
+        """Closes all sinks."""
+        for sink in self.sinks:
+            sink.close()
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
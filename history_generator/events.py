@@ -1,34 +1,173 @@
-from dataclasses import dataclass
+import sys
+from typing import Optional, Tuple, Type
+
+_set = object.__setattr__
+
+def _intern(text: Optional[str]) -> Optional[str]:
+    """Interns a string so repeated names share one object."""
+    return sys.intern(text) if isinstance(text, str) else text
+
+def _rebuild(event_class, year, message, values):
+    return event_class(year, message, **values)
 
-@dataclass
 class Event:
-    year: int
-    message: str
+    """
+    Base class of all events.
+
+    Events are compact, immutable records: attributes live in __slots__,
+    names are interned and the message is only built when it is read.
+    An explicit message passed to the constructor takes precedence over
+    the rendered one.
+    
+    Attributes:
+        year: Year in which the event happened
+        message: Human-readable description of the event
+    """
+    
+    __slots__ = ("year", "_message")
+    
+    # Record fields, split into strings and integers for array-backed storage
+    TEXT_FIELDS: Tuple[str, ...] = ()
+    NUMBER_FIELDS: Tuple[str, ...] = ()
+    
+    def __init__(self, year: int, message: Optional[str] = None):
+        _set(self, "year", year)
+        _set(self, "_message", message)
+        
+    @property
+    def message(self) -> str:
+        return self._message if self._message is not None else self.render()
+        
+    def render(self) -> str:
+        """Builds the message of the event from its fields."""
+        return ""
+        
+    @classmethod
+    def fields(cls) -> Tuple[str, ...]:
+        """Returns the names of the record fields after year and message."""
+        return cls.TEXT_FIELDS + cls.NUMBER_FIELDS
+        
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+        
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+        
+    def __reduce__(self):
+        # Slots cannot be restored through the blocked __setattr__, so rebuild through the constructor
+        return (_rebuild, (type(self), self.year, self._message,
+                           {name: getattr(self, name) for name in self.fields()}))
+        
+    def _key(self) -> tuple:
+        return (self.year, self.message) + tuple(getattr(self, name) for name in self.fields())
+        
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._key() == other._key()
+        
+    def __hash__(self):
+        return hash((type(self), self._key()))
+        
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in ("year", "message") + self.fields())
+        return f"{type(self).__name__}({values})"
 
-@dataclass
 class MarriageEvent(Event):
-    person1: str
-    person2: str
-    age: int
+    __slots__ = ("person1", "person2", "age", "person1_id", "person2_id")
+    TEXT_FIELDS = ("person1", "person2")
+    NUMBER_FIELDS = ("age", "person1_id", "person2_id")
+
+    def __init__(self, year: int, message: Optional[str] = None, person1: str = "", person2: str = "",
+                 age: int = 0, person1_id: Optional[int] = None, person2_id: Optional[int] = None):
+        super().__init__(year, message)
+        _set(self, "person1", _intern(person1))
+        _set(self, "person2", _intern(person2))
+        _set(self, "age", age)
+        _set(self, "person1_id", person1_id)
+        _set(self, "person2_id", person2_id)
+        
+    def render(self) -> str:
+        return f"{self.person1} marries {self.person2}"
 
-@dataclass
 class BirthEvent(Event):
-    child_name: str
-    mother_name: str
-    father_name: str
+    __slots__ = ("child_name", "mother_name", "father_name", "child_id")
+    TEXT_FIELDS = ("child_name", "mother_name", "father_name")
+    NUMBER_FIELDS = ("child_id",)
+
+    def __init__(self, year: int, message: Optional[str] = None, child_name: str = "", mother_name: str = "",
+                 father_name: str = "", child_id: Optional[int] = None):
+        super().__init__(year, message)
+        _set(self, "child_name", _intern(child_name))
+        _set(self, "mother_name", _intern(mother_name))
+        _set(self, "father_name", _intern(father_name))
+        _set(self, "child_id", child_id)
+        
+    def render(self) -> str:
+        return f"{self.mother_name} and {self.father_name} have a new child: {self.child_name}"
 
-@dataclass
 class DeathEvent(Event):
-    person_name: str
-    age: int
+    __slots__ = ("person_name", "age", "person_id")
+    TEXT_FIELDS = ("person_name",)
+    NUMBER_FIELDS = ("age", "person_id")
+
+    def __init__(self, year: int, message: Optional[str] = None, person_name: str = "", age: int = 0,
+                 person_id: Optional[int] = None):
+        super().__init__(year, message)
+        _set(self, "person_name", _intern(person_name))
+        _set(self, "age", age)
+        _set(self, "person_id", person_id)
+        
+    def render(self) -> str:
+        return f"{self.person_name} has died at the age of {self.age}"
 
-@dataclass
 class SuccessionEvent(Event):
-    old_monarch: str
-    new_monarch: str
-    is_king: bool
+    __slots__ = ("old_monarch", "new_monarch", "dynasty_name", "is_king", "new_monarch_id")
+    TEXT_FIELDS = ("old_monarch", "new_monarch", "dynasty_name")
+    NUMBER_FIELDS = ("is_king", "new_monarch_id")
+
+    def __init__(self, year: int, message: Optional[str] = None, old_monarch: str = "", new_monarch: str = "",
+                 is_king: bool = True, dynasty_name: str = "", new_monarch_id: Optional[int] = None):
+        super().__init__(year, message)
+        _set(self, "old_monarch", _intern(old_monarch))
+        _set(self, "new_monarch", _intern(new_monarch))
+        _set(self, "dynasty_name", _intern(dynasty_name))
+        _set(self, "is_king", bool(is_king))
+        _set(self, "new_monarch_id", new_monarch_id)
+        
+    def render(self) -> str:
+        return f"{self.new_monarch} becomes the new monarch of {self.dynasty_name}"
 
-@dataclass
 class NoSuccessorEvent(Event):
-    monarch_name: str
-    is_king: bool 
\ No newline at end of file
+    __slots__ = ("monarch_name", "dynasty_name", "is_king")
+    TEXT_FIELDS = ("monarch_name", "dynasty_name")
+    NUMBER_FIELDS = ("is_king",)
+    
+    def __init__(self, year: int, message: Optional[str] = None, monarch_name: str = "", is_king: bool = True,
+                 dynasty_name: str = ""):
+        super().__init__(year, message)
+        _set(self, "monarch_name", _intern(monarch_name))
+        _set(self, "dynasty_name", _intern(dynasty_name))
+        _set(self, "is_king", bool(is_king))
+        
+    def render(self) -> str:
+        return f"Dynasty {self.dynasty_name} has no eligible successor"
+
+# Event classes a consumer subscribes to; None subscribes to all events
+EventTypes = Optional[Tuple[Type[Event], ...]]
+
+def wants(event_types: EventTypes, event_class: Type[Event]) -> bool:
+    """
+    Checks whether a subscription includes an event class.
+
+    Producers call this before building an event, so events nobody
+    subscribed to are never created.
+
+    Args:
+        event_types: Subscribed event classes (None for all)
+        event_class: The class of the event about to be produced
+
+    Returns:
+        True if the event should be produced
+    """
+    return event_types is None or issubclass(event_class, event_types)
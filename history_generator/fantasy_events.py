@@ -1,18 +1,161 @@
-from .events import Event
-from .fantasy_world import FantasyWorld
-from typing import List
+from .events import Event, EventTypes, wants, _intern, _set
+from .population import StringTable
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    # Only for annotations; the world loads the event catalogue machinery
+    from .fantasy_world import FantasyWorld
+
+# Interned category names; events store the code
+CATEGORIES = StringTable()
+
+class DefinitionTable:
+    """
+    Process-wide table of the catalogue definitions fantasy events refer to.
+    
+    Every definition of a compiled catalogue gets an integer code under its
+    catalogue digest and event ID, so the table holds one entry per distinct
+    catalogue event however often a catalogue is reloaded. Events store the
+    code; a pickled event carries only the key, so another process that
+    loaded the same catalogue resolves it to its own copy. Definitions
+    outside any catalogue are never registered and stay with their event.
+    
+    Attributes:
+        definitions: Definitions, indexed by their code
+        keys: (catalogue digest, event ID) per code
+    """
+    
+    def __init__(self):
+        """Initializes an empty table."""
+        self.definitions: List[Mapping] = []
+        self.keys: List[Tuple[bytes, str]] = []
+        # Registered definitions are kept alive by the table, so their id() stays unique
+        self._codes: Dict[int, int] = {}
+        self._keyed: Dict[Tuple[bytes, str], int] = {}
+        
+    def code(self, definition: Mapping) -> Optional[int]:
+        """
+        Returns the code of a registered catalogue definition.
+        
+        Args:
+            definition: The event definition
+            
+        Returns:
+            The integer code, or None if the definition is not part of a compiled catalogue
+        """
+        return self._codes.get(id(definition))
+        
+    def register(self, digest: bytes, index: Dict[str, Mapping]) -> None:
+        """
+        Registers the definitions of a catalogue under their event IDs.
+        
+        A catalogue compiled again with the same digest replaces its
+        definitions under the existing codes.
+        
+        Args:
+            digest: Digest of the catalogue
+            index: Frozen definitions by event ID
+        """
+        for event_id, definition in index.items():
+            key = (digest, event_id)
+            code = self._keyed.get(key)
+            if code is None:
+                code = len(self.definitions)
+                self.definitions.append(definition)
+                self.keys.append(key)
+                self._keyed[key] = code
+            elif self.definitions[code] is not definition:
+                del self._codes[id(self.definitions[code])]
+                self.definitions[code] = definition
+            self._codes[id(definition)] = code
+            
+    def find(self, digest: bytes, event_id: str) -> Optional[int]:
+        """
+        Returns the code of a catalogue definition.
+        
+        Args:
+            digest: Digest of the catalogue
+            event_id: ID of the event
+            
+        Returns:
+            The code or None if no such catalogue was compiled in this process
+        """
+        return self._keyed.get((digest, event_id))
+
+DEFINITIONS = DefinitionTable()
+
+def _from_key(event_class, year: int, digest: bytes, event_id: str) -> "FantasyEvent":
+    """Rebuilds a pickled fantasy event from the key of its definition."""
+    code = DEFINITIONS.find(digest, event_id)
+    if code is None:
+        # Events of the bundled catalogue can be resolved by loading it
+        from .event_processor import EventProcessor
+        from .fantasy_world import EVENT_FILE
+        EventProcessor(EVENT_FILE)
+        code = DEFINITIONS.find(digest, event_id)
+        if code is None:
+            raise ValueError(f"Event definition '{event_id}' is not loaded in this process")
+    return event_class(year, DEFINITIONS.definitions[code])
 
 class FantasyEvent(Event):
+    """
+    An event triggered from an event definition.
+    
+    Only the year, the name, the category code and the code of the shared,
+    frozen definition in DEFINITIONS are stored; all other attributes are
+    read from the definition when accessed. A definition outside any
+    catalogue is referenced by the event itself (definition_code -1).
+    """
+    
+    __slots__ = ("definition_code", "name", "category_code", "_definition")
+    TEXT_FIELDS = ("name", "category", "severity", "region", "impact", "faction")
+    
     def __init__(self, year: int, event_data: dict):
-        self.event_data = event_data
-        self.category = event_data.get('category', 'unknown')
-        self.name = event_data.get('name', 'Unbekanntes Event')
-        self.severity = event_data.get('severity', 'moderate')
-        self.region = event_data.get('region', 'unknown')
-        self.impact = event_data.get('impact', 'unknown')
-        self.faction = event_data.get('faction', 'unknown')
-        self.effects = event_data.get('effects', [])  # Store effects directly
-        super().__init__(year, self.name)
+        super().__init__(year)
+        code = DEFINITIONS.code(event_data)
+        _set(self, "definition_code", -1 if code is None else code)
+        _set(self, "_definition", event_data if code is None else None)
+        _set(self, "name", _intern(event_data.get('name', 'Unbekanntes Event')))
+        _set(self, "category_code", CATEGORIES.code(event_data.get('category', 'unknown')))
+        
+    def render(self) -> str:
+        return self.name
+        
+    def __reduce__(self):
+        if self._definition is not None:
+            # A definition outside any catalogue can only travel with the event
+            return (type(self), (self.year, self._definition))
+        return (_from_key, (type(self), self.year) + DEFINITIONS.keys[self.definition_code])
+        
+    @property
+    def event_data(self) -> Mapping:
+        if self._definition is not None:
+            return self._definition
+        return DEFINITIONS.definitions[self.definition_code]
+        
+    @property
+    def category(self) -> str:
+        return CATEGORIES.names[self.category_code]
+        
+    @property
+    def severity(self) -> str:
+        return self.event_data.get('severity', 'moderate')
+        
+    @property
+    def region(self) -> str:
+        return self.event_data.get('region', 'unknown')
+        
+    @property
+    def impact(self) -> str:
+        return self.event_data.get('impact', 'unknown')
+        
+    @property
+    def faction(self) -> str:
+        return self.event_data.get('faction', 'unknown')
+        
+    @property
+    def effects(self):
+        return self.event_data.get('effects', [])
 
     def __str__(self):
         details = []
@@ -31,34 +174,35 @@ class FantasyEvent(Event):
         return base
 
 class NaturalEvent(FantasyEvent):
-    def __init__(self, year: int, event_data: dict):
-        super().__init__(year, event_data)
+    __slots__ = ()
 
 class MagicalEvent(FantasyEvent):
-    def __init__(self, year: int, event_data: dict):
-        super().__init__(year, event_data)
+    __slots__ = ()
 
 class PoliticalEvent(FantasyEvent):
-    def __init__(self, year: int, event_data: dict):
-        super().__init__(year, event_data)
+    __slots__ = ()
+
+# Event class per event definition category
+EVENT_CLASSES = {
+    'natural': NaturalEvent,
+    'magical': MagicalEvent,
+    'political': PoliticalEvent
+}
 
 class FantasyEventGenerator:
-    def __init__(self, fantasy_world: FantasyWorld):
+    def __init__(self, fantasy_world: "FantasyWorld"):
         self.world = fantasy_world
 
-    def generate_events(self, year: int) -> List[FantasyEvent]:
+    def generate_events(self, year: int, event_types: EventTypes = None) -> List[FantasyEvent]:
         # Set the year directly
         self.world.year = year
         raw_events = self.world.generate_events()
         
         events = []
         for event_data in raw_events:
-            category = event_data.get('category', '')
-            if category == 'natural':
-                events.append(NaturalEvent(year, event_data))
-            elif category == 'magical':
-                events.append(MagicalEvent(year, event_data))
-            elif category == 'political':
-                events.append(PoliticalEvent(year, event_data))
+            event_class = EVENT_CLASSES.get(event_data.get('category', ''))
+            # Effects are applied either way; only wanted events are built
+            if event_class is not None and wants(event_types, event_class):
+                events.append(event_class(year, event_data))
         
         return events
\ No newline at end of file
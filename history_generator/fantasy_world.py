@@ -1,110 +1,149 @@
 from .event_processor import EventProcessor
+from .event_queue import EventQueue
 from .logger_config import world_logger
+from .world_stats import WorldStats
+import logging
 import os
 
+# Event definitions bundled with the project
+EVENT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "event_definitions.json")
+
+# Stats every world starts with
+DEFAULT_REGIONS = {
+    "Northern Mountains": {
+        "magical_energy": 30,
+        "trade": 40,
+        "fertility": 20,
+        "creature_diversity": 50,
+        "dragon_activity": 10
+    },
+    "Central Valley": {
+        "magical_energy": 50,
+        "trade": 70,
+        "fertility": 80,
+        "creature_diversity": 40
+    },
+    "Eastern Forests": {
+        "magical_energy": 60,
+        "trade": 30,
+        "fertility": 55,
+        "creature_diversity": 40
+    },
+    "Southern Plains": {
+        "magical_energy": 20,
+        "trade": 60,
+        "fertility": 70,
+        "creature_diversity": 30
+    },
+    "Western Deserts": {
+        "magical_energy": 40,
+        "trade": 40,
+        "fertility": 10,
+        "creature_diversity": 20
+    },
+    "Coastal Regions": {
+        "magical_energy": 30,
+        "trade": 80,
+        "fertility": 50,
+        "creature_diversity": 50
+    }
+}
+
+DEFAULT_FACTIONS = {
+    "Mages' Guild": {
+        "power": 60,
+        "influence": 65,
+        "stability": 70
+    },
+    "Noble Houses": {
+        "power": 65,
+        "influence": 70,
+        "stability": 75
+    },
+    "Merchant League": {
+        "power": 55,
+        "influence": 60,
+        "stability": 80,
+        "trade_income": 70
+    },
+    "Rangers' Order": {
+        "power": 55,
+        "influence": 50,
+        "stability": 85
+    },
+    "Temple of Light": {
+        "power": 55,
+        "influence": 75,
+        "stability": 85
+    },
+    "Dark Brotherhood": {
+        "power": 50,
+        "influence": 40,
+        "stability": 40
+    }
+}
+
 class FantasyWorld:
-    def __init__(self):
+    def __init__(self, rng=None):
         self.year = 1000
-        self.regions = {
-            "Northern Mountains": {
-                "magical_energy": 30,
-                "trade": 40,
-                "fertility": 20,
-                "creature_diversity": 50,
-                "dragon_activity": 10
-            },
-            "Central Valley": {
-                "magical_energy": 50,
-                "trade": 70,
-                "fertility": 80,
-                "creature_diversity": 40
-            },
-            "Eastern Forests": {
-                "magical_energy": 60,
-                "trade": 30,
-                "fertility": 55,
-                "creature_diversity": 40
-            },
-            "Southern Plains": {
-                "magical_energy": 20,
-                "trade": 60,
-                "fertility": 70,
-                "creature_diversity": 30
-            },
-            "Western Deserts": {
-                "magical_energy": 40,
-                "trade": 40,
-                "fertility": 10,
-                "creature_diversity": 20
-            },
-            "Coastal Regions": {
-                "magical_energy": 30,
-                "trade": 80,
-                "fertility": 50,
-                "creature_diversity": 50
-            }
-        }
-        self.factions = {
-            "Mages' Guild": {
-                "power": 60,
-                "influence": 65,
-                "stability": 70
-            },
-            "Noble Houses": {
-                "power": 65,
-                "influence": 70,
-                "stability": 75
-            },
-            "Merchant League": {
-                "power": 55,
-                "influence": 60,
-                "stability": 80,
-                "trade_income": 70
-            },
-            "Rangers' Order": {
-                "power": 55,
-                "influence": 50,
-                "stability": 85
-            },
-            "Temple of Light": {
-                "power": 55,
-                "influence": 75,
-                "stability": 85
-            },
-            "Dark Brotherhood": {
-                "power": 50,
-                "influence": 40,
-                "stability": 40
-            }
-        }
+        # Delayed follow-up events, shared with the event processor via the world state
+        self.delayed_events = EventQueue()
         
         try:
-            event_file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "event_definitions.json")
-            self.event_processor = EventProcessor(event_file_path)
+            self.event_processor = EventProcessor(EVENT_FILE, rng)
             world_logger.info("FantasyWorld successfully initialized")
         except Exception as e:
-            world_logger.error(f"Error initializing EventProcessor: {e}")
+            world_logger.error("Error initializing EventProcessor: %s", e)
             # Create an empty EventProcessor as fallback
-            self.event_processor = EventProcessor("")
+            self.event_processor = EventProcessor("", rng)
             self.event_processor.events = {"events": {}}
             world_logger.warning("EventProcessor initialized with empty definitions")
 
+        # Region and faction stats as one matrix, laid out for the loaded events
+        self.stats = WorldStats.from_sections({"regions": DEFAULT_REGIONS, "factions": DEFAULT_FACTIONS},
+                                              self.event_processor.events)
+        self._regions = self.stats.section("regions")
+        self._factions = self.stats.section("factions")
+        
+    @property
+    def regions(self):
+        """Region stats as a dictionary-style view ({region: {stat: value}})."""
+        return self._regions
+        
+    @regions.setter
+    def regions(self, regions):
+        # A new view object makes the event processor re-evaluate all conditions
+        self.stats.load("regions", regions)
+        self._regions = self.stats.section("regions")
+        
+    @property
+    def factions(self):
+        """Faction stats as a dictionary-style view ({faction: {stat: value}})."""
+        return self._factions
+        
+    @factions.setter
+    def factions(self, factions):
+        self.stats.load("factions", factions)
+        self._factions = self.stats.section("factions")
+        
     def get_world_state(self):
         return {
             "current_year": self.year,
             "regions": self.regions,
-            "factions": self.factions
+            "factions": self.factions,
+            "stats": self.stats,
+            "delayed_events": self.delayed_events
         }
 
     def generate_events(self):
-        world_logger.info(f"Generating events for year {self.year}")
+        world_logger.info("Generating events for year %d", self.year)
         
         world_state = self.get_world_state()
         triggered_events = self.event_processor.process_events(world_state, self.year)
         
-        if triggered_events:
-            world_logger.info(f"Found fantasy events: {len(triggered_events)}")
+        if triggered_events and world_logger.isEnabledFor(logging.INFO):
+            world_logger.info("Found fantasy events: %d", len(triggered_events))
             for event in triggered_events:
-                world_logger.info(f"  {event['name']}")
+                world_logger.info("  %s", event['name'])
             
         return triggered_events
\ No newline at end of file
@@ -0,0 +1,222 @@
+from typing import Dict, List
+import numpy as np
+from .person import Person
+from .population import FEMALE, NO_YEAR
+from .events import BirthEvent, DeathEvent, Event, EventTypes, MarriageEvent, wants
+from .config.settings import CHILDBIRTH, MARRIAGE, PERSON
+
+# Death year of persons who survive the step
+_SURVIVES = np.iinfo(np.int32).max
+
+# Longest aggregated step: nobody born within it comes of marriage age before it ends
+MAX_STEP = MARRIAGE["min_age"]
+
+def sample_death_years(population, start_year: int, years: int, generator: np.random.Generator) -> np.ndarray:
+    """
+    Samples the death year of every living person over several years at once.
+    
+    In a simulated year a person dies if their age exceeds max_base_age
+    plus a bonus drawn uniformly from 0 to max_age_bonus, i.e. with
+    probability min(max(age - max_base_age, 0), max_age_bonus + 1) /
+    (max_age_bonus + 1). The death year is drawn by inverting the survival
+    function over the step with one uniform draw per person who can die.
+    
+    Args:
+        population: The population store
+        start_year: First year of the step
+        years: Number of years in the step
+        generator: Random generator for the draws
+        
+    Returns:
+        Death year per row (_SURVIVES for persons who survive the step or are already dead)
+    """
+    death_years = np.full(len(population), _SURVIVES, dtype=np.int32)
+    alive = np.flatnonzero(population.living_mask())
+    last_age = start_year + years - 1 - population.birth_year[alive]
+    mortal = alive[last_age > PERSON["max_base_age"]]
+    if len(mortal) == 0:
+        return death_years
+    ages = (start_year - population.birth_year[mortal])[:, None] + np.arange(years)
+    outcomes = PERSON["max_age_bonus"] + 1
+    hazard = np.clip(ages - PERSON["max_base_age"], 0, outcomes) / outcomes
+    survival = np.cumprod(1.0 - hazard, axis=1)
+    draws = generator.random(len(mortal))
+    dies = survival <= draws[:, None]
+    died = dies.any(axis=1)
+    death_years[mortal[died]] = start_year + dies[died].argmax(axis=1)
+    return death_years
+
+def _first_living_partner(population, person_id: int, death_year_of, year: int) -> int:
+    """Returns the first partner alive in a year, or -1."""
+    for partner_id in population.partners.neighbors(person_id):
+        if death_year_of(partner_id) > year and population.death_year[partner_id] == NO_YEAR:
+            return partner_id
+    return -1
+
+def fast_forward(simulation, years: int, event_types: EventTypes = None) -> List[Event]:
+    """
+    Advances a simulation by several years in one aggregated step.
+    
+    Demographic processes are sampled for the whole step instead of year
+    by year: death years from the survival function of every person,
+    births as binomial draws over the fertile years of every couple, and
+    partner searches only in years when the marriage market has
+    candidates. Marriages, successions and the fantasy world are still
+    resolved in year order. The outcome follows the same distributions as
+    yearly simulation but is a different random path, and only events of
+    the subscribed classes are built.
+    
+    Partner searches only cover the family members alive at the start of
+    a step, so longer spans are split into steps of at most MAX_STEP
+    years: children born in one step are offered marriage in the next,
+    once they can have come of age.
+    
+    Args:
+        simulation: The simulation to advance
+        years: Number of years to simulate
+        event_types: Event classes to produce (all if None)
+        
+    Returns:
+        The events of the span in year order
+    """
+    events = []
+    end_year = simulation.year + years
+    while simulation.year < end_year:
+        events.extend(_fast_forward_step(simulation, min(MAX_STEP, end_year - simulation.year), event_types))
+    return events
+    
+def _fast_forward_step(simulation, years: int, event_types: EventTypes) -> List[Event]:
+    """Advances a simulation by one aggregated step of at most MAX_STEP years."""
+    population = simulation.population
+    market = simulation.marriage_market
+    stream = simulation.random.stream("fast_forward")
+    generator = stream.generator
+    start_year = simulation.year
+    end_year = start_year + years
+    events: Dict[int, List[Event]] = {year: [] for year in range(start_year, end_year)}
+    want_marriages = wants(event_types, MarriageEvent)
+    want_births = wants(event_types, BirthEvent)
+    
+    death_years = sample_death_years(population, start_year, years, generator)
+    # Persons added during the step are too young to die within it
+    def death_year_of(person_id: int) -> int:
+        return int(death_years[person_id]) if person_id < len(death_years) else _SURVIVES
+        
+    # Family members alive at the start, in dynasty and family order
+    members = [(dynasty, person.id) for dynasty in simulation.dynasties for person in dynasty.family
+               if not person.is_dead()]
+    ids = np.array([person_id for _, person_id in members], dtype=np.int64)
+    birth_years = population.birth_year[ids]
+    
+    # Partner searches: a failed search changes nothing, so years without candidates are skipped
+    seekers = np.flatnonzero(population.partner_count[ids] == 0)
+    married_in: Dict[int, int] = {}
+    for year in range(start_year, end_year):
+        market.update(year)
+        if len(seekers) == 0 or len(market) == 0:
+            continue
+        seeker_ids = ids[seekers]
+        ages = year - birth_years[seekers]
+        chance = MARRIAGE["marriage_chance_base"] + (ages - MARRIAGE["min_age"]) * MARRIAGE["marriage_chance_increase"]
+        searching = ((ages >= MARRIAGE["min_age"]) & (death_years[seeker_ids] > year) &
+                     (generator.random(len(seekers)) < chance))
+        matched = []
+        for index in np.flatnonzero(searching).tolist():
+            person = Person.view(population, int(seeker_ids[index]))
+            partner = market.find_partner(person, year)
+            if partner:
+                person.marry(partner)
+                market.remove(partner)
+                married_in[person.id] = year
+                matched.append(index)
+                if want_marriages:
+                    events[year].append(MarriageEvent(
+                        year=year,
+                        person1=person.name,
+                        person2=partner.name,
+                        age=year - person.birth_year,
+                        person1_id=person.id,
+                        person2_id=partner.id
+                    ))
+        if matched:
+            seekers = np.delete(seekers, matched)
+            
+    # Births: a binomial number of children over the fertile years of every couple
+    mothers = np.flatnonzero((population.gender[ids] == FEMALE) & (population.partner_count[ids] > 0))
+    for index in mothers.tolist():
+        dynasty, mother_id = members[index]
+        birth_year = int(birth_years[index])
+        first = max(start_year, birth_year + CHILDBIRTH["min_age"] + 1, married_in.get(mother_id, start_year - 1) + 1)
+        if first >= end_year:
+            continue
+        father_id = _first_living_partner(population, mother_id, death_year_of, first)
+        if father_id < 0:
+            continue
+        last = min(end_year, birth_year + CHILDBIRTH["max_age"], death_year_of(mother_id), death_year_of(father_id))
+        if last <= first:
+            continue
+        children = generator.binomial(last - first, CHILDBIRTH["chance"])
+        if children == 0:
+            continue
+        mother = Person.view(population, mother_id)
+        father = Person.view(population, father_id)
+        for year in np.sort(generator.choice(last - first, size=children, replace=False) + first).tolist():
+            child_gender = stream.choice(["male", "female"])
+            child_name = Person.generate_random_name(child_gender, stream)
+            child = Person(child_name, child_gender, year, mother.faction, mother.region, population=population)
+            mother.add_child(child)
+            father.add_child(child)
+            dynasty.add_member(child)
+            if want_births:
+                events[year].append(BirthEvent(
+                    year=year,
+                    child_name=child_name,
+                    mother_name=mother.name,
+                    father_name=father.name,
+                    child_id=child.id
+                ))
+                
+    # Deaths and successions in year order
+    for dynasty in simulation.dynasties:
+        _resolve_dynasty(dynasty, death_year_of, end_year, events, event_types)
+    dying = np.flatnonzero(death_years < end_year)
+    dying = dying[np.argsort(death_years[dying], kind="stable")]
+    population.death_year[dying] = death_years[dying]
+    population.death_log.extend(dying.tolist())
+    
+    # The fantasy world still evolves year by year
+    generator = simulation.fantasy_generator
+    if generator is not None:
+        for year in range(start_year, end_year):
+            events[year].extend(generator.generate_events(year, event_types))
+    simulation.person_manager.cleanup_dead_persons(end_year - 1)
+    simulation.year = end_year
+    return [event for year in range(start_year, end_year) for event in events[year]]
+
+def _resolve_dynasty(dynasty, death_year_of, end_year: int, events: Dict[int, List[Event]],
+                     event_types: EventTypes) -> None:
+    """Removes the members who died during a step and crowns successors in year order."""
+    want_deaths = wants(event_types, DeathEvent)
+    died: Dict[int, list] = {}
+    for person in dynasty.family:
+        death_year = death_year_of(person.id)
+        if death_year < end_year:
+            died.setdefault(death_year, []).append(person)
+            
+    for death_year in sorted(died):
+        # All deaths of a year are removed before the heir is chosen
+        monarch_died = False
+        for person in died[death_year]:
+            dynasty.remove_member(person)
+            monarch_died = monarch_died or person == dynasty.monarch
+            if want_deaths:
+                events[death_year].append(DeathEvent(
+                    year=death_year,
+                    person_name=person.name,
+                    age=death_year - person.birth_year,
+                    person_id=person.id
+                ))
+        if monarch_died:
+            succession_event = dynasty.succeed(death_year)
+            if wants(event_types, type(succession_event)):
+                events[death_year].append(succession_event)
@@ -0,0 +1,361 @@
+import json
+import os
+from collections import deque
+from typing import List, Optional
+import numpy as np
+from .person import Person
+from .population import GENDERS, NO_YEAR, RELATIONS
+
+FORMAT_VERSION = 1
+
+# One fixed-size record per person ID; edges of the three relations are
+# contiguous slices of the edge file, names slices of the name file
+NODE_DTYPE = np.dtype([
+    ("archived", "u1"),
+    ("gender", "i1"),
+    ("was_king", "u1"),
+    ("faction", "<i2"),
+    ("region", "<i2"),
+    ("birth_year", "<i4"),
+    ("death_year", "<i4"),
+    ("name_offset", "<i8"),
+    ("name_length", "<i4"),
+    ("edge_offset", "<i8", (len(RELATIONS),)),
+    ("edge_count", "<i4", (len(RELATIONS),))
+])
+EDGE_DTYPE = np.dtype("<i4")
+
+_NODES = "nodes.bin"
+_EDGES = "edges.bin"
+_NAMES = "names.bin"
+_META = "meta.json"
+
+class GenealogyError(ValueError):
+    """Raised when a genealogy store cannot be opened."""
+
+def _gather(adjacency, rows: np.ndarray):
+    """Returns the concatenated edges of rows with their offsets into the result and counts."""
+    adjacency.compact()
+    starts = np.zeros(len(rows), dtype=np.int64)
+    counts = np.zeros(len(rows), dtype=np.int64)
+    inside = rows < len(adjacency.indptr) - 1
+    starts[inside] = adjacency.indptr[rows[inside]]
+    counts[inside] = adjacency.indptr[rows[inside] + 1] - starts[inside]
+    offsets = np.cumsum(counts) - counts
+    positions = np.repeat(starts - offsets, counts) + np.arange(int(counts.sum()))
+    return adjacency.indices[positions], offsets, counts
+
+class GenealogyStore:
+    """
+    On-disk genealogy of evicted persons, read through memory maps.
+    
+    The store is a directory of flat files: one fixed-size node record per
+    person ID (direct addressing, so lookups need no index in memory), an
+    edge file with the partners, children and parents of every archived
+    person, and a name file. Records are written once, when a dead person
+    is evicted from the population; a dead person gains no new relations,
+    so the records never change afterwards. Files are mapped on demand and
+    only the pages a query touches are loaded.
+    
+    Attributes:
+        path: Directory of the store
+    """
+    
+    def __init__(self, path: str):
+        """
+        Opens a store, creating the directory if it does not exist.
+        
+        Args:
+            path: Directory of the store
+            
+        Raises:
+            GenealogyError: If the directory holds a store of another format
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, _META)
+        if os.path.exists(meta_path):
+            with open(meta_path) as file:
+                meta = json.load(file)
+            if meta.get("format") != FORMAT_VERSION:
+                raise GenealogyError(f"Unsupported genealogy format {meta.get('format')} in {path}")
+            self.factions: List[str] = meta["factions"]
+            self.regions: List[str] = meta["regions"]
+        else:
+            self.factions = []
+            self.regions = []
+        for name in (_NODES, _EDGES, _NAMES):
+            open(self._file(name), "ab").close()
+        # Sizes come from the files, so data appended after the last metadata write stays addressable
+        self._capacity = os.path.getsize(self._file(_NODES)) // NODE_DTYPE.itemsize
+        self._edge_count = os.path.getsize(self._file(_EDGES)) // EDGE_DTYPE.itemsize
+        self._name_bytes = os.path.getsize(self._file(_NAMES))
+        self._nodes = self._map_nodes() if self._capacity else np.zeros(0, dtype=NODE_DTYPE)
+        self._edges: Optional[np.ndarray] = None
+        self._names: Optional[np.ndarray] = None
+        
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+        
+    def _map_nodes(self) -> np.ndarray:
+        return np.memmap(self._file(_NODES), dtype=NODE_DTYPE, mode="r+", shape=(self._capacity,))
+        
+    def _reserve(self, size: int) -> None:
+        """Grows the node file (sparsely) to hold at least size records."""
+        if size <= self._capacity:
+            return
+        self._capacity = max(size, 2 * self._capacity, 1024)
+        if isinstance(self._nodes, np.memmap):
+            self._nodes.flush()
+        self._nodes = None
+        with open(self._file(_NODES), "r+b") as file:
+            file.truncate(self._capacity * NODE_DTYPE.itemsize)
+        self._nodes = self._map_nodes()
+        
+    def _edge_map(self) -> np.ndarray:
+        if self._edges is None:
+            self._edges = (np.memmap(self._file(_EDGES), dtype=EDGE_DTYPE, mode="r", shape=(self._edge_count,))
+                           if self._edge_count else np.zeros(0, dtype=EDGE_DTYPE))
+        return self._edges
+        
+    def _name_map(self) -> np.ndarray:
+        if self._names is None:
+            self._names = (np.memmap(self._file(_NAMES), dtype=np.uint8, mode="r", shape=(self._name_bytes,))
+                           if self._name_bytes else np.zeros(0, dtype=np.uint8))
+        return self._names
+        
+    def archive(self, population, rows) -> None:
+        """
+        Writes persons with all their relations to the store.
+        
+        Persons that are already archived are skipped: their edges have
+        left memory, so archiving them again would overwrite their records
+        with empty relations.
+        
+        Args:
+            population: The population the rows belong to
+            rows: IDs of the persons to archive
+        """
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        known = rows[rows < self._capacity]
+        rows = np.setdiff1d(rows, known[self._nodes["archived"][known] != 0], assume_unique=True)
+        if len(rows) == 0:
+            return
+        self._reserve(int(rows[-1]) + 1)
+        nodes = self._nodes
+        for column in ("gender", "was_king", "faction", "region", "birth_year", "death_year"):
+            nodes[column][rows] = getattr(population, column)[rows]
+            
+        # Names, appended as UTF-8
+        encoded = [population.names[row].encode("utf-8") for row in rows.tolist()]
+        lengths = np.fromiter((len(name) for name in encoded), dtype=np.int64, count=len(encoded))
+        nodes["name_offset"][rows] = self._name_bytes + np.cumsum(lengths) - lengths
+        nodes["name_length"][rows] = lengths
+        with open(self._file(_NAMES), "ab") as file:
+            file.write(b"".join(encoded))
+        self._name_bytes += int(lengths.sum())
+        self._names = None
+        
+        # One block of edges per relation
+        with open(self._file(_EDGES), "ab") as file:
+            for index, relation in enumerate(RELATIONS):
+                edges, offsets, counts = _gather(getattr(population, relation), rows)
+                nodes["edge_offset"][rows, index] = self._edge_count + offsets
+                nodes["edge_count"][rows, index] = counts
+                file.write(edges.astype(EDGE_DTYPE).tobytes())
+                self._edge_count += len(edges)
+        self._edges = None
+        
+        nodes["archived"][rows] = 1
+        self.factions = list(population.factions.names)
+        self.regions = list(population.regions.names)
+        self.flush()
+        
+    def retain(self, ids) -> None:
+        """
+        Forgets every archived person not in ids.
+        
+        Used when resuming from a checkpoint taken before later evictions;
+        the records stay in the files but are no longer reachable.
+        
+        Args:
+            ids: IDs of the persons to keep
+        """
+        forget = self._nodes["archived"] != 0
+        ids = np.asarray(ids, dtype=np.int64)
+        forget[ids[ids < self._capacity]] = False
+        self._nodes["archived"][forget] = 0
+        
+    def __contains__(self, person_id: int) -> bool:
+        return person_id < self._capacity and self._nodes[person_id]["archived"] != 0
+        
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._nodes["archived"]))
+        
+    def ids(self) -> np.ndarray:
+        """Returns the IDs of all archived persons in ascending order."""
+        return np.flatnonzero(self._nodes["archived"])
+        
+    def relatives(self, relation: str, person_id: int) -> List[int]:
+        """
+        Returns the partners, children or parents of an archived person.
+        
+        Args:
+            relation: One of RELATIONS
+            person_id: ID of the person
+            
+        Returns:
+            List of related IDs in insertion order
+        """
+        record = self._nodes[person_id]
+        index = RELATIONS.index(relation)
+        offset = int(record["edge_offset"][index])
+        return self._edge_map()[offset:offset + int(record["edge_count"][index])].tolist()
+        
+    def name(self, person_id: int) -> str:
+        """
+        Returns the name of an archived person.
+        
+        Args:
+            person_id: ID of the person
+            
+        Returns:
+            The name
+        """
+        record = self._nodes[person_id]
+        offset = int(record["name_offset"])
+        return self._name_map()[offset:offset + int(record["name_length"])].tobytes().decode("utf-8")
+        
+    def record(self, person_id: int) -> dict:
+        """
+        Returns everything stored about an archived person.
+        
+        Args:
+            person_id: ID of the person
+            
+        Returns:
+            Dictionary with name, gender, years, faction, region, crown and relations
+            
+        Raises:
+            KeyError: If the person is not archived
+        """
+        if person_id not in self:
+            raise KeyError(person_id)
+        record = self._nodes[person_id]
+        result = {
+            "id": person_id,
+            "name": self.name(person_id),
+            "gender": GENDERS[int(record["gender"])],
+            "birth_year": int(record["birth_year"]),
+            "death_year": None if record["death_year"] == NO_YEAR else int(record["death_year"]),
+            "faction": self.factions[int(record["faction"])],
+            "region": self.regions[int(record["region"])],
+            "was_king": bool(record["was_king"])
+        }
+        for relation in RELATIONS:
+            result[relation] = self.relatives(relation, person_id)
+        return result
+        
+    def flush(self) -> None:
+        """Writes pending node changes and the metadata to disk."""
+        if isinstance(self._nodes, np.memmap):
+            self._nodes.flush()
+        meta = {"format": FORMAT_VERSION, "factions": self.factions, "regions": self.regions}
+        temporary_path = self._file(_META + ".tmp")
+        with open(temporary_path, "w") as file:
+            json.dump(meta, file)
+        os.replace(temporary_path, self._file(_META))
+        
+    def close(self) -> None:
+        """Flushes the store and releases its memory maps."""
+        self.flush()
+        self._nodes = np.zeros(0, dtype=NODE_DTYPE)
+        self._capacity = 0
+        self._edges = None
+        self._names = None
+
+def ancestors(population, person_id: int, generations: Optional[int] = None) -> List[int]:
+    """
+    Returns the ancestors of a person, generation by generation.
+    
+    Args:
+        population: The population store (with or without a genealogy store)
+        person_id: ID of the person
+        generations: Maximum number of generations to go back (all if None)
+        
+    Returns:
+        IDs of parents, grandparents, ... without duplicates
+    """
+    return _traverse(population, "parents", person_id, generations)
+
+def descendants(population, person_id: int, generations: Optional[int] = None) -> List[int]:
+    """
+    Returns the descendants of a person, generation by generation.
+    
+    Args:
+        population: The population store (with or without a genealogy store)
+        person_id: ID of the person
+        generations: Maximum number of generations to go down (all if None)
+        
+    Returns:
+        IDs of children, grandchildren, ... without duplicates
+    """
+    return _traverse(population, "children", person_id, generations)
+
+def _traverse(population, relation: str, person_id: int, generations: Optional[int]) -> List[int]:
+    """Breadth-first search along one relation."""
+    seen = {person_id}
+    result = []
+    queue = deque([(person_id, 0)])
+    while queue:
+        current, depth = queue.popleft()
+        if generations is not None and depth >= generations:
+            continue
+        for relative in population.relatives(relation, current):
+            if relative not in seen:
+                seen.add(relative)
+                result.append(relative)
+                queue.append((relative, depth + 1))
+    return result
+
+def _describe(person) -> str:
+    gender = "♂ " if person.gender == "male" else "♀ "
+    status = "†" if person.is_dead() else ""
+    year_info = f"{person.birth_year}–{person.death_year}" if person.death_year else f"{person.birth_year}–"
+    return f"{gender}{person.name} ({status}{year_info})"
+
+def family_tree(population, root_id: int) -> List[str]:
+    """
+    Renders the descendants of a person as indented lines.
+    
+    Every person appears once, with crown, gender, years and partners;
+    children are indented below their first parent in the tree. The tree is
+    walked iteratively, so deep dynasties do not hit the recursion limit,
+    and evicted persons are read from the genealogy store.
+    
+    Args:
+        population: The population store
+        root_id: ID of the person at the root
+        
+    Returns:
+        One line per person
+    """
+    lines = []
+    shown = set()
+    stack = [(root_id, 0)]
+    while stack:
+        person_id, level = stack.pop()
+        if person_id in shown:
+            continue
+        shown.add(person_id)
+        person = Person.view(population, person_id)
+        crown = "👑 " if person.was_king else ""
+        symbol = "├──" if level > 0 else ""
+        line = "  " * level + f"{symbol}{crown}{_describe(person)}"
+        partners = person.partners
+        if partners:
+            line += " ⚭ " + ", ".join(_describe(partner) for partner in partners)
+        lines.append(line)
+        for child_id in reversed(population.relatives("children", person_id)):
+            stack.append((child_id, level + 1))
+    return lines
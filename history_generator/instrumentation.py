@@ -0,0 +1,157 @@
+import csv
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+class Instrumentation:
+    """
+    Opt-in per-phase metrics of a simulation.
+    
+    Every simulated year is one row: wall time and calls per phase,
+    counters (persons processed, candidates scanned, events evaluated and
+    triggered, ...) and gauges (queue depth, population size). Phases are
+    also recorded as Chrome trace events. With track_allocations, the net
+    memory allocated per phase is recorded via tracemalloc, which slows
+    the simulation down noticeably.
+    
+    Attributes:
+        track_allocations: Whether allocations are recorded per phase
+    """
+    
+    def __init__(self, track_allocations: bool = False):
+        """
+        Initializes empty metrics.
+        
+        Args:
+            track_allocations: Whether to record allocated memory per phase
+        """
+        self.track_allocations = track_allocations
+        self._rows: List[Dict[str, float]] = []
+        self._row: Optional[Dict[str, float]] = None
+        self._trace: List[dict] = []
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._tid = threading.get_ident()
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            
+    def begin_year(self, year: int) -> None:
+        """
+        Starts the row of a year.
+        
+        Args:
+            year: The simulated year
+        """
+        self._row = {"year": year}
+        self._rows.append(self._row)
+        
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Times a phase of the current year.
+        
+        Args:
+            name: Name of the phase
+        """
+        row = self._row
+        allocated = tracemalloc.get_traced_memory()[0] if self.track_allocations else 0
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            row[f"{name}_ms"] = row.get(f"{name}_ms", 0.0) + (end - start) / 1e6
+            row[f"{name}_calls"] = row.get(f"{name}_calls", 0) + 1
+            if self.track_allocations:
+                row[f"{name}_alloc_kb"] = (row.get(f"{name}_alloc_kb", 0.0) +
+                                           (tracemalloc.get_traced_memory()[0] - allocated) / 1024)
+            self._trace.append({
+                "name": name, "cat": "simulation", "ph": "X",
+                "ts": (start - self._origin) / 1000, "dur": (end - start) / 1000,
+                "pid": self._pid, "tid": self._tid, "args": {"year": row["year"]}
+            })
+            
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Adds to a counter of the current year.
+        
+        Args:
+            name: Name of the counter
+            value: Amount to add
+        """
+        self._row[name] = self._row.get(name, 0) + value
+        
+    def gauge(self, name: str, value: float) -> None:
+        """
+        Records a value of the current year and adds it to the trace as a counter.
+        
+        Args:
+            name: Name of the gauge
+            value: The value
+        """
+        self._row[name] = value
+        self._trace.append({
+            "name": name, "cat": "simulation", "ph": "C",
+            "ts": (time.perf_counter_ns() - self._origin) / 1000,
+            "pid": self._pid, "tid": self._tid, "args": {name: value}
+        })
+        
+    def rows(self) -> List[Dict[str, float]]:
+        """
+        Returns the metrics table.
+        
+        Returns:
+            One dictionary per simulated year
+        """
+        return [dict(row) for row in self._rows]
+        
+    def columns(self) -> List[str]:
+        """Returns all column names of the metrics table in first-seen order."""
+        columns: Dict[str, None] = {}
+        for row in self._rows:
+            columns.update(dict.fromkeys(row))
+        return list(columns)
+        
+    def write_table(self, path: str) -> None:
+        """
+        Writes the per-year metrics table as CSV.
+        
+        Args:
+            path: Path of the CSV file
+        """
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.columns(), restval=0)
+            writer.writeheader()
+            for row in self._rows:
+                writer.writerow({key: round(value, 4) if isinstance(value, float) else value
+                                 for key, value in row.items()})
+                                 
+    def chrome_trace(self) -> dict:
+        """
+        Returns the recorded phases in the Chrome trace event format.
+        
+        The result can be loaded in chrome://tracing or Perfetto.
+        
+        Returns:
+            Dictionary with the trace events
+        """
+        return {"traceEvents": list(self._trace), "displayTimeUnit": "ms"}
+        
+    def write_chrome_trace(self, path: str) -> None:
+        """
+        Writes the recorded phases as a Chrome trace JSON file.
+        
+        Args:
+            path: Path of the JSON file
+        """
+        with open(path, "w") as file:
+            json.dump(self.chrome_trace(), file)
+            
+    def close(self) -> None:
+        """Stops allocation tracking if it was started for this instrumentation."""
+        if self.track_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -1,65 +1,187 @@
+import copy
+import json
 import logging
 import sys
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Default level of all project loggers; hot paths check isEnabledFor before building log arguments
+DEFAULT_LEVEL = logging.WARNING
+
+# Names of all loggers used by the project
+PROJECT_LOGGERS = ('events', 'world', 'dynasty', 'marriage', 'person', 'simulation',
+                   'event_processor', 'fantasy_world', 'fantasy_events', 'main')
+
 def setup_logger(name):
     """Configures and returns a logger instance."""
     logger = logging.getLogger(name)
-    logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
-    
-    # Formatter for log messages
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logger.setLevel(DEFAULT_LEVEL)
     
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    # Console handler, added only once even if the logger is set up again
+    if not logger.handlers:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(console_handler)
     
     return logger
 
-# Global logger instances
-event_logger = setup_logger('events')
-world_logger = setup_logger('world')
+def set_log_level(level):
+    """
+    Sets the level of all project loggers.
+    
+    Args:
+        level: A logging level such as logging.DEBUG or "DEBUG"
+    """
+    for name in PROJECT_LOGGERS:
+        logging.getLogger(name).setLevel(level)
 
-# Configure world logger
-world_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+_configured = False
 
-# Configure event logger
-event_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+def configure_logging():
+    """
+    Adds the console handlers and configures the root logger, once.
+    
+    Importing the package only sets logger levels; handlers are set up when
+    the first Simulation or EventProcessor is created (or by an entry point),
+    so short-lived processes that never log do not pay for it. Levels set
+    with set_log_level before are kept.
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+    for name in ('events', 'world'):
+        level = logging.getLogger(name).level
+        setup_logger(name).setLevel(level)
+    logging.basicConfig(level=DEFAULT_LEVEL, format=LOG_FORMAT)
 
-# Configure dynasty logger
-dynasty_logger = logging.getLogger('dynasty')
-dynasty_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+class StructuredFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+    
+    Besides time, level, logger and message, values passed with
+    extra={...} are included as fields.
+    """
+    
+    _RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+    
+    def format(self, record):
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in self._RESERVED:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
 
-# Configure marriage logger
-marriage_logger = logging.getLogger('marriage')
-marriage_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+# Argument types that cannot change between logging a record and formatting it on the listener thread
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None))
 
-# Configure person logger
-person_logger = logging.getLogger('person')
-person_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+def _prepare_record(record):
+    """
+    Prepares a record for the queue without formatting it on the calling thread.
+    
+    Unlike QueueHandler.prepare, the message arguments and exc_info are kept,
+    so the listener thread formats the message and the traceback (and
+    StructuredFormatter can write the exception field). Only records with
+    arguments that could change before the listener formats them, such as
+    dictionaries, are merged into their message right away.
+    """
+    args = record.args
+    if args:
+        # A single mapping argument is stored as args itself and can change as well
+        if not isinstance(args, tuple) or not all(isinstance(value, _IMMUTABLE_ARGS) for value in args):
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+    return record
 
-# Configure simulation logger
-simulation_logger = logging.getLogger('simulation')
-simulation_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+# Listener and previous logger configuration while async logging is enabled
+_async_listener = None
+_saved_configuration = {}
 
-# Configure event processor logger
-event_processor_logger = logging.getLogger('event_processor')
-event_processor_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+def enable_async_logging(path=None, level=logging.DEBUG, structured=True, buffer_size=1000):
+    """
+    Routes all project loggers through a queue to a background thread.
+    
+    The simulation thread only puts records on a queue; a listener thread
+    formats them and writes them in batches of buffer_size records (errors
+    are written immediately). This keeps verbose logging from stalling the
+    simulation on console or file output.
+    
+    Args:
+        path: File to write to (stdout if None)
+        level: Level of all project loggers while enabled
+        structured: Whether to write JSON lines instead of plain text
+        buffer_size: Number of records written per batch
+        
+    Returns:
+        The started QueueListener
+    """
+    # Imported here: handlers and queue pull in socket and threading machinery
+    import logging.handlers
+    import queue
+    global _async_listener
+    disable_async_logging()
+    # Console handlers must exist before they are saved, or they would be added while records are queued
+    configure_logging()
+    
+    target = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler(sys.stdout)
+    target.setFormatter(StructuredFormatter() if structured else logging.Formatter(LOG_FORMAT))
+    buffered = logging.handlers.MemoryHandler(buffer_size, flushLevel=logging.ERROR, target=target)
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    # Records stay in this process, so they need not be made picklable
+    queue_handler.prepare = _prepare_record
+    
+    for name in PROJECT_LOGGERS:
+        logger = logging.getLogger(name)
+        _saved_configuration[name] = (logger.handlers[:], logger.level, logger.propagate)
+        logger.handlers = [queue_handler]
+        logger.propagate = False
+        logger.setLevel(level)
+        
+    _async_listener = logging.handlers.QueueListener(records, buffered)
+    _async_listener.start()
+    return _async_listener
 
-# Configure fantasy world logger
-fantasy_world_logger = logging.getLogger('fantasy_world')
-fantasy_world_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+def disable_async_logging():
+    """Drains the queue, flushes all buffered records and restores the previous logger configuration."""
+    global _async_listener
+    if _async_listener is None:
+        return
+    _async_listener.stop()
+    for handler in _async_listener.handlers:
+        target = getattr(handler, "target", None)
+        handler.close()
+        if target is not None:
+            target.close()
+    _async_listener = None
+    for name, (handlers, level, propagate) in _saved_configuration.items():
+        logger = logging.getLogger(name)
+        logger.handlers = handlers
+        logger.setLevel(level)
+        logger.propagate = propagate
+    _saved_configuration.clear()
 
-# Configure fantasy events logger
-fantasy_events_logger = logging.getLogger('fantasy_events')
-fantasy_events_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+# Global logger instances; all project loggers get the default level, so
+# isEnabledFor guards work before logging is configured
+for _name in PROJECT_LOGGERS:
+    logging.getLogger(_name).setLevel(DEFAULT_LEVEL)
 
-# Configure main logger
-main_logger = logging.getLogger('main')
-main_logger.setLevel(logging.WARNING)  # Change to WARNING to reduce output
+event_logger = logging.getLogger('events')
+world_logger = logging.getLogger('world')
 
-# Configure root logger
-logging.basicConfig(
-    level=logging.WARNING,  # Change to WARNING to reduce output
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-) 
\ No newline at end of file
+dynasty_logger = logging.getLogger('dynasty')
+marriage_logger = logging.getLogger('marriage')
+person_logger = logging.getLogger('person')
+simulation_logger = logging.getLogger('simulation')
+event_processor_logger = logging.getLogger('event_processor')
+fantasy_world_logger = logging.getLogger('fantasy_world')
+fantasy_events_logger = logging.getLogger('fantasy_events')
+main_logger = logging.getLogger('main')
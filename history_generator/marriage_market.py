@@ -1,6 +1,7 @@
+import logging
 import random
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional
 from .person import Person
 from .config.settings import MARRIAGE
 from .logger_config import world_logger
@@ -12,29 +13,111 @@ class MarriageCandidate:
     
     Attributes:
         person: The person who is available for marriage
-        remaining_years: Number of years the person will remain in the marriage market
+        expiry_year: Last year in which the person remains in the marriage market
     """
     person: Person
-    remaining_years: int
+    expiry_year: int
+    
+    def remaining_years(self, year: int) -> int:
+        """Returns the number of years the person remains in the market after the given year."""
+        return self.expiry_year - year
+
+class _Bucket:
+    """Indexable set of person IDs with O(1) insertion and removal."""
+    
+    __slots__ = ("ids", "positions")
+    
+    def __init__(self):
+        self.ids: List[int] = []
+        self.positions: Dict[int, int] = {}
+        
+    def add(self, person_id: int) -> None:
+        self.positions[person_id] = len(self.ids)
+        self.ids.append(person_id)
+        
+    def discard(self, person_id: int) -> None:
+        position = self.positions.pop(person_id, None)
+        if position is None:
+            return
+        # Swap the last ID into the freed slot
+        last = self.ids.pop()
+        if last != person_id:
+            self.ids[position] = last
+            self.positions[last] = position
 
 class MarriageMarket:
     """
     Manages the marriage market where eligible persons can find partners.
+    
+    Candidates are indexed per gender in birth-year buckets, so a partner
+    search only looks at the buckets inside the allowed age window. Married,
+    deceased and expired candidates are dropped lazily when they are drawn
+    or when their expiry year has passed.
     """
     
-    def __init__(self, person_manager):
+    def __init__(self, person_manager, rng=None):
         """
         Initializes a new marriage market.
         
         Args:
             person_manager: The PersonManager instance to use
+            rng: Random stream of the market (the random module if None)
         """
-        self.candidates = []
         self.person_manager = person_manager
+        self.rng = rng if rng is not None else random
         self.new_candidate_chance = 0.1
         self.factions = ["Noble Houses", "Commoners", "Merchants"]
         self.regions = ["Central Valley", "Northern Plains", "Southern Forests"]
         self.max_age_difference = 10
+        self._candidates: Dict[int, MarriageCandidate] = {}
+        # gender -> birth year -> bucket of candidate IDs
+        self._buckets: Dict[str, Dict[int, _Bucket]] = {"male": {}, "female": {}}
+        # expiry year -> candidate IDs expiring after that year
+        self._expiries: Dict[int, List[int]] = {}
+        # Number of candidates drawn by partner searches, read by instrumentation
+        self.scanned = 0
+        
+    @property
+    def candidates(self) -> List[MarriageCandidate]:
+        """All candidates currently in the market."""
+        return list(self._candidates.values())
+        
+    def __len__(self) -> int:
+        return len(self._candidates)
+        
+    def add(self, person: Person, year: int, remaining_years: int = 5) -> None:
+        """
+        Adds a person to the marriage market.
+        
+        Args:
+            person: The person to add
+            year: The current year
+            remaining_years: Number of years the person stays in the market
+        """
+        if person.id in self._candidates:
+            self._remove_id(person.id)
+        expiry_year = year + remaining_years
+        self._candidates[person.id] = MarriageCandidate(person, expiry_year)
+        self._buckets[person.gender].setdefault(person.birth_year, _Bucket()).add(person.id)
+        self._expiries.setdefault(expiry_year, []).append(person.id)
+        
+    def _remove_id(self, person_id: int) -> Optional[MarriageCandidate]:
+        candidate = self._candidates.pop(person_id, None)
+        if candidate is None:
+            return None
+        person = candidate.person
+        buckets = self._buckets[person.gender]
+        bucket = buckets[person.birth_year]
+        bucket.discard(person_id)
+        if not bucket.ids:
+            del buckets[person.birth_year]
+        return candidate
+        
+    def _is_available(self, candidate: MarriageCandidate, year: Optional[int]) -> bool:
+        person = candidate.person
+        return (person.population.partner_count[person.id] == 0 and
+                not person.is_dead() and
+                (year is None or year <= candidate.expiry_year))
 
     def update(self, year: int) -> None:
         """
@@ -43,48 +126,64 @@ class MarriageMarket:
         Args:
             year: The current year
         """
-        # Decrease remaining years and remove unavailable candidates
-        self.candidates = [c for c in self.candidates 
-                         if c.remaining_years > 0 and 
-                         not c.person.is_dead(year) and 
-                         len(c.person.partners) == 0]
-        
-        for c in self.candidates:
-            c.remaining_years -= 1
+        # Drop candidates whose time in the market has run out
+        for expiry_year in [y for y in self._expiries if y < year]:
+            for person_id in self._expiries.pop(expiry_year):
+                candidate = self._candidates.get(person_id)
+                if candidate is not None and candidate.expiry_year == expiry_year:
+                    self._remove_id(person_id)
             
         # Add new random candidates
-        if random.random() < self.new_candidate_chance:
-            gender = random.choice(["male", "female"])
+        if self.rng.random() < self.new_candidate_chance:
+            gender = self.rng.choice(["male", "female"])
             person = Person(
-                name=Person.generate_random_name(gender),
+                name=Person.generate_random_name(gender, self.rng),
                 gender=gender,
-                birth_year=year - random.randint(16, 30),
-                faction=random.choice(self.factions),
-                region=random.choice(self.regions)
+                birth_year=year - self.rng.randint(16, 30),
+                faction=self.rng.choice(self.factions),
+                region=self.rng.choice(self.regions),
+                population=self.person_manager.population
             )
-            self.candidates.append(MarriageCandidate(person, remaining_years=5))
-            world_logger.debug(f"Added new marriage candidate: {person.name}")
+            self.add(person, year)
+            if world_logger.isEnabledFor(logging.DEBUG):
+                world_logger.debug("Added new marriage candidate: %s", person.name)
 
-    def find_partner(self, person: Person) -> Optional[Person]:
+    def find_partner(self, person: Person, year: Optional[int] = None) -> Optional[Person]:
         """
         Finds a suitable partner for a person.
         
+        The partner is drawn uniformly from all available candidates of the
+        other gender whose birth year lies within max_age_difference.
+        
         Args:
             person: The person seeking a partner
+            year: The current year, used to skip expired candidates
             
         Returns:
             A suitable partner or None if none found
         """
-        suitable_candidates = [
-            c for c in self.candidates
-            if (c.person.gender != person.gender and  # Different gender
-                len(c.person.partners) == 0 and  # Not married
-                abs(c.person.age - person.age) <= self.max_age_difference)  # Age difference within limit
-        ]
+        buckets = self._buckets["female" if person.gender == "male" else "male"]
+        if not buckets:
+            return None
+        window = [buckets[birth_year]
+                  for birth_year in range(person.birth_year - self.max_age_difference,
+                                          person.birth_year + self.max_age_difference + 1)
+                  if birth_year in buckets]
+        total = sum(len(bucket.ids) for bucket in window)
         
-        if suitable_candidates:
-            chosen = random.choice(suitable_candidates)
-            return chosen.person
+        while total > 0:
+            index = self.rng.randrange(total)
+            for bucket in window:
+                if index < len(bucket.ids):
+                    break
+                index -= len(bucket.ids)
+            candidate = self._candidates[bucket.ids[index]]
+            self.scanned += 1
+            if self._is_available(candidate, year):
+                return candidate.person
+            # Married, deceased or expired: drop it and draw again
+            self._remove_id(candidate.person.id)
+            total -= 1
         return None
 
     def remove(self, person: Person) -> None:
@@ -94,5 +193,6 @@ class MarriageMarket:
         Args:
             person: The person to remove
         """
-        self.candidates = [c for c in self.candidates if c.person != person]
-        world_logger.debug(f"Removed {person.name} from marriage market")
+        self._remove_id(person.id)
+        if world_logger.isEnabledFor(logging.DEBUG):
+            world_logger.debug("Removed %s from marriage market", person.name)
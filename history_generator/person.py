@@ -1,14 +1,18 @@
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, Tuple
+import logging
 import random
 from .logger_config import world_logger
 from .config.names import MALE_NAMES, FEMALE_NAMES
-from .config.settings import PERSON, CHILDBIRTH
+from .config.settings import CHILDBIRTH
+from .population import Population, GENDERS, NO_YEAR
 
 class Person:
     """
     Represents a person in the simulation.
     
+    A Person is a thin view over one row of a Population store; all
+    attributes are read from and written to the store's columns.
+    
     Attributes:
         id: Unique ID of the person
         name: Name of the person
@@ -18,29 +22,35 @@ class Person:
         faction: Faction the person belongs to
         region: Region where the person lives
         health: Health status (0-100)
-        partners: List of partners (current and previous)
-        children: List of children
+        partners: Tuple of partners (current and previous)
+        children: Tuple of children
+        parents: Tuple of parents
     """
     
     @classmethod
-    def generate_random_name(cls, gender: str) -> str:
+    def generate_random_name(cls, gender: str, rng=None) -> str:
         """
         Generates a random name based on gender.
         
         Args:
             gender: Gender of the person ('male' or 'female')
+            rng: Random stream to draw from (the random module if None)
             
         Returns:
             A randomly selected name
         """
+        rng = rng if rng is not None else random
         if gender.lower() == 'male':
-            return random.choice(MALE_NAMES)
+            return rng.choice(MALE_NAMES)
         elif gender.lower() == 'female':
-            return random.choice(FEMALE_NAMES)
+            return rng.choice(FEMALE_NAMES)
         else:
             raise ValueError(f"Invalid gender: {gender}")
     
-    def __init__(self, name: str, gender: str, birth_year: int, faction: str, region: str):
+    __slots__ = ("_population", "_row")
+
+    def __init__(self, name: str, gender: str, birth_year: int, faction: str, region: str,
+                 population: Optional[Population] = None):
         """
         Initializes a new person.
         
@@ -50,18 +60,112 @@ class Person:
             birth_year: Year of birth
             faction: Faction the person belongs to
             region: Region where the person lives
+            population: Population store to add the person to (default store if None)
         """
-        self.id = id(self)  # Unique ID based on object ID
-        self.name = name
-        self.gender = gender
-        self.birth_year = birth_year
-        self.death_year = None
-        self.faction = faction
-        self.region = region
-        self.health = PERSON["initial_health"]
-        self.partners = []
-        self.children = []
-        world_logger.debug(f"Created new person: {name}")
+        self._population = population if population is not None else Population.default()
+        self._row = self._population.add(name, gender, birth_year, faction, region)
+        if world_logger.isEnabledFor(logging.DEBUG):
+            world_logger.debug("Created new person: %s", name)
+
+    @classmethod
+    def view(cls, population: Population, row: int) -> 'Person':
+        """
+        Creates a view on an existing row without adding a new person.
+        
+        Args:
+            population: The population store
+            row: The row (person ID)
+            
+        Returns:
+            A Person bound to the given row
+        """
+        person = cls.__new__(cls)
+        person._population = population
+        person._row = row
+        return person
+
+    @property
+    def population(self) -> Population:
+        """The population store this person belongs to."""
+        return self._population
+
+    @property
+    def id(self) -> int:
+        """Stable ID of the person within its population."""
+        return self._row
+
+    @property
+    def name(self) -> str:
+        return self._population.names[self._row]
+
+    @property
+    def gender(self) -> str:
+        return GENDERS[self._population.gender[self._row]]
+
+    @property
+    def birth_year(self) -> int:
+        return int(self._population.birth_year[self._row])
+
+    @property
+    def death_year(self) -> Optional[int]:
+        death_year = self._population.death_year[self._row]
+        return None if death_year == NO_YEAR else int(death_year)
+
+    @death_year.setter
+    def death_year(self, value: Optional[int]) -> None:
+        self._population.death_year[self._row] = NO_YEAR if value is None else value
+        if value is not None:
+            self._population.death_log.append(self._row)
+
+    @property
+    def faction(self) -> str:
+        return self._population.factions.names[self._population.faction[self._row]]
+
+    @property
+    def region(self) -> str:
+        return self._population.regions.names[self._population.region[self._row]]
+
+    @property
+    def health(self) -> int:
+        return int(self._population.health[self._row])
+
+    @health.setter
+    def health(self, value: int) -> None:
+        self._population.health[self._row] = value
+        if value <= 0:
+            self._population.death_log.append(self._row)
+
+    @property
+    def was_king(self) -> bool:
+        return bool(self._population.was_king[self._row])
+
+    @was_king.setter
+    def was_king(self, value: bool) -> None:
+        self._population.was_king[self._row] = value
+
+    @property
+    def partners(self) -> Tuple['Person', ...]:
+        """Partners (current and previous) in order of marriage."""
+        return tuple(Person.view(self._population, row) for row in self._population.relatives("partners", self._row))
+
+    @property
+    def children(self) -> Tuple['Person', ...]:
+        """Children in order of birth."""
+        return tuple(Person.view(self._population, row) for row in self._population.relatives("children", self._row))
+        
+    @property
+    def parents(self) -> Tuple['Person', ...]:
+        """Mother and father, if known."""
+        return tuple(Person.view(self._population, row) for row in self._population.relatives("parents", self._row))
+
+    def add_child(self, child: 'Person') -> None:
+        """
+        Registers a child of this person.
+        
+        Args:
+            child: The child to add
+        """
+        self._population.add_child(self._row, child._row)
         
     @property
     def age(self) -> int:
@@ -74,26 +178,17 @@ class Person:
         """
         Checks if the person is deceased.
         
+        Deaths are decided once per year by Population.apply_mortality;
+        this method only looks up the result and never changes state.
+        
         Args:
-            current_year: Optional year for calculation
+            current_year: Optional year for calculation (kept for compatibility)
             
         Returns:
             True if the person is deceased, False otherwise
         """
-        if self.death_year is not None:
-            return True
-            
-        if current_year is None:
-            return False  # If no year is provided, assume person is alive
-            
-        age = current_year - self.birth_year
-        
-        # Only set death_year if the person actually dies
-        if self.health <= 0 or age > PERSON["max_base_age"] + random.randint(0, PERSON["max_age_bonus"]):
-            self.death_year = current_year
-            return True
-            
-        return False
+        population = self._population
+        return population.death_year[self._row] != NO_YEAR or population.health[self._row] <= 0
         
     def marry(self, partner: 'Person') -> None:
         """
@@ -103,10 +198,9 @@ class Person:
             partner: The person to marry
         """
         if partner not in self.partners:
-            self.partners.append(partner)
-            if self not in partner.partners:
-                partner.partners.append(self)
-            world_logger.info(f"{self.name} married {partner.name}")
+            self._population.add_partners(self._row, partner._row)
+            if world_logger.isEnabledFor(logging.INFO):
+                world_logger.info("%s married %s", self.name, partner.name)
             
     def can_have_child(self, current_year: int) -> bool:
         """
@@ -125,6 +219,17 @@ class Person:
                 CHILDBIRTH["min_age"] < age < CHILDBIRTH["max_age"] and 
                 not self.is_dead(current_year))
                 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Person):
+            return NotImplemented
+        return self._row == other._row and self._population is other._population
+
+    def __hash__(self) -> int:
+        return hash((id(self._population), self._row))
+
+    def __repr__(self) -> str:
+        return f"Person(id={self._row}, name={self.name!r})"
+
     def __str__(self) -> str:
         """Returns a string representation of the person."""
         return f"{self.name} ({self.gender}, {self.age} years old)"
\ No newline at end of file
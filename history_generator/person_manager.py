@@ -1,5 +1,7 @@
-from typing import List, Optional
+import logging
+from typing import Dict, Iterable, List, Optional, Set
 from .person import Person
+from .population import Population
 from .logger_config import world_logger
 
 class PersonManager:
@@ -11,23 +13,68 @@ class PersonManager:
     - Tracking all active persons
     - Removing deceased persons
     - Providing persons to other systems
+    
+    Persons are kept in a dict keyed by their stable ID. Secondary indexes
+    (faction, region, birth year, living) are updated incrementally, so
+    lookups are constant time and queries are proportional to their output.
+    Deaths are picked up from the population's death log.
     """
     
-    def __init__(self):
-        """Initializes a new PersonManager."""
-        self._persons: List[Person] = []
+    def __init__(self, population: Optional[Population] = None):
+        """
+        Initializes a new PersonManager.
+        
+        Args:
+            population: The population store to manage (default store if None)
+        """
+        self.population = population if population is not None else Population.default()
+        self._persons: Dict[int, Person] = {}
+        self._by_faction: Dict[int, Set[int]] = {}
+        self._by_region: Dict[int, Set[int]] = {}
+        self._by_birth_year: Dict[int, Set[int]] = {}
+        self._living: Set[int] = set()
+        self._dead: Set[int] = set()
+        self._death_log_position = len(self.population.death_log)
         world_logger.info("PersonManager initialized")
         
+    def _sync_deaths(self) -> None:
+        """Moves persons that died since the last call from the living to the dead index."""
+        death_log = self.population.death_log
+        for person_id in death_log[self._death_log_position:]:
+            person = self._persons.get(person_id)
+            if person_id in self._living and person.is_dead():
+                self._living.discard(person_id)
+                self._dead.add(person_id)
+        self._death_log_position = len(death_log)
+        
+    def _resolve(self, ids: Iterable[int]) -> List[Person]:
+        return [self._persons[person_id] for person_id in ids]
+        
     def add_person(self, person: Person) -> None:
         """
         Adds a new person to the management.
         
         Args:
             person: The person to add
-        """
-        if person not in self._persons:
-            self._persons.append(person)
-            world_logger.debug(f"Added person {person.name} to management")
+            
+        Raises:
+            ValueError: If the person belongs to a different population
+        """
+        if person.population is not self.population:
+            raise ValueError(f"Person {person.name} belongs to a different population")
+        person_id = person.id
+        if person_id in self._persons:
+            return
+        self._persons[person_id] = person
+        self._by_faction.setdefault(int(self.population.faction[person_id]), set()).add(person_id)
+        self._by_region.setdefault(int(self.population.region[person_id]), set()).add(person_id)
+        self._by_birth_year.setdefault(person.birth_year, set()).add(person_id)
+        if person.is_dead():
+            self._dead.add(person_id)
+        else:
+            self._living.add(person_id)
+        if world_logger.isEnabledFor(logging.DEBUG):
+            world_logger.debug("Added person %s to management", person.name)
             
     def remove_person(self, person: Person) -> None:
         """
@@ -36,9 +83,18 @@ class PersonManager:
         Args:
             person: The person to remove
         """
-        if person in self._persons:
-            self._persons.remove(person)
-            world_logger.debug(f"Removed person {person.name} from management")
+        if person.population is not self.population:
+            return
+        person_id = person.id
+        if self._persons.pop(person_id, None) is None:
+            return
+        self._by_faction[int(self.population.faction[person_id])].discard(person_id)
+        self._by_region[int(self.population.region[person_id])].discard(person_id)
+        self._by_birth_year[person.birth_year].discard(person_id)
+        self._living.discard(person_id)
+        self._dead.discard(person_id)
+        if world_logger.isEnabledFor(logging.DEBUG):
+            world_logger.debug("Removed person %s from management", person.name)
             
     def get_person_by_id(self, person_id: int) -> Optional[Person]:
         """
@@ -50,10 +106,7 @@ class PersonManager:
         Returns:
             The found person or None if no person with the ID exists
         """
-        for person in self._persons:
-            if person.id == person_id:
-                return person
-        return None
+        return self._persons.get(person_id)
         
     def get_all_persons(self) -> List[Person]:
         """
@@ -62,7 +115,7 @@ class PersonManager:
         Returns:
             List of all active persons
         """
-        return self._persons.copy()  # Return a copy to prevent external modifications
+        return list(self._persons.values())
         
     def get_living_persons(self) -> List[Person]:
         """
@@ -71,7 +124,8 @@ class PersonManager:
         Returns:
             List of all living persons
         """
-        return [person for person in self._persons if not person.is_dead()]
+        self._sync_deaths()
+        return self._resolve(self._living)
         
     def cleanup_dead_persons(self, current_year: int) -> None:
         """
@@ -80,10 +134,12 @@ class PersonManager:
         Args:
             current_year: The current year of the simulation
         """
-        dead_persons = [person for person in self._persons if person.is_dead(current_year)]
-        for person in dead_persons:
+        self._sync_deaths()
+        log_removals = world_logger.isEnabledFor(logging.INFO)
+        for person in self._resolve(list(self._dead)):
             self.remove_person(person)
-            world_logger.info(f"Removed deceased person {person.name} from management")
+            if log_removals:
+                world_logger.info("Removed deceased person %s from management", person.name)
             
     def get_persons_by_faction(self, faction_name: str) -> List[Person]:
         """
@@ -95,7 +151,8 @@ class PersonManager:
         Returns:
             List of all persons in the faction
         """
-        return [person for person in self._persons if person.faction == faction_name]
+        code = self.population.factions.find(faction_name)
+        return self._resolve(self._by_faction.get(code, ()))
         
     def get_persons_by_region(self, region_name: str) -> List[Person]:
         """
@@ -107,4 +164,21 @@ class PersonManager:
         Returns:
             List of all persons in the region
         """
-        return [person for person in self._persons if person.region == region_name] 
\ No newline at end of file
+        code = self.population.regions.find(region_name)
+        return self._resolve(self._by_region.get(code, ()))
+
+    def get_persons_born_between(self, first_year: int, last_year: int) -> List[Person]:
+        """
+        Returns all persons born within a range of years.
+        
+        Args:
+            first_year: First birth year (inclusive)
+            last_year: Last birth year (inclusive)
+            
+        Returns:
+            List of all persons born in the range
+        """
+        persons = []
+        for year in range(first_year, last_year + 1):
+            persons.extend(self._resolve(self._by_birth_year.get(year, ())))
+        return persons
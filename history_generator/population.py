@@ -0,0 +1,394 @@
+import sys
+from typing import Dict, List, Optional
+import numpy as np
+from .config.settings import PERSON
+
+# Gender codes used in the gender column
+MALE = 0
+FEMALE = 1
+GENDERS = ("male", "female")
+
+# Sentinel stored in the death_year column for living persons
+NO_YEAR = np.iinfo(np.int32).min
+
+# Relations between rows, each kept as an adjacency
+RELATIONS = ("partners", "children", "parents")
+
+_INITIAL_CAPACITY = 64
+
+
+class StringTable:
+    """
+    Maps repeated strings (factions, regions) to small integer codes.
+
+    Attributes:
+        names: List of interned strings, indexed by their code
+    """
+
+    def __init__(self):
+        """Initializes an empty string table."""
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, name: str) -> int:
+        """
+        Returns the code of a string, registering it if necessary.
+
+        Args:
+            name: The string to look up
+
+        Returns:
+            The integer code of the string
+        """
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self.names)
+            name = sys.intern(name)
+            self.names.append(name)
+            self._codes[name] = code
+        return code
+
+    def find(self, name: str) -> Optional[int]:
+        """
+        Returns the code of a string without registering it.
+
+        Args:
+            name: The string to look up
+
+        Returns:
+            The integer code or None if the string is unknown
+        """
+        return self._codes.get(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class Adjacency:
+    """
+    Append-only CSR adjacency between rows of the population.
+
+    Edges are stored in compressed sparse row form (indptr/indices). New
+    edges go to a small pending buffer first and are merged into the CSR
+    arrays once the buffer grows large, so adding an edge stays cheap while
+    reads remain contiguous slices for the bulk of the graph.
+    """
+
+    def __init__(self):
+        """Initializes an empty adjacency."""
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self._pending: Dict[int, List[int]] = {}
+        self._pending_count = 0
+
+    def add(self, row: int, target: int) -> None:
+        """
+        Adds a directed edge from row to target.
+
+        Args:
+            row: Source row
+            target: Target row
+        """
+        self._pending.setdefault(row, []).append(target)
+        self._pending_count += 1
+        if self._pending_count > max(1024, len(self.indices) // 4):
+            self.compact()
+
+    def neighbors(self, row: int) -> List[int]:
+        """
+        Returns all targets of a row in insertion order.
+
+        Args:
+            row: Source row
+
+        Returns:
+            List of target rows
+        """
+        if row + 1 < len(self.indptr):
+            result = self.indices[self.indptr[row]:self.indptr[row + 1]].tolist()
+        else:
+            result = []
+        pending = self._pending.get(row)
+        if pending:
+            result.extend(pending)
+        return result
+
+    def compact(self) -> None:
+        """Merges the pending edge buffer into the CSR arrays."""
+        if not self._pending:
+            return
+        n_rows = max(len(self.indptr) - 1, max(self._pending) + 1)
+        old_sources = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int32), np.diff(self.indptr))
+        new_sources = np.fromiter(
+            (row for row, targets in self._pending.items() for _ in targets),
+            dtype=np.int32, count=self._pending_count)
+        new_targets = np.fromiter(
+            (target for targets in self._pending.values() for target in targets),
+            dtype=np.int32, count=self._pending_count)
+        sources = np.concatenate([old_sources, new_sources])
+        targets = np.concatenate([self.indices, new_targets])
+        # Stable sort keeps existing edges before pending ones for each row
+        order = np.argsort(sources, kind="stable")
+        self.indices = targets[order]
+        self.indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_rows), out=self.indptr[1:])
+        self._pending = {}
+        self._pending_count = 0
+
+    def drop(self, rows: np.ndarray) -> None:
+        """
+        Removes all edges leaving the given rows.
+
+        Args:
+            rows: Source rows whose edges are removed
+        """
+        self.compact()
+        n_rows = len(self.indptr) - 1
+        rows = rows[rows < n_rows]
+        if len(rows) == 0:
+            return
+        counts = np.diff(self.indptr)
+        keep = np.ones(n_rows, dtype=bool)
+        keep[rows] = False
+        self.indices = self.indices[np.repeat(keep, counts)]
+        counts[rows] = 0
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        self.indptr = indptr
+
+    def __len__(self) -> int:
+        return len(self.indices) + self._pending_count
+
+
+class Population:
+    """
+    Column-oriented store for all persons of a simulation.
+
+    Every person is a row; the row index is the stable person ID. Scalar
+    attributes are kept in NumPy columns so that systems can filter and
+    update the whole population at once, while partners, children and
+    parents are kept as CSR adjacencies. Person objects are thin views over
+    a row. With a genealogy store attached, the relations of dead persons
+    can be evicted to disk and are then read from the store.
+
+    Attributes:
+        birth_year: Year of birth per row
+        death_year: Year of death per row (NO_YEAR while alive)
+        gender: Gender code per row (MALE or FEMALE)
+        faction: Faction code per row
+        region: Region code per row
+        health: Health per row (0-100)
+        was_king: Whether the person has ever reigned
+        partner_count: Number of partners per row
+        names: Name per row
+        factions: String table for faction codes
+        regions: String table for region codes
+        partners: Partner adjacency (symmetric)
+        children: Child adjacency (parent -> child)
+        parents: Parent adjacency (child -> parent)
+        death_log: IDs in the order they were found dead, for incremental indexes
+        genealogy: GenealogyStore holding evicted persons (None if not attached)
+    """
+
+    _default: Optional["Population"] = None
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        """
+        Initializes an empty population.
+
+        Args:
+            capacity: Number of rows to preallocate
+        """
+        self._size = 0
+        self._capacity = max(1, capacity)
+        self.birth_year = np.zeros(self._capacity, dtype=np.int32)
+        self.death_year = np.full(self._capacity, NO_YEAR, dtype=np.int32)
+        self.gender = np.zeros(self._capacity, dtype=np.int8)
+        self.faction = np.zeros(self._capacity, dtype=np.int16)
+        self.region = np.zeros(self._capacity, dtype=np.int16)
+        self.health = np.zeros(self._capacity, dtype=np.int16)
+        self.was_king = np.zeros(self._capacity, dtype=bool)
+        self.partner_count = np.zeros(self._capacity, dtype=np.int16)
+        self.names: List[str] = []
+        self.factions = StringTable()
+        self.regions = StringTable()
+        self.partners = Adjacency()
+        self.children = Adjacency()
+        self.parents = Adjacency()
+        self.death_log: List[int] = []
+        self.genealogy = None
+
+    @classmethod
+    def default(cls) -> "Population":
+        """Returns the process-wide population used when none is given."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        """Doubles the capacity of all columns."""
+        self._capacity *= 2
+        for column in ("birth_year", "gender", "faction", "region", "health", "was_king", "partner_count"):
+            old = getattr(self, column)
+            new = np.zeros(self._capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, column, new)
+        death_year = np.full(self._capacity, NO_YEAR, dtype=np.int32)
+        death_year[:self._size] = self.death_year[:self._size]
+        self.death_year = death_year
+
+    def add(self, name: str, gender: str, birth_year: int, faction: str, region: str) -> int:
+        """
+        Appends a new person and returns their ID.
+
+        Args:
+            name: Name of the person
+            gender: Gender of the person ('male' or 'female')
+            birth_year: Year of birth
+            faction: Faction the person belongs to
+            region: Region where the person lives
+
+        Returns:
+            The ID (row) of the new person
+
+        Raises:
+            ValueError: If the gender is invalid
+        """
+        try:
+            gender_code = GENDERS.index(gender.lower())
+        except ValueError:
+            raise ValueError(f"Invalid gender: {gender}")
+        if self._size == self._capacity:
+            self._grow()
+        row = self._size
+        self.birth_year[row] = birth_year
+        self.gender[row] = gender_code
+        self.faction[row] = self.factions.code(faction)
+        self.region[row] = self.regions.code(region)
+        self.health[row] = PERSON["initial_health"]
+        self.names.append(sys.intern(name))
+        self._size += 1
+        return row
+
+    def add_partners(self, row: int, other: int) -> None:
+        """
+        Records a marriage between two rows in both directions.
+
+        Args:
+            row: First partner
+            other: Second partner
+        """
+        self.partners.add(row, other)
+        self.partners.add(other, row)
+        self.partner_count[row] += 1
+        self.partner_count[other] += 1
+
+    def add_child(self, parent: int, child: int) -> None:
+        """
+        Records a parent -> child edge and its reverse.
+
+        Args:
+            parent: The parent row
+            child: The child row
+        """
+        self.children.add(parent, child)
+        self.parents.add(child, parent)
+
+    def relatives(self, relation: str, row: int) -> List[int]:
+        """
+        Returns the partners, children or parents of a row.
+
+        Rows evicted to the genealogy store are read from there.
+
+        Args:
+            relation: One of RELATIONS
+            row: The row (person ID)
+
+        Returns:
+            List of related rows in insertion order
+        """
+        genealogy = self.genealogy
+        if genealogy is not None and row in genealogy:
+            return genealogy.relatives(relation, row)
+        return getattr(self, relation).neighbors(row)
+
+    def evict(self, rows: np.ndarray) -> None:
+        """
+        Moves the relations of dead persons into the genealogy store.
+
+        The rows are archived in the store and their edges are dropped from
+        the in-memory adjacencies; edges of living persons pointing to them
+        are kept. Only the adjacency lists leave memory: names, scalar
+        columns and death_log stay, because the row index is the person ID,
+        so memory still grows with everyone who ever lived.
+
+        Args:
+            rows: IDs of dead persons
+
+        Raises:
+            ValueError: If no genealogy store is attached
+        """
+        if self.genealogy is None:
+            raise ValueError("No genealogy store attached")
+        self.genealogy.archive(self, rows)
+        for relation in RELATIONS:
+            getattr(self, relation).drop(rows)
+
+    def view(self, column: str) -> np.ndarray:
+        """
+        Returns the filled part of a column.
+
+        Args:
+            column: Name of the column
+
+        Returns:
+            A view on the column restricted to existing rows
+        """
+        return getattr(self, column)[:self._size]
+
+    def living_mask(self) -> np.ndarray:
+        """Returns a boolean mask of all rows without a death year and with health left."""
+        return (self.view("death_year") == NO_YEAR) & (self.view("health") > 0)
+
+    def apply_mortality(self, year: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Decides deaths for all living persons in one batched pass.
+
+        A person dies if their health is used up or their age exceeds
+        max_base_age plus a random bonus drawn once per person and year.
+        Runs once per simulated year; afterwards Person.is_dead is a pure
+        lookup on the death_year column.
+
+        Args:
+            year: The current year
+            rng: Random generator for the age bonus draws
+
+        Returns:
+            IDs of the persons who died in this pass
+        """
+        alive = np.flatnonzero(self.view("death_year") == NO_YEAR)
+        if len(alive) == 0:
+            return alive
+        age = year - self.birth_year[alive]
+        bonus = rng.integers(0, PERSON["max_age_bonus"], size=len(alive), endpoint=True)
+        dies = (self.health[alive] <= 0) | (age > PERSON["max_base_age"] + bonus)
+        died = alive[dies]
+        self.death_year[died] = year
+        self.death_log.extend(died.tolist())
+        return died
+
+    def person(self, row: int):
+        """
+        Returns a Person view for a row.
+
+        Args:
+            row: The row (person ID)
+
+        Returns:
+            A Person bound to this population
+        """
+        from .person import Person
+        return Person.view(self, row)
@@ -0,0 +1,83 @@
+import hashlib
+import random
+from typing import Dict, Optional
+import numpy as np
+
+class RandomStream(random.Random):
+    """
+    Independent random stream of one subsystem.
+    
+    Scalar draws use the random.Random interface (random, choice, randint,
+    randrange, ...); batched draws use the NumPy Generator in `generator`.
+    Both are seeded from the stream's own SeedSequence.
+    """
+    
+    def __init__(self, seed_sequence: Optional[np.random.SeedSequence] = None):
+        """
+        Initializes a stream.
+        
+        Args:
+            seed_sequence: Seed material of the stream (fresh OS entropy if None)
+        """
+        if seed_sequence is None:
+            seed_sequence = np.random.SeedSequence()
+        self.seed_sequence = seed_sequence
+        scalar_seed, batch_seed = seed_sequence.spawn(2)
+        super().__init__(int.from_bytes(scalar_seed.generate_state(4, dtype=np.uint64).tobytes(), "little"))
+        self.generator = np.random.Generator(np.random.PCG64(batch_seed))
+
+# 32-bit words of a SHA-256 digest per name part; 128 bits keep distinct names apart
+_KEY_WORDS = 4
+
+def _stream_key(name: str) -> tuple:
+    """Turns a stream name into a stable spawn key."""
+    key = []
+    for part in name.split("/"):
+        digest = hashlib.sha256(part.encode("utf-8")).digest()
+        key.extend(int.from_bytes(digest[4 * index:4 * index + 4], "little") for index in range(_KEY_WORDS))
+    return tuple(key)
+
+class RandomStreams:
+    """
+    Seeded RNG context of a simulation.
+    
+    Every subsystem draws from its own named stream ("marriage_market",
+    "events", "dynasty/House Nerdival", ...). A stream is derived from the
+    root seed and its name only, so it is the same no matter in which order
+    streams are created or in which process they are used.
+    
+    Attributes:
+        seed: The root seed
+    """
+    
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initializes the RNG context.
+        
+        Args:
+            seed: Root seed (fresh OS entropy if None)
+        """
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+        self._streams: Dict[str, RandomStream] = {}
+        
+    def stream(self, name: str) -> RandomStream:
+        """
+        Returns the stream with the given name, creating it on first use.
+        
+        Args:
+            name: Name of the stream, "/" separates levels
+            
+        Returns:
+            The random stream
+        """
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = RandomStream(np.random.SeedSequence(self.seed, spawn_key=_stream_key(name)))
+            self._streams[name] = stream
+        return stream
+        
+    def streams(self) -> Dict[str, RandomStream]:
+        """Returns all streams created so far by name."""
+        return dict(self._streams)
@@ -1,40 +1,97 @@
+from contextlib import nullcontext
+import numpy as np
 from .person import Person
+from .population import Population
 from .person_manager import PersonManager
 from .marriage_market import MarriageMarket
 from .dynasty import Dynasty
-from .fantasy_events import FantasyEventGenerator, FantasyWorld
-import random
+from .rng import RandomStreams
+from .fast_forward import fast_forward
+from .genealogy import GenealogyStore
+from .logger_config import configure_logging
+
+# The fantasy world (event catalogue, compiler, stat store), event sinks,
+# checkpoints and instrumentation are imported where they are first used,
+# so that short runs and command-line help start quickly
+
+# Shared no-op phase used while instrumentation is disabled
+_NO_PHASE = nullcontext()
+
+# Number of new deaths that triggers an eviction into the genealogy store
+EVICTION_BATCH = 1024
 
 class Simulation:
-    def __init__(self, start_year=1000, duration=50):
+    def __init__(self, start_year=1000, duration=50, seed=None, fantasy_events=True):
+        """
+        Initializes a simulation.
+        
+        Args:
+            start_year: First simulated year
+            duration: Number of years to simulate
+            seed: Root seed of all random streams (fresh OS entropy if None)
+            fantasy_events: Whether the fantasy world produces events; if
+                False, the event catalogue is never loaded
+        """
+        configure_logging()
         self.year = start_year
         self.end_year = start_year + duration
         self.dynasties = []
-        self.person_manager = PersonManager()
-        self.marriage_market = MarriageMarket(self.person_manager)
-        self.fantasy_world = FantasyWorld()
-        self.fantasy_generator = FantasyEventGenerator(self.fantasy_world)
+        # Every subsystem draws from its own stream derived from the seed
+        self.random = RandomStreams(seed)
+        self.seed = self.random.seed
+        self.rng = self.random.stream("mortality").generator
+        self.population = Population()
+        self.person_manager = PersonManager(self.population)
+        self.marriage_market = MarriageMarket(self.person_manager, self.random.stream("marriage_market"))
+        # Built on first use; the world's events come from their own stream, so this does not change results
+        self.fantasy_events = fantasy_events
+        self._fantasy_world = None
+        self._fantasy_generator = None
+        # Opt-in per-phase metrics (disabled if None)
+        self.instrumentation = None
+        # Opt-in on-disk genealogy for the dead (disabled if None)
+        self.genealogy = None
+        self.eviction_batch = EVICTION_BATCH
+        self._eviction_position = 0
+        
+    @property
+    def fantasy_world(self):
+        """The fantasy world, built on first access (None if fantasy events are disabled)."""
+        if self._fantasy_world is None and self.fantasy_events:
+            from .fantasy_events import FantasyEventGenerator
+            from .fantasy_world import FantasyWorld
+            self._fantasy_world = FantasyWorld(self.random.stream("events"))
+            self._fantasy_generator = FantasyEventGenerator(self._fantasy_world)
+        return self._fantasy_world
+        
+    @property
+    def fantasy_generator(self):
+        """The generator of fantasy events (None if fantasy events are disabled)."""
+        return self._fantasy_generator if self.fantasy_world is not None else None
 
     def create_dynasty(self, name: str):
+        rng = self.random.stream(f"dynasty/{name}")
         # random age for king & queen
-        king_age = random.randint(20, 40)
-        queen_age = random.randint(20, 40)
+        king_age = rng.randint(20, 40)
+        queen_age = rng.randint(20, 40)
         birth_year = self.year - king_age
 
         # Create king and queen with appropriate faction and region
         king = Person(
-            name=Person.generate_random_name("male"),
+            name=Person.generate_random_name("male", rng),
             gender="male",
             birth_year=birth_year,
             faction="Noble Houses",
-            region="Central Valley"
+            region="Central Valley",
+            population=self.population
         )
         queen = Person(
-            name=Person.generate_random_name("female"),
+            name=Person.generate_random_name("female", rng),
             gender="female",
             birth_year=birth_year,
             faction="Noble Houses",
-            region="Central Valley"
+            region="Central Valley",
+            population=self.population
         )
         
         # Add persons to manager
@@ -44,33 +101,190 @@ class Simulation:
         # Marry them
         king.marry(queen)
 
-        dynasty = Dynasty(name, king, queen)
-        print(f"{king.name} is married to {queen.name}")
+        dynasty = Dynasty(name, king, queen, rng)
         self.dynasties.append(dynasty)
+        return dynasty
+
+    def enable_instrumentation(self, track_allocations=False):
+        """
+        Starts recording per-phase metrics of every simulated year.
+
+        Args:
+            track_allocations: Whether to record allocated memory per phase
 
-    def simulate_year(self):
-        self.marriage_market.update(self.year)
+        Returns:
+            The Instrumentation that collects the metrics
+        """
+        from .instrumentation import Instrumentation
+        self.instrumentation = Instrumentation(track_allocations)
+        return self.instrumentation
+
+    def enable_genealogy(self, path, eviction_batch=EVICTION_BATCH):
+        """
+        Evicts the relations of dead persons into an on-disk genealogy store.
+        
+        Once enough deaths have accumulated, the partners, children and
+        parents of the dead are written to memory-mapped files and dropped
+        from memory. Person views, lineage queries and family trees read
+        them back from the store transparently. This is adjacency eviction
+        only: names and scalar columns of the dead stay in memory.
+        
+        Args:
+            path: Directory of the genealogy store
+            eviction_batch: Number of new deaths that triggers an eviction
+            
+        Returns:
+            The GenealogyStore
+        """
+        self.genealogy = GenealogyStore(path)
+        self.eviction_batch = eviction_batch
+        self.population.genealogy = self.genealogy
+        return self.genealogy
+        
+    def evict_dead(self, force=False):
+        """
+        Moves everyone who died since the last eviction into the genealogy store.
+        
+        Args:
+            force: Evict even if fewer deaths than the eviction batch accumulated
+            
+        Returns:
+            Number of persons evicted
+        """
+        death_log = self.population.death_log
+        pending = len(death_log) - self._eviction_position
+        if self.genealogy is None or pending == 0 or (not force and pending < self.eviction_batch):
+            return 0
+        rows = np.unique(np.array(death_log[self._eviction_position:], dtype=np.int64))
+        self.population.evict(rows)
+        self._eviction_position = len(death_log)
+        return len(rows)
+        
+    def _phase(self, name):
+        # Without instrumentation every phase is the same no-op context
+        if self.instrumentation is None:
+            return _NO_PHASE
+        return self.instrumentation.phase(name)
+
+    def simulate_year(self, event_types=None):
+        # Only events of the given classes are built (all if None)
+        instrumentation = self.instrumentation
+        world = self.fantasy_world
+        if instrumentation is not None:
+            instrumentation.begin_year(self.year)
+            instrumentation.count("persons_processed", sum(len(dynasty.family) for dynasty in self.dynasties))
+            counters = (self.marriage_market.scanned, *self._event_counters(world))
+
+        # Decide all deaths of the year in one batched pass
+        with self._phase("mortality"):
+            died = self.population.apply_mortality(self.year, self.rng)
+        with self._phase("marriage_market"):
+            self.marriage_market.update(self.year)
         
         # Collect and process all events
         all_events = []
         
         # Get dynasty events
-        for dynasty in self.dynasties:
-            events = dynasty.simulate_year(self.year, self.marriage_market)
-            all_events.extend(events)
+        with self._phase("dynasties"):
+            for dynasty in self.dynasties:
+                events = dynasty.simulate_year(self.year, self.marriage_market, event_types)
+                all_events.extend(events)
         
         # Get fantasy world events
-        fantasy_events = self.fantasy_generator.generate_events(self.year)
-        all_events.extend(fantasy_events)
+        if world is not None:
+            with self._phase("fantasy_events"):
+                fantasy_events = self._fantasy_generator.generate_events(self.year, event_types)
+                all_events.extend(fantasy_events)
         
         # Clean up dead persons
-        self.person_manager.cleanup_dead_persons(self.year)
+        with self._phase("cleanup"):
+            self.person_manager.cleanup_dead_persons(self.year)
+            evicted = self.evict_dead()
+
+        if instrumentation is not None:
+            scanned, evaluations, triggered = counters
+            evaluated_now, triggered_now = self._event_counters(world)
+            instrumentation.count("deaths", len(died))
+            instrumentation.count("evicted", evicted)
+            instrumentation.count("candidates_scanned", self.marriage_market.scanned - scanned)
+            instrumentation.count("events_evaluated", evaluated_now - evaluations)
+            instrumentation.count("events_triggered", triggered_now - triggered)
+            instrumentation.count("events_emitted", len(all_events))
+            instrumentation.gauge("population", len(self.population))
+            instrumentation.gauge("market_candidates", len(self.marriage_market))
+            instrumentation.gauge("delayed_queue_depth", len(world.delayed_events) if world is not None else 0)
         
         return all_events
+        
+    @staticmethod
+    def _event_counters(world):
+        # Evaluated and triggered events of the world's processor so far (zero without a world)
+        if world is None:
+            return 0, 0
+        processor = world.event_processor
+        return processor.evaluations, processor.triggered
+
+    def fast_forward(self, years, event_types=None):
+        """
+        Simulates several years in one aggregated step and advances the year.
+
+        Deaths, births and marriages are sampled for the whole step instead
+        of year by year, which is much faster for long runs that only need
+        dynasty-level outcomes. The results follow the same distributions
+        as simulate_year but not the same random path.
+
+        Args:
+            years: Number of years to simulate (capped at the end year)
+            event_types: Event classes to produce (all if None)
+
+        Returns:
+            The events of the step in year order
+        """
+        years = min(years, self.end_year - self.year)
+        if years <= 0:
+            return []
+        if self.instrumentation is not None:
+            self.instrumentation.begin_year(self.year)
+        with self._phase("fast_forward"):
+            events = fast_forward(self, years, event_types)
+            self.evict_dead()
+        return events
 
     def increment_year(self):
         self.year += 1
 
+    def iter_events(self, event_types=None):
+        """Simulates the remaining years and yields their events as they happen."""
+        while self.year < self.end_year:
+            yield from self.simulate_year(event_types)
+            self.increment_year()
+
+    def run(self, sinks):
+        """
+        Simulates the remaining years and streams the events into sinks.
+
+        Only events that at least one sink subscribed to are built, and no
+        more than one year of events is held in memory.
+
+        Args:
+            sinks: The event sinks to write to
+        """
+        from .event_sinks import EventPipeline
+        pipeline = EventPipeline(sinks)
+        pipeline.write_all(self.iter_events(pipeline.event_types))
+        pipeline.flush()
+
+    def checkpoint(self, path: str):
+        """Writes the complete simulation state, including all random streams, to a checkpoint file."""
+        from .checkpoint import save_checkpoint
+        save_checkpoint(self, path)
+
+    @classmethod
+    def resume(cls, path: str):
+        """Returns a simulation that continues exactly where the checkpoint at path was taken."""
+        from .checkpoint import load_checkpoint
+        return load_checkpoint(path, cls)
+
     def debug_print(self):
         # Set current year for family tree display
         for dynasty in self.dynasties:
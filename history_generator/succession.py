@@ -0,0 +1,126 @@
+import heapq
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from .person import Person
+
+class Family:
+    """
+    Members of a dynasty in the order they joined.
+    
+    Backed by a dict keyed by person ID, so adding, removing and membership
+    tests are O(1) while iteration keeps the joining order.
+    """
+    
+    def __init__(self, members=()):
+        """
+        Initializes the family.
+        
+        Args:
+            members: Initial members in order
+        """
+        self._members: Dict[int, Person] = {}
+        for person in members:
+            self.append(person)
+            
+    def append(self, person: Person) -> None:
+        """Adds a member at the end."""
+        self._members[person.id] = person
+        
+    def remove(self, person: Person) -> None:
+        """
+        Removes a member.
+        
+        Raises:
+            ValueError: If the person is not a member
+        """
+        if self._members.pop(person.id, None) is None:
+            raise ValueError(f"{person.name} is not a family member")
+            
+    def ids(self) -> List[int]:
+        """Returns the IDs of all members in order."""
+        return list(self._members)
+        
+    def __contains__(self, person) -> bool:
+        return isinstance(person, Person) and person.id in self._members
+        
+    def __iter__(self) -> Iterator[Person]:
+        return iter(self._members.values())
+        
+    def __len__(self) -> int:
+        return len(self._members)
+
+class HeirIndex:
+    """
+    Men of a dynasty who may still inherit the crown, oldest first.
+    
+    A binary heap ordered by birth year (ties in the order they were
+    added) with lazy deletion: removed persons are only dropped when they
+    reach the top, and the heap is rebuilt once most entries are stale.
+    Adding, removing and finding the heir are O(log n) amortized.
+    """
+    
+    def __init__(self):
+        """Initializes an empty index."""
+        self._heap: List[Tuple[int, int, int]] = []
+        self._members: Set[int] = set()
+        self._counter = 0
+        
+    def add(self, person_id: int, birth_year: int) -> None:
+        """
+        Adds a man eligible for the crown.
+        
+        Args:
+            person_id: ID of the person
+            birth_year: Year of birth of the person
+        """
+        if person_id in self._members:
+            return
+        self._members.add(person_id)
+        heapq.heappush(self._heap, (birth_year, self._counter, person_id))
+        self._counter += 1
+        
+    def discard(self, person_id: int) -> None:
+        """
+        Removes a person (after death or coronation) if indexed.
+        
+        Args:
+            person_id: ID of the person
+        """
+        if person_id in self._members:
+            self._members.discard(person_id)
+            if len(self._heap) > 2 * len(self._members) + 16:
+                self._heap = [entry for entry in self._heap if entry[2] in self._members]
+                heapq.heapify(self._heap)
+                
+    def peek(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns the oldest eligible man without removing him.
+        
+        Returns:
+            Tuple of ID and birth year, or None if nobody is eligible
+        """
+        heap = self._heap
+        while heap and heap[0][2] not in self._members:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return heap[0][2], heap[0][0]
+        
+    def pop(self) -> Optional[int]:
+        """
+        Removes and returns the oldest eligible man.
+        
+        Returns:
+            His ID, or None if nobody is eligible
+        """
+        top = self.peek()
+        if top is None:
+            return None
+        heapq.heappop(self._heap)
+        self._members.discard(top[0])
+        return top[0]
+        
+    def __contains__(self, person_id: int) -> bool:
+        return person_id in self._members
+        
+    def __len__(self) -> int:
+        return len(self._members)
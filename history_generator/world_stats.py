@@ -0,0 +1,477 @@
+from typing import Dict, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
+import numpy as np
+
+# Sections of the world state that hold entities with stats
+SECTIONS = ("regions", "factions")
+
+# Every stat is clamped to this range when an effect changes it
+STAT_MIN = 0
+STAT_MAX = 100
+
+# An entity is a region or faction, keyed by section and name
+Entity = Tuple[str, str]
+
+_MISSING = object()
+
+# Below this many changed stats, NumPy's per-call overhead outweighs the vectorized add
+VECTOR_THRESHOLD = 16
+
+def is_whole(value) -> bool:
+    """Returns whether a stat value or change can be kept in an integer matrix."""
+    if isinstance(value, (int, np.integer)):
+        return True
+    return isinstance(value, (float, np.floating)) and float(value).is_integer()
+
+class StatLayout:
+    """
+    Row and column indices of a world stat matrix.
+    
+    Layouts never change; adding an entity or stat creates a new layout
+    whose existing indices are unchanged, so compiled effects can be
+    checked for validity by identity.
+    
+    Attributes:
+        entities: (section, name) per row
+        stats: Stat name per column
+        entity_index: Row by (section, name)
+        stat_index: Column by stat name
+    """
+    
+    def __init__(self, entities: Sequence[Entity] = (), stats: Sequence[str] = ()):
+        """
+        Initializes a layout.
+        
+        Args:
+            entities: (section, name) per row
+            stats: Stat name per column
+        """
+        self.entities: List[Entity] = list(entities)
+        self.stats: List[str] = list(stats)
+        self.entity_index: Dict[Entity, int] = {entity: row for row, entity in enumerate(self.entities)}
+        self.stat_index: Dict[str, int] = {stat: column for column, stat in enumerate(self.stats)}
+        
+    @classmethod
+    def build(cls, sections: Mapping[str, Mapping[str, Mapping[str, float]]],
+              events: Optional[dict] = None) -> "StatLayout":
+        """
+        Builds the layout of initial stats and of every stat an event catalogue reads or changes.
+        
+        Args:
+            sections: Initial stats ({section: {name: {stat: value}}})
+            events: Event definitions ({"events": {category: {id: event}}})
+            
+        Returns:
+            The layout, with the initial entities and stats first
+        """
+        entities: Dict[Entity, None] = {}
+        stats: Dict[str, None] = {}
+        for section in SECTIONS:
+            for name, entity_stats in sections.get(section, {}).items():
+                entities[(section, name)] = None
+                stats.update(dict.fromkeys(entity_stats))
+        for category_events in (events or {}).get("events", {}).values():
+            for event_data in category_events.values():
+                for item in list(event_data.get("conditions", [])) + list(event_data.get("effects", [])):
+                    for section, key in (("regions", "region"), ("factions", "faction")):
+                        if item.get(key) and "stat" in item:
+                            entities[(section, item[key])] = None
+                            stats[item["stat"]] = None
+                            break
+        return cls(entities, stats)
+        
+    def extended(self, entity: Optional[Entity] = None, stat: Optional[str] = None) -> "StatLayout":
+        """Returns a layout with an additional entity and/or stat."""
+        entities = self.entities + ([entity] if entity is not None and entity not in self.entity_index else [])
+        stats = self.stats + ([stat] if stat is not None and stat not in self.stat_index else [])
+        return StatLayout(entities, stats)
+
+class StatEffects:
+    """
+    The stat changes of one event, compiled against a layout.
+    
+    Attributes:
+        layout: The layout the indices refer to
+        indices: Flat indices into the stat matrix
+        deltas: Change per index
+        keys: (section, name, stat) per index, as used for eligibility tracking
+        sequential: Whether a stat is changed more than once, so the changes must be clamped one by one
+        vectorized: Whether the effects are applied with one clamped array add
+        pairs: (index, delta) per effect, for applying a few effects one by one
+    """
+    
+    __slots__ = ("layout", "indices", "deltas", "keys", "rows", "sequential", "vectorized", "pairs")
+    
+    def __init__(self, layout: StatLayout, indices: np.ndarray, deltas: np.ndarray, keys: Tuple[tuple, ...]):
+        self.layout = layout
+        self.indices = indices
+        self.deltas = deltas
+        self.keys = keys
+        # Rows that hold a stat once the effects were applied
+        self.rows = frozenset(index // max(len(layout.stats), 1) for index in indices.tolist())
+        self.sequential = len(set(indices.tolist())) < len(indices)
+        self.vectorized = not self.sequential and len(indices) >= VECTOR_THRESHOLD
+        self.pairs = tuple(zip(indices.tolist(), deltas.tolist()))
+
+class WorldStats:
+    """
+    Region and faction stats of one world as a dense (entity x stat) matrix.
+    
+    Not every entity has every stat; a presence mask tells which cells hold
+    a stat. Absent stats read as 0, like missing keys of the former nested
+    dictionaries. Effects are compiled once into sparse (index, delta)
+    arrays, and a snapshot of all stats is one array copy.
+    
+    The catalogue's stats and changes are whole numbers, so the matrix
+    holds integers and stats read back as ints. It switches to float64
+    the first time a stat or change is not a whole number.
+    
+    section() returns dictionary-style views ({name: {stat: value}}) for
+    code that works on the world state as nested mappings.
+    
+    Attributes:
+        layout: Row and column indices
+        values: Stat values (0 where absent), int64 until a non-whole value is stored
+        present: Whether an entity has a stat
+    """
+    
+    def __init__(self, layout: StatLayout):
+        """
+        Initializes a store without any stats.
+        
+        Args:
+            layout: Row and column indices
+        """
+        self.layout = layout
+        shape = (len(layout.entities), len(layout.stats))
+        self.values = np.zeros(shape, dtype=np.int64)
+        self.present = np.zeros(shape, dtype=bool)
+        # Rows with at least one stat, kept in step with present for cheap membership tests
+        self._rows: Set[int] = set()
+        self._flatten()
+        
+    def _flatten(self) -> None:
+        # Flat views for applying effects by flat index
+        self._flat_values = self.values.reshape(-1)
+        self._flat_present = self.present.reshape(-1)
+        
+    def _admit(self, value) -> None:
+        """Switches the matrix to float64 if a value is not a whole number."""
+        if self.values.dtype != np.float64 and not is_whole(value):
+            self.values = self.values.astype(np.float64)
+            self._flatten()
+        
+    def __getstate__(self):
+        # Views would be copied as independent arrays
+        state = dict(self.__dict__)
+        del state["_flat_values"], state["_flat_present"]
+        return state
+        
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._flatten()
+        
+    @classmethod
+    def from_sections(cls, sections: Mapping[str, Mapping[str, Mapping[str, float]]],
+                      events: Optional[dict] = None) -> "WorldStats":
+        """
+        Builds a store holding initial stats, laid out for an event catalogue.
+        
+        Args:
+            sections: Initial stats ({section: {name: {stat: value}}})
+            events: Event definitions whose stats get indices up front
+            
+        Returns:
+            The store
+        """
+        stats = cls(StatLayout.build(sections, events))
+        for section in SECTIONS:
+            if section in sections:
+                stats.load(section, sections[section])
+        return stats
+        
+    def _grow(self, layout: StatLayout) -> None:
+        """Switches to an extended layout, keeping all values."""
+        rows, columns = self.values.shape
+        values = np.zeros((len(layout.entities), len(layout.stats)), dtype=self.values.dtype)
+        present = np.zeros(values.shape, dtype=bool)
+        values[:rows, :columns] = self.values
+        present[:rows, :columns] = self.present
+        self.layout, self.values, self.present = layout, values, present
+        self._flatten()
+        
+    def index(self, section: str, name: str, stat: str, create: bool = False) -> Optional[Tuple[int, int]]:
+        """
+        Returns the (row, column) of a stat.
+        
+        Args:
+            section: "regions" or "factions"
+            name: Name of the region or faction
+            stat: Name of the stat
+            create: Whether to extend the layout if the entity or stat is unknown
+            
+        Returns:
+            The cell, or None if unknown and not created
+        """
+        row = self.layout.entity_index.get((section, name))
+        column = self.layout.stat_index.get(stat)
+        if row is None or column is None:
+            if not create:
+                return None
+            self._grow(self.layout.extended((section, name), stat))
+            row = self.layout.entity_index[(section, name)]
+            column = self.layout.stat_index[stat]
+        return row, column
+        
+    def get(self, section: str, name: str, stat: str, default=0):
+        """Returns a stat, or the default if the entity does not have it."""
+        cell = self.index(section, name, stat)
+        if cell is None or not self.present.item(cell):
+            return default
+        return self.values.item(cell)
+        
+    def has_entity(self, row: int) -> bool:
+        """Returns whether the entity of a row has any stat."""
+        return row in self._rows
+        
+    def set(self, section: str, name: str, stat: str, value: float) -> None:
+        """Sets a stat (without clamping), adding it if necessary."""
+        cell = self.index(section, name, stat, create=True)
+        self._admit(value)
+        self.values[cell] = value
+        self.present[cell] = True
+        self._rows.add(cell[0])
+        
+    def remove(self, section: str, name: str, stat: str) -> None:
+        """
+        Removes a stat from an entity.
+        
+        Raises:
+            KeyError: If the entity does not have the stat
+        """
+        cell = self.index(section, name, stat)
+        if cell is None or not self.present.item(cell):
+            raise KeyError(stat)
+        self.values[cell] = 0
+        self.present[cell] = False
+        if not self.present[cell[0]].any():
+            self._rows.discard(cell[0])
+            
+    def load(self, section: str, entities: Mapping[str, Mapping[str, float]]) -> None:
+        """
+        Replaces all stats of a section.
+        
+        Args:
+            section: "regions" or "factions"
+            entities: New stats ({name: {stat: value}})
+        """
+        # Copy first, the new stats may be a view of this store
+        entities = {name: dict(entity_stats) for name, entity_stats in entities.items()}
+        for row, (entity_section, _) in enumerate(self.layout.entities):
+            if entity_section == section:
+                self.values[row] = 0
+                self.present[row] = False
+                self._rows.discard(row)
+        for name, entity_stats in entities.items():
+            self.load_entity(section, name, entity_stats)
+            
+    def load_entity(self, section: str, name: str, entity_stats: Mapping[str, float]) -> None:
+        """Replaces all stats of one region or faction."""
+        row = self.layout.entity_index.get((section, name))
+        if row is not None:
+            self.values[row] = 0
+            self.present[row] = False
+            self._rows.discard(row)
+        for stat, value in entity_stats.items():
+            self.set(section, name, stat, value)
+            
+    def to_dict(self, section: str) -> Dict[str, Dict[str, float]]:
+        """Returns the stats of a section as plain nested dictionaries."""
+        values = self.values.tolist()
+        present = self.present.tolist()
+        result = {}
+        for row, (entity_section, name) in enumerate(self.layout.entities):
+            if entity_section == section and any(present[row]):
+                result[name] = {stat: values[row][column] for column, stat in enumerate(self.layout.stats)
+                                if present[row][column]}
+        return result
+        
+    def section(self, section: str) -> "SectionView":
+        """Returns a dictionary-style view ({name: {stat: value}}) of a section."""
+        return SectionView(self, section)
+        
+    def compile_effects(self, effects: Sequence[Mapping]) -> StatEffects:
+        """
+        Compiles the modify_stat effects of an event into sparse arrays.
+        
+        Entities and stats the layout does not know yet are added. Other
+        effect types do not change stats and are skipped.
+        
+        Args:
+            effects: Effect definitions of one event
+            
+        Returns:
+            The compiled effects, valid for the layout after compilation
+        """
+        cells, deltas, keys = [], [], []
+        for effect in effects:
+            if effect.get("type") != "modify_stat":
+                continue
+            if effect.get("region"):
+                section, name = "regions", effect.get("region")
+            elif effect.get("faction"):
+                section, name = "factions", effect.get("faction")
+            else:
+                continue
+            stat = effect.get("stat")
+            cells.append(self.index(section, name, stat, create=True))
+            deltas.append(effect.get("value", 0))
+            keys.append((section, name, stat))
+            self._admit(deltas[-1])
+        columns = len(self.layout.stats)
+        indices = np.array([row * columns + column for row, column in cells], dtype=np.int64)
+        return StatEffects(self.layout, indices, np.array(deltas, dtype=self.values.dtype), tuple(keys))
+        
+    def apply(self, effects: StatEffects) -> List[int]:
+        """
+        Applies compiled effects, clamping every changed stat to [STAT_MIN, STAT_MAX].
+        
+        Stats that did not exist are created, starting from 0. Effects
+        changing many stats are applied with one clamped array add; a few
+        stats, or a stat changed repeatedly, are updated one by one.
+        
+        Args:
+            effects: Effects compiled against the current layout
+            
+        Returns:
+            Positions in effects.keys of the stats whose value changed
+        """
+        if effects.layout is not self.layout:
+            raise ValueError("Effects were compiled for a different stat layout")
+        indices = effects.indices
+        values = self._flat_values
+        present = self._flat_present
+        if not effects.vectorized:
+            changed = []
+            for position, (index, delta) in enumerate(effects.pairs):
+                current = values.item(index)
+                updated = min(STAT_MAX, max(STAT_MIN, current + delta))
+                values[index] = updated
+                present[index] = True
+                if updated != current:
+                    changed.append(position)
+        else:
+            current = values[indices]
+            updated = current + effects.deltas
+            # The ufuncs themselves, np.clip adds dispatch overhead that dominates for a few stats
+            np.maximum(updated, STAT_MIN, out=updated)
+            np.minimum(updated, STAT_MAX, out=updated)
+            values[indices] = updated
+            changed = [position for position, (before, after) in enumerate(zip(current.tolist(), updated.tolist()))
+                       if before != after]
+            present[indices] = True
+        self._rows.update(effects.rows)
+        return changed
+        
+    def snapshot(self) -> np.ndarray:
+        """Returns a copy of all stat values."""
+        return self.values.copy()
+        
+    def stack(self, snapshots: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Stacks snapshots into one (snapshot x entity x stat) array in the current layout.
+        
+        Snapshots taken before the layout grew are padded with 0.
+        
+        Args:
+            snapshots: Results of snapshot()
+            
+        Returns:
+            The stacked values
+        """
+        stacked = np.zeros((len(snapshots),) + self.values.shape, dtype=self.values.dtype)
+        for index, snapshot in enumerate(snapshots):
+            rows, columns = snapshot.shape
+            stacked[index, :rows, :columns] = snapshot
+        return stacked
+
+class EntityView(MutableMapping):
+    """Dictionary-style view of the stats of one region or faction."""
+    
+    def __init__(self, stats: WorldStats, section: str, name: str, row: int):
+        self._stats = stats
+        self._section = section
+        self._name = name
+        # Rows never move when the layout grows
+        self._row = row
+        
+    def get(self, stat, default=None):
+        # Called for every stat condition, so avoid the KeyError of Mapping.get
+        stats = self._stats
+        column = stats.layout.stat_index.get(stat)
+        if column is None or not stats.present.item(self._row, column):
+            return default
+        return stats.values.item(self._row, column)
+        
+    def __getitem__(self, stat):
+        value = self.get(stat, _MISSING)
+        if value is _MISSING:
+            raise KeyError(stat)
+        return value
+        
+    def __setitem__(self, stat, value):
+        self._stats.set(self._section, self._name, stat, value)
+        
+    def __delitem__(self, stat):
+        self._stats.remove(self._section, self._name, stat)
+        
+    def __iter__(self):
+        present = self._stats.present[self._row].tolist()
+        return iter([stat for stat, has_stat in zip(self._stats.layout.stats, present) if has_stat])
+        
+    def __len__(self):
+        return int(self._stats.present[self._row].sum())
+        
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+class SectionView(MutableMapping):
+    """Dictionary-style view of the regions or factions of a world ({name: {stat: value}})."""
+    
+    def __init__(self, stats: WorldStats, section: str):
+        self._stats = stats
+        self._section = section
+        self._entities: Dict[str, EntityView] = {}
+        
+    def get(self, name, default=None):
+        # Called for every stat condition, so avoid the KeyError of Mapping.get
+        row = self._stats.layout.entity_index.get((self._section, name))
+        if row is None or not self._stats.has_entity(row):
+            return default
+        view = self._entities.get(name)
+        if view is None:
+            view = self._entities[name] = EntityView(self._stats, self._section, name, row)
+        return view
+        
+    def __getitem__(self, name):
+        view = self.get(name)
+        if view is None:
+            raise KeyError(name)
+        return view
+        
+    def __setitem__(self, name, entity_stats):
+        self._stats.load_entity(self._section, name, dict(entity_stats))
+        
+    def __delitem__(self, name):
+        if self.get(name) is None:
+            raise KeyError(name)
+        self._stats.load_entity(self._section, name, {})
+        
+    def __iter__(self):
+        return iter([name for row, (section, name) in enumerate(self._stats.layout.entities)
+                     if section == self._section and self._stats.has_entity(row)])
+                     
+    def __len__(self):
+        return sum(1 for _ in self)
+        
+    def __repr__(self):
+        return repr({name: dict(stats.items()) for name, stats in self.items()})
@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from history_generator.ensemble import EnsembleStatistics, iter_ensemble
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Simulate many independent worlds in parallel')
+    parser.add_argument('--worlds', type=int, default=100, help='Number of worlds to simulate')
+    parser.add_argument('--years', type=int, default=50, help='Duration of each simulation in years')
+    parser.add_argument('--start-year', type=int, default=1000, help='Starting year of each simulation')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=0, help='Base seed from which per-world seeds are derived')
+    parser.add_argument('--dynasty', action='append', dest='dynasties', help='Name of a dynasty to found (repeatable)')
+    parser.add_argument('--results', help='Write one JSON line per world to this file')
+    parser.add_argument('--summary', help='Write the aggregated statistics to this file instead of stdout')
+    
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    dynasties = args.dynasties or ["House Nerdival"]
+    statistics = EnsembleStatistics()
+    
+    results = open(args.results, 'w') if args.results else None
+    try:
+        for summary in iter_ensemble(args.worlds, years=args.years, workers=args.workers,
+                                     start_year=args.start_year, dynasty_names=dynasties,
+                                     base_seed=args.seed):
+            statistics.add(summary)
+            if results:
+                results.write(json.dumps(asdict(summary)) + "\n")
+    finally:
+        if results:
+            results.close()
+    
+    output = json.dumps(statistics.to_dict(), indent=2)
+    if args.summary:
+        with open(args.summary, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,35 @@ import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
-from history_generator.simulation import Simulation
-from history_generator.events import DeathEvent, MarriageEvent, BirthEvent, SuccessionEvent, NoSuccessorEvent
-from history_generator.fantasy_events import NaturalEvent, MagicalEvent, PoliticalEvent
-import random
+# Project modules (and with them NumPy) are imported after the arguments are
+# parsed, so --help and usage errors return immediately; see
+# benchmarks/bench_startup.py for the tracked startup budget
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Run a dynasty simulation')
     parser.add_argument('--start-year', type=int, default=1000, help='Starting year of the simulation')
     parser.add_argument('--duration', type=int, default=50, help='Duration of the simulation in years')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for a reproducible simulation (random if omitted)')
+    parser.add_argument('--dynasty', action='append', metavar='NAME',
+                        help='Found a dynasty with this name (repeatable, default: House Nerdival)')
+    parser.add_argument('--dynasties', type=int, default=0, metavar='N',
+                        help='Found N dynasties; unnamed ones are called "House 2", "House 3", ...')
+    parser.add_argument('--fast-forward', type=int, default=0, metavar='YEARS',
+                        help='Sample deaths, births and marriages in aggregated steps of this many years')
+    parser.add_argument('--checkpoint-every', type=int, default=0, help='Write a checkpoint every N simulated years')
+    parser.add_argument('--checkpoint', default='simulation.ckpt', help='Path of the checkpoint file')
+    parser.add_argument('--resume', metavar='PATH', help='Continue the simulation from a checkpoint file')
+    parser.add_argument('--genealogy', metavar='DIR',
+                        help='Evict the relations of the dead into a memory-mapped genealogy store in this directory')
+    parser.add_argument('--log-level', default=None, help='Level of the project loggers (e.g. INFO, DEBUG)')
+    parser.add_argument('--log-file', metavar='PATH',
+                        help='Write logs as JSON lines to a file from a background thread (DEBUG unless --log-level)')
+    parser.add_argument('--events-out', action='append', metavar='PATH',
+                        help='Stream all events to a file; .jsonl, .jsonl.gz, .csv or .npz (repeatable)')
+    parser.add_argument('--metrics', metavar='PATH', help='Write per-year phase timings and counters as CSV')
+    parser.add_argument('--trace', metavar='PATH', help='Write per-year phase timings as Chrome trace JSON')
+    parser.add_argument('--trace-allocations', action='store_true',
+                        help='Also record allocated memory per phase (slow)')
     
     # Event display options
     parser.add_argument('--show-deaths', action='store_true', help='Display death events')
@@ -30,61 +50,138 @@ def parse_arguments():
     
     return parser.parse_args()
 
-def should_show_event(event, args):
+def shown_event_types(args):
+    """Returns the event classes selected by the display options (None for all)."""
+    from history_generator.events import DeathEvent, MarriageEvent, BirthEvent, SuccessionEvent, NoSuccessorEvent
+    from history_generator.fantasy_events import NaturalEvent, MagicalEvent, PoliticalEvent
+    
     if args.show_all:
-        return True
+        return None
     
     if args.show_fantasy:
-        return isinstance(event, (NaturalEvent, MagicalEvent, PoliticalEvent))
+        return (NaturalEvent, MagicalEvent, PoliticalEvent)
     
-    if isinstance(event, DeathEvent) and args.show_deaths:
-        return True
-    if isinstance(event, MarriageEvent) and args.show_marriages:
-        return True
-    if isinstance(event, BirthEvent) and args.show_births:
-        return True
-    if isinstance(event, (SuccessionEvent, NoSuccessorEvent)) and args.show_successions:
-        return True
-    if isinstance(event, NaturalEvent) and args.show_natural:
-        return True
-    if isinstance(event, MagicalEvent) and args.show_magical:
-        return True
-    if isinstance(event, PoliticalEvent) and args.show_political:
+    selected = [
+        (args.show_deaths, (DeathEvent,)),
+        (args.show_marriages, (MarriageEvent,)),
+        (args.show_births, (BirthEvent,)),
+        (args.show_successions, (SuccessionEvent, NoSuccessorEvent)),
+        (args.show_natural, (NaturalEvent,)),
+        (args.show_magical, (MagicalEvent,)),
+        (args.show_political, (PoliticalEvent,))
+    ]
+    return tuple(event_type for enabled, event_types in selected if enabled for event_type in event_types)
+    
+def needs_fantasy_events(args, event_types):
+    """
+    Returns whether the fantasy world has to be simulated.
+    
+    The world only affects its own events, so it is skipped (and the event
+    catalogue never loaded) unless fantasy events are shown or written, or
+    its state is recorded in checkpoints, metrics or logs.
+    """
+    from history_generator.fantasy_events import FantasyEvent
+    
+    if event_types is None or any(issubclass(event_type, FantasyEvent) for event_type in event_types):
         return True
+    return bool(args.events_out or args.checkpoint_every > 0 or args.metrics or args.trace
+                or args.log_level or args.log_file)
+
+def dynasty_names(args):
+    """Returns the names of the dynasties to found."""
+    names = list(args.dynasty or ["House Nerdival"])
+    index = len(names)
+    while len(names) < args.dynasties:
+        index += 1
+        name = f"House {index}"
+        if name not in names:
+            names.append(name)
+    return names
+
+class EventPrinter:
+    """Prints events grouped by year."""
     
-    return False
+    def __init__(self):
+        from history_generator.fantasy_events import FantasyEvent
+        self.year = None
+        self.fantasy_event = FantasyEvent
+        
+    def __call__(self, event):
+        if event.year != self.year:
+            self.year = event.year
+            print(f"\n🗓 Year {event.year}")
+        if isinstance(event, self.fantasy_event):
+            print(f"  - {event}")
+            if event.effects:
+                print("    Effects:")
+                for effect in event.effects:
+                    if effect['type'] == 'modify_stat':
+                        if 'faction' in effect:
+                            print(f"      {effect['faction']}: {effect['stat']} {effect['value']:+d}")
+                        elif 'region' in effect:
+                            print(f"      {effect['region']}: {effect['stat']} {effect['value']:+d}")
+        else:
+            print(f"  {event.message}")
 
 def main():
     args = parse_arguments()
+    from history_generator.simulation import Simulation
+    from history_generator.event_sinks import CallbackSink, EventPipeline, open_sink
+    from history_generator.logger_config import disable_async_logging, enable_async_logging, set_log_level
     
-    # Create simulation
-    sim = Simulation(start_year=args.start_year, duration=args.duration)
+    if args.log_file:
+        enable_async_logging(args.log_file, level=(args.log_level or 'DEBUG').upper())
+    elif args.log_level:
+        set_log_level(args.log_level.upper())
     
-    # Create initial dynasty
-    sim.create_dynasty("House Nerdival")
+    event_types = shown_event_types(args)
+    if args.resume:
+        sim = Simulation.resume(args.resume)
+        print(f"Resuming simulation in year {sim.year}")
+    else:
+        # Create simulation
+        sim = Simulation(start_year=args.start_year, duration=args.duration, seed=args.seed,
+                         fantasy_events=needs_fantasy_events(args, event_types))
     
-    # Run simulation with filtered events
-    while sim.year < sim.end_year:
-        events = sim.simulate_year()
-        visible_events = [event for event in events if should_show_event(event, args)]
-        
-        if visible_events:
-            print(f"\n🗓 Year {sim.year}")
-            for event in visible_events:
-                if isinstance(event, (NaturalEvent, MagicalEvent, PoliticalEvent)):
-                    print(f"  - {event}")
-                    if event.effects:
-                        print("    Effects:")
-                        for effect in event.effects:
-                            if effect['type'] == 'modify_stat':
-                                if 'faction' in effect:
-                                    print(f"      {effect['faction']}: {effect['stat']} {effect['value']:+d}")
-                                elif 'region' in effect:
-                                    print(f"      {effect['region']}: {effect['stat']} {effect['value']:+d}")
-                else:
-                    print(f"  {event.message}")
-        
-        sim.increment_year()
+        # Create initial dynasties
+        for name in dynasty_names(args):
+            dynasty = sim.create_dynasty(name)
+            print(f"{dynasty.founding_king.name} is married to {dynasty.founding_queen.name}")
+    if args.genealogy and sim.genealogy is None:
+        sim.enable_genealogy(args.genealogy)
+    
+    # Events flow into the console and any output files; only subscribed event types are built
+    pipeline = EventPipeline([CallbackSink(EventPrinter(), event_types)])
+    for path in args.events_out or []:
+        pipeline.add(open_sink(path))
+    
+    instrumentation = None
+    if args.metrics or args.trace:
+        instrumentation = sim.enable_instrumentation(track_allocations=args.trace_allocations)
+    
+    years_simulated = 0
+    try:
+        while sim.year < sim.end_year:
+            start_year = sim.year
+            if args.fast_forward > 1:
+                pipeline.write_all(sim.fast_forward(args.fast_forward, pipeline.event_types))
+            else:
+                pipeline.write_all(sim.simulate_year(pipeline.event_types))
+                sim.increment_year()
+            previous = years_simulated
+            years_simulated += sim.year - start_year
+            if args.checkpoint_every > 0 and years_simulated // args.checkpoint_every > previous // args.checkpoint_every:
+                pipeline.flush()
+                sim.checkpoint(args.checkpoint)
+    finally:
+        pipeline.close()
+        disable_async_logging()
+        if instrumentation is not None:
+            instrumentation.close()
+            if args.metrics:
+                instrumentation.write_table(args.metrics)
+            if args.trace:
+                instrumentation.write_chrome_trace(args.trace)
     
     # Show family tree if requested
     if args.show_family_tree or args.show_all:
@@ -92,5 +189,4 @@ def main():
         sim.debug_print()
 
 if __name__ == "__main__":
-    #random.seed(42)
     main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from history_generator.checkpoint import MAGIC, CheckpointError, read_checkpoint
+from history_generator.simulation import Simulation
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "simulation.ckpt")
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def _simulate(self, sim, years):
+        messages = []
+        for _ in range(years):
+            messages.extend(event.message for event in sim.simulate_year())
+            sim.increment_year()
+        return messages
+        
+    def _new_simulation(self):
+        sim = Simulation(start_year=1000, duration=80, seed=11)
+        sim.create_dynasty("House Nerdival")
+        sim.create_dynasty("House Aldmark")
+        return sim
+        
+    def test_resume_is_identical_to_uninterrupted_run(self):
+        """Test that a resumed simulation continues exactly like the original"""
+        reference = self._new_simulation()
+        expected = self._simulate(reference, 80)
+        
+        sim = self._new_simulation()
+        messages = self._simulate(sim, 40)
+        sim.checkpoint(self.path)
+        resumed = Simulation.resume(self.path)
+        messages.extend(self._simulate(resumed, 40))
+        
+        self.assertEqual(messages, expected)
+        self.assertEqual(resumed.year, reference.year)
+        self.assertEqual(resumed.end_year, reference.end_year)
+        self.assertEqual(resumed.fantasy_world.regions, reference.fantasy_world.regions)
+        self.assertEqual(resumed.fantasy_world.factions, reference.fantasy_world.factions)
+        self.assertEqual(resumed.fantasy_world.delayed_events.to_list(),
+                         reference.fantasy_world.delayed_events.to_list())
+        self.assertEqual([person.name for person in resumed.dynasties[0].family],
+                         [person.name for person in reference.dynasties[0].family])
+        self.assertEqual(resumed.population.names, reference.population.names)
+        
+    def test_resume_restores_relations(self):
+        """Test that partners, children and managed persons survive a checkpoint"""
+        sim = self._new_simulation()
+        self._simulate(sim, 30)
+        sim.checkpoint(self.path)
+        resumed = Simulation.resume(self.path)
+        
+        king = resumed.dynasties[0].founding_king
+        original_king = sim.dynasties[0].founding_king
+        self.assertEqual([p.name for p in king.partners], [p.name for p in original_king.partners])
+        self.assertEqual([c.name for c in king.children], [c.name for c in original_king.children])
+        self.assertEqual(sorted(p.id for p in resumed.person_manager.get_all_persons()),
+                         sorted(p.id for p in sim.person_manager.get_all_persons()))
+        self.assertEqual(len(resumed.marriage_market.candidates), len(sim.marriage_market.candidates))
+        
+    def test_rejects_other_files(self):
+        """Test that files without the checkpoint header are rejected"""
+        with open(self.path, "wb") as file:
+            file.write(b"not a checkpoint")
+        with self.assertRaises(CheckpointError):
+            read_checkpoint(self.path)
+            
+    def test_rejects_unknown_version(self):
+        """Test that checkpoints of another format version are rejected"""
+        self._new_simulation().checkpoint(self.path)
+        with open(self.path, "rb") as file:
+            data = bytearray(file.read())
+        self.assertEqual(bytes(data[:4]), MAGIC)
+        data[4:6] = (99).to_bytes(2, "little")
+        with open(self.path, "wb") as file:
+            file.write(data)
+        with self.assertRaises(CheckpointError):
+            Simulation.resume(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from history_generator.ensemble import (EnsembleStatistics, WorldSummary, derive_seeds,
+                                        iter_ensemble, run_ensemble, run_world)
+
+class TestEnsemble(unittest.TestCase):
+    def test_derive_seeds_is_deterministic(self):
+        """Test that per-world seeds only depend on the base seed"""
+        self.assertEqual(derive_seeds(4, base_seed=7), derive_seeds(4, base_seed=7))
+        self.assertNotEqual(derive_seeds(4, base_seed=7), derive_seeds(4, base_seed=8))
+        self.assertEqual(len(set(derive_seeds(4))), 4)
+        
+    def test_run_world_is_reproducible(self):
+        """Test that a world simulated twice with the same seed gives the same summary"""
+        first = run_world(seed=3, years=15)
+        second = run_world(seed=3, years=15)
+        self.assertEqual(first, second)
+        self.assertEqual(len(first.stat_trajectories["regions/Central Valley/trade"]), 15)
+        
+    def test_results_do_not_depend_on_worker_count(self):
+        """Test that a process pool yields the same summaries as an inline run"""
+        inline = list(iter_ensemble(3, years=10, workers=1, base_seed=5))
+        pooled = list(iter_ensemble(3, years=10, workers=2, base_seed=5))
+        self.assertEqual(inline, pooled)
+        
+    def test_seed_count_must_match(self):
+        """Test that an explicit seed list must match the number of worlds"""
+        with self.assertRaises(ValueError):
+            list(iter_ensemble(3, seeds=[1, 2], years=1, workers=1))
+            
+    def test_statistics(self):
+        """Test the aggregation of world summaries"""
+        statistics = EnsembleStatistics()
+        statistics.add(WorldSummary(seed=1, start_year=1000, years=2,
+                                    dynasties={"House A": {"survived": True, "members": 4}},
+                                    event_types={"BirthEvent": 2},
+                                    fantasy_events={"Flood": 1},
+                                    stat_trajectories={"regions/Valley/trade": [10, 20]}))
+        statistics.add(WorldSummary(seed=2, start_year=1000, years=2,
+                                    dynasties={"House A": {"survived": False, "members": 2}},
+                                    event_types={"BirthEvent": 1, "DeathEvent": 1},
+                                    stat_trajectories={"regions/Valley/trade": [30, 20]}))
+        result = statistics.to_dict()
+        self.assertEqual(result["worlds"], 2)
+        self.assertEqual(result["dynasty_survival"], {"House A": 0.5})
+        self.assertEqual(result["dynasty_members"], {"House A": 3.0})
+        self.assertEqual(result["event_types_per_world"], {"BirthEvent": 1.5, "DeathEvent": 0.5})
+        self.assertEqual(result["fantasy_events_per_world"], {"Flood": 0.5})
+        self.assertEqual(result["stat_trajectories"]["regions/Valley/trade"], {"mean": [20.0, 20.0], "std": [10.0, 0.0]})
+        
+    def test_run_ensemble(self):
+        """Test a small ensemble end to end"""
+        result = run_ensemble(2, years=5, workers=1).to_dict()
+        self.assertEqual(result["worlds"], 2)
+        self.assertIn("House Nerdival", result["dynasty_survival"])
+
+if __name__ == '__main__':
+    unittest.main()
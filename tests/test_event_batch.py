@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import mock_open, patch
+import json
+import numpy as np
+from history_generator.event_processor import EventProcessor
+from history_generator.fantasy_world import EVENT_FILE, FantasyWorld
+from history_generator.rng import RandomStreams
+from history_generator.world_stats import WorldStats
+
+class TestBatchEventProcessor(unittest.TestCase):
+    def setUp(self):
+        self.events = {
+            "events": {
+                "natural": {
+                    "flood": {
+                        "name": "Flood",
+                        "conditions": [{"type": "region", "region": "Central Valley", "stat": "fertility",
+                                        "operator": ">=", "value": 50}],
+                        "effects": [{"type": "modify_stat", "region": "Central Valley", "stat": "fertility", "value": -30},
+                                    {"type": "modify_stat", "region": "Central Valley", "stat": "fertility", "value": 5}],
+                        "followup_events": [{"id": "famine", "delay": 0, "probability": 1.0},
+                                            {"id": "recovery", "delay": 2, "probability": 1.0}]
+                    }
+                },
+                "aftermath": {
+                    "famine": {
+                        "name": "Famine",
+                        "is_followup": True,
+                        # Follow-ups without conditions would also be picked as regular events
+                        "conditions": [{"type": "year", "operator": "<", "value": 0}],
+                        "effects": [{"type": "modify_stat", "faction": "Noble Houses", "stat": "stability", "value": -10}]
+                    },
+                    "recovery": {
+                        "name": "Recovery",
+                        "is_followup": True,
+                        "conditions": [{"type": "year", "operator": "<", "value": 0}],
+                        "effects": [{"type": "modify_stat", "region": "Central Valley", "stat": "fertility", "value": 40}]
+                    }
+                },
+                "political": {
+                    "crisis": {
+                        "name": "Crisis",
+                        "conditions": [{"type": "common", "value": "realm_in_crisis"},
+                                       {"type": "year", "operator": ">=", "value": 1001}],
+                        "effects": [{"type": "modify_stat", "faction": "Rebels", "stat": "power", "value": 20}]
+                    }
+                }
+            }
+        }
+        with patch("builtins.open", mock_open(read_data=json.dumps(self.events))):
+            self.processor = EventProcessor("test_events.json")
+        self.stats = WorldStats.from_sections({
+            "regions": {"Central Valley": {"fertility": 60}},
+            "factions": {"Noble Houses": {"stability": 45}}
+        })
+        
+    def test_batch_matches_single_world_processing(self):
+        """Test that deterministic events change every world of a batch like the single-world processor"""
+        batch = self.processor.batch(self.stats, 3, RandomStreams(0).stream("events"))
+        world_state = {"regions": self.stats.to_dict("regions"), "factions": self.stats.to_dict("factions")}
+        for year in range(1000, 1006):
+            counts = batch.process_year(year)
+            world_state["current_year"] = year
+            names = sorted(event["name"] for event in self.processor.process_events(world_state, year))
+            expected = {event_id: names.count(self.processor._get_event_by_id(event_id)["name"])
+                        for event_id in batch.event_ids}
+            for world in range(3):
+                self.assertEqual(dict(zip(batch.event_ids, counts[world].tolist())), expected, year)
+                self.assertEqual(batch.sections(world), {
+                    "regions": world_state["regions"],
+                    "factions": world_state["factions"]
+                })
+                
+    def test_eligibility_matches_compiled_predicates(self):
+        """Test that the vectorized eligibility mask equals the predicates of every world"""
+        processor = EventProcessor(EVENT_FILE)
+        world = FantasyWorld()
+        batch = processor.batch(world.stats, 200, RandomStreams(1).stream("events"))
+        generator = np.random.default_rng(7)
+        batch.values[:] = np.where(batch.present, generator.integers(0, 101, batch.values.shape), 0)
+        for category_index, (category, compiled_events) in enumerate(processor._compiled_events.items()):
+            mask = batch.eligibility(category_index, 1100)
+            for index in range(batch.n_worlds):
+                sections = batch.sections(index)
+                world_state = {"current_year": 1100, "regions": sections["regions"], "factions": sections["factions"]}
+                expected = [event.predicate(world_state) for event in compiled_events]
+                self.assertEqual(mask[index].tolist(), expected, category)
+                
+    def test_worlds_pick_independently(self):
+        """Test that every world picks one of its eligible events with its own draw"""
+        processor = EventProcessor(EVENT_FILE)
+        batch = processor.batch(FantasyWorld().stats, 500, RandomStreams(2).stream("events"))
+        # All worlds start alike, so the first year's masks are identical
+        masks = [batch.eligibility(category_index, 1000) for category_index in range(len(batch._categories))]
+        counts = batch.process_year(1000)
+        for columns, mask in zip(batch._categories, masks):
+            picks = counts[:, columns] * mask
+            self.assertTrue((picks.sum(axis=1) == 1).all())
+            self.assertEqual(set(np.flatnonzero(picks.sum(axis=0))), set(np.flatnonzero(mask[0])))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from history_generator.event_catalogue import (FORMAT_VERSION, MAGIC, _PREAMBLE, cache_path, clear_catalogue_cache,
+                                              load_catalogue)
+from history_generator.event_processor import EventProcessor
+
+class TestEventCatalogue(unittest.TestCase):
+    def setUp(self):
+        clear_catalogue_cache()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "events.json")
+        self.events = {
+            "events": {
+                "natural": {
+                    "earthquake": {
+                        "name": "Earthquake",
+                        "conditions": [{"type": "year", "operator": ">=", "value": 0}],
+                        "effects": []
+                    }
+                }
+            }
+        }
+        self._write(self.events)
+        self.validated = []
+        
+    def tearDown(self):
+        clear_catalogue_cache()
+        self.directory.cleanup()
+        
+    def _write(self, events):
+        with open(self.path, "w") as file:
+            json.dump(events, file)
+            
+    def _validate(self, events):
+        self.validated.append(events)
+        
+    def test_same_content_is_loaded_once(self):
+        """Test that identical content is parsed and validated only once per process"""
+        first = load_catalogue(self.path, self._validate)
+        second = load_catalogue(self.path, self._validate)
+        self.assertIs(first, second)
+        self.assertEqual(first.events, self.events)
+        self.assertEqual(len(self.validated), 1)
+        
+    def test_binary_form_skips_validation(self):
+        """Test that a new process loads the validated binary form instead of the JSON"""
+        load_catalogue(self.path, self._validate)
+        self.assertTrue(os.path.exists(cache_path(self.path)))
+        clear_catalogue_cache()
+        catalogue = load_catalogue(self.path, self._validate)
+        self.assertEqual(catalogue.events, self.events)
+        self.assertEqual(len(self.validated), 1)
+        
+    def test_changed_content_invalidates_cache(self):
+        """Test that changed content is validated again and replaces the binary form"""
+        first = load_catalogue(self.path, self._validate)
+        self.events["events"]["natural"]["earthquake"]["name"] = "Great Earthquake"
+        self._write(self.events)
+        second = load_catalogue(self.path, self._validate)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.events["events"]["natural"]["earthquake"]["name"], "Great Earthquake")
+        self.assertEqual(len(self.validated), 2)
+        clear_catalogue_cache()
+        self.assertEqual(load_catalogue(self.path, self._validate).events, self.events)
+        self.assertEqual(len(self.validated), 2)
+        
+    def test_corrupt_binary_form_is_ignored(self):
+        """Test that an unreadable binary form falls back to the JSON"""
+        with open(cache_path(self.path), "wb") as file:
+            file.write(b"garbage")
+        catalogue = load_catalogue(self.path, self._validate)
+        self.assertEqual(catalogue.events, self.events)
+        self.assertEqual(len(self.validated), 1)
+        
+    def test_schema_version_invalidates_cache(self):
+        """Test that a binary form validated under other rules is validated again"""
+        load_catalogue(self.path, self._validate, schema_version=1)
+        clear_catalogue_cache()
+        load_catalogue(self.path, self._validate, schema_version=2)
+        self.assertEqual(len(self.validated), 2)
+        clear_catalogue_cache()
+        load_catalogue(self.path, self._validate, schema_version=2)
+        self.assertEqual(len(self.validated), 2)
+        
+    def test_binary_form_is_never_unpickled(self):
+        """Test that a binary form with a matching key but a pickled body is a cache miss"""
+        load_catalogue(self.path, self._validate)
+        with open(cache_path(self.path), "rb") as file:
+            preamble = file.read(_PREAMBLE.size)
+        _, _, _, key = _PREAMBLE.unpack(preamble)
+        self.assertEqual(preamble, _PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, key))
+        with open(cache_path(self.path), "wb") as file:
+            file.write(preamble + pickle.dumps(self.events))
+        clear_catalogue_cache()
+        catalogue = load_catalogue(self.path, self._validate)
+        self.assertEqual(catalogue.events, self.events)
+        self.assertEqual(len(self.validated), 2)
+        
+    def test_processors_share_compiled_events(self):
+        """Test that processors of the same file share the compiled catalogue"""
+        first = EventProcessor(self.path)
+        second = EventProcessor(self.path)
+        self.assertIs(first.catalogue, second.catalogue)
+        self.assertIs(first._compiled_events, second._compiled_events)
+        self.assertIsNot(first._eligibility, second._eligibility)
+
+if __name__ == '__main__':
+    unittest.main()
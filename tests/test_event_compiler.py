@@ -0,0 +1,82 @@
+import unittest
+from history_generator.event_compiler import compile_condition, compile_conditions, compile_events
+from history_generator.fantasy_world import FantasyWorld
+
+class TestEventCompiler(unittest.TestCase):
+    def setUp(self):
+        """Set up a world state and common conditions."""
+        self.world_state = {
+            "current_year": 1000,
+            "regions": {"Central Valley": {"magical_energy": 90}},
+            "factions": {"Noble Houses": {"stability": 30}}
+        }
+        self.common_conditions = {
+            "magical_instability": {
+                "type": "region",
+                "region": "Central Valley",
+                "stat": "magical_energy",
+                "operator": ">=",
+                "value": 80
+            }
+        }
+        
+    def _check(self, condition):
+        return compile_condition(condition, self.common_conditions)(self.world_state)
+        
+    def test_all_operators(self):
+        """Test that every operator is supported"""
+        condition = {"type": "faction", "faction": "Noble Houses", "stat": "stability", "value": 30}
+        expected = {"==": True, "!=": False, ">": False, ">=": True, "<": False, "<=": True}
+        for operator, result in expected.items():
+            self.assertEqual(self._check(dict(condition, operator=operator)), result, operator)
+            
+    def test_year_condition(self):
+        """Test year conditions"""
+        self.assertTrue(self._check({"type": "year", "operator": ">=", "value": 1000}))
+        self.assertTrue(self._check({"type": "year", "operator": "<", "value": 1001}))
+        self.assertFalse(self._check({"type": "year", "operator": ">", "value": 1000}))
+        
+    def test_season_condition(self):
+        """Test that season conditions only match worlds that track a season"""
+        condition = {"type": "season", "operator": "==", "value": "autumn"}
+        self.assertFalse(self._check(condition))
+        self.world_state["current_season"] = "autumn"
+        self.assertTrue(self._check(condition))
+        
+    def test_missing_stats_default_to_zero(self):
+        """Test that missing regions and stats are treated as zero"""
+        self.assertTrue(self._check({"type": "region", "region": "Nowhere", "stat": "trade", "operator": "<=", "value": 0}))
+        self.assertFalse(self._check({"type": "faction", "faction": "Nobody", "stat": "power", "operator": ">", "value": 0}))
+        
+    def test_common_condition_is_inlined(self):
+        """Test that common conditions are resolved at compile time"""
+        predicate = compile_condition({"type": "common", "value": "magical_instability"}, self.common_conditions)
+        self.assertTrue(predicate(self.world_state))
+        self.world_state["regions"]["Central Valley"]["magical_energy"] = 70
+        self.assertFalse(predicate(self.world_state))
+        self.assertFalse(self._check({"type": "common", "value": "unknown"}))
+        
+    def test_conjunction(self):
+        """Test that all conditions of an event must hold"""
+        year = {"type": "year", "operator": ">=", "value": 1000}
+        crisis = {"type": "faction", "faction": "Noble Houses", "stat": "stability", "operator": "<=", "value": 30}
+        late = {"type": "year", "operator": ">=", "value": 1100}
+        self.assertTrue(compile_conditions([], self.common_conditions)(self.world_state))
+        self.assertTrue(compile_conditions([year, crisis], self.common_conditions)(self.world_state))
+        self.assertFalse(compile_conditions([year, crisis, late], self.common_conditions)(self.world_state))
+        
+    def test_matches_interpreter_on_definitions(self):
+        """Test that compiled predicates agree with the interpreter on the shipped catalogue"""
+        world = FantasyWorld()
+        processor = world.event_processor
+        compiled = compile_events(processor.events, processor.common_conditions)
+        for year in (900, 1000, 1200):
+            world_state = world.get_world_state()
+            world_state["current_year"] = year
+            for category, events in compiled.items():
+                for event in events:
+                    expected = processor._check_conditions(event.data.get("conditions", []), world_state)
+                    self.assertEqual(event.predicate(world_state), expected, event.event_id)
+
+if __name__ == '__main__':
+    unittest.main()
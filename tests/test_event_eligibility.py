@@ -0,0 +1,74 @@
+import random
+import unittest
+from history_generator.event_compiler import compile_events
+from history_generator.event_eligibility import EligibilityCache
+from history_generator.fantasy_world import FantasyWorld
+
+class TestEligibilityCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a small catalogue with stat and year conditions."""
+        self.events = {
+            "events": {
+                "natural": {
+                    "flood": {
+                        "name": "Flood",
+                        "conditions": [
+                            {"type": "region", "region": "Central Valley", "stat": "fertility", "operator": ">=", "value": 50}
+                        ],
+                        "effects": []
+                    },
+                    "late_storm": {
+                        "name": "Late Storm",
+                        "conditions": [{"type": "year", "operator": ">", "value": 1005}],
+                        "effects": []
+                    }
+                }
+            }
+        }
+        self.compiled = compile_events(self.events, {})
+        self.cache = EligibilityCache(self.compiled)
+        self.regions = {"Central Valley": {"fertility": 60}}
+        self.factions = {}
+        
+    def _eligible_ids(self, year):
+        world_state = {"current_year": year, "regions": self.regions, "factions": self.factions}
+        self.cache.begin_year(world_state)
+        return [self.compiled["natural"][i].event_id for i in self.cache.eligible("natural", world_state)]
+        
+    def test_year_threshold_crossing(self):
+        """Test that year conditions are re-evaluated when their threshold is crossed"""
+        self.assertEqual(self._eligible_ids(1000), ["flood"])
+        self.assertEqual(self._eligible_ids(1005), ["flood"])
+        self.assertEqual(self._eligible_ids(1006), ["flood", "late_storm"])
+        
+    def test_dirty_stat(self):
+        """Test that changed stats re-evaluate their dependent events only when marked"""
+        self.assertEqual(self._eligible_ids(1000), ["flood"])
+        self.regions["Central Valley"]["fertility"] = 10
+        self.assertEqual(self._eligible_ids(1001), ["flood"])  # Change not reported yet
+        self.cache.mark_dirty("regions", "Central Valley", "fertility")
+        self.assertEqual(self._eligible_ids(1002), [])
+        
+    def test_new_world_is_fully_evaluated(self):
+        """Test that a different world state triggers a full evaluation"""
+        self.assertEqual(self._eligible_ids(1000), ["flood"])
+        self.regions = {"Central Valley": {"fertility": 10}}
+        self.assertEqual(self._eligible_ids(1001), [])
+        
+    def test_matches_full_evaluation_over_simulation(self):
+        """Test that incremental eligibility equals a full evaluation every year"""
+        random.seed(7)
+        world = FantasyWorld()
+        processor = world.event_processor
+        compiled = processor._compiled_events
+        for year in range(990, 1300):
+            world.year = year
+            world_state = world.get_world_state()
+            processor._eligibility.begin_year(world_state)
+            for category, events in compiled.items():
+                expected = [i for i, event in enumerate(events) if event.predicate(world_state)]
+                self.assertEqual(processor._eligibility.eligible(category, world_state), expected)
+            processor.process_events(world_state, year)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from types import MappingProxyType
+from history_generator.event_log import EventLog
+from history_generator.events import BirthEvent, DeathEvent, SuccessionEvent
+from history_generator.fantasy_events import MagicalEvent
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.definition = MappingProxyType({"name": "Mana Surge", "category": "magical", "effects": ()})
+        self.events = [
+            DeathEvent(year=1000, person_name="John", age=75, person_id=3),
+            BirthEvent(year=1001, child_name="Ann", mother_name="Jane", father_name="Jim"),
+            SuccessionEvent(year=1002, message="Custom message", old_monarch="John", new_monarch="Jim",
+                            dynasty_name="House A", new_monarch_id=4),
+            MagicalEvent(1003, self.definition),
+            MagicalEvent(1004, self.definition)
+        ]
+        
+    def test_round_trip(self):
+        """Test that stored events are rebuilt unchanged"""
+        log = EventLog(capacity=2)
+        log.extend(self.events)
+        self.assertEqual(len(log), 5)
+        self.assertEqual(list(log), self.events)
+        self.assertEqual(log[-1].name, "Mana Surge")
+        self.assertIs(log[3].event_data, self.definition)
+        self.assertEqual(len(log.definitions), 1)
+        self.assertEqual(log.view("year").tolist(), [1000, 1001, 1002, 1003, 1004])
+        self.assertIsNone(log[1].child_id)
+        with self.assertRaises(IndexError):
+            log[5]
+            
+    def test_save_and_load(self):
+        """Test that a log survives an archive round trip"""
+        log = EventLog()
+        log.extend(self.events)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.npz")
+            log.save(path)
+            loaded = EventLog.load(path)
+        self.assertEqual([event.message for event in loaded], [event.message for event in self.events])
+        self.assertEqual(loaded[2].new_monarch_id, 4)
+        self.assertEqual(loaded[3].category, "magical")
+        
+if __name__ == '__main__':
+    unittest.main()
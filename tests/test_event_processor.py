@@ -232,5 +232,34 @@ class TestEventProcessor(unittest.TestCase):
         self.processor._apply_effect(effect, world_state)
         self.assertEqual(world_state["factions"]["Mages' Guild"]["power"], 100)
 
+    def test_followup_lookup_returns_frozen_definition(self):
+        """Test that follow-ups are looked up by ID as shared, read-only definitions"""
+        followup = self.processor._get_event_by_id("mana_aftermath")
+        self.assertIs(followup, self.processor._get_event_by_id("mana_aftermath"))
+        self.assertEqual(followup["category"], "magical")
+        self.assertIsNone(self.processor._get_event_by_id("unknown_event"))
+        with self.assertRaises(TypeError):
+            followup["category"] = "natural"
+
+    def test_process_events_does_not_mutate_definitions(self):
+        """Test that triggering events leaves the loaded definitions untouched"""
+        world_state = {
+            "current_year": 1000,
+            "regions": {"Southern Plains": {"magical_energy": 60}, "Central Valley": {"magical_energy": 90}},
+            "factions": {"Mages' Guild": {"power": 60, "stability": 70}}
+        }
+        with patch('random.choice', side_effect=lambda x: x[0]):
+            triggered_events = self.processor.process_events(world_state, 1000)
+        self.assertNotIn("category", self.event_data["events"]["natural"]["earthquake"])
+        self.assertEqual([event["category"] for event in triggered_events], ["natural", "magical", "magical"])
+        self.assertIs(triggered_events[2], self.processor._get_event_by_id("mana_aftermath"))
+
+    def test_missing_followup_reference(self):
+        """Test that references to unknown follow-up events are rejected on load"""
+        self.event_data["events"]["magical"]["mana_surge"]["followup_events"][0]["id"] = "unknown_event"
+        with patch('builtins.open', mock_open(read_data=json.dumps(self.event_data))):
+            with self.assertRaises(ValueError):
+                EventProcessor("mock_path.json")
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import patch
+from history_generator.event_queue import DelayedEvent, EventQueue
+from history_generator.event_processor import EventProcessor
+
+class TestEventQueue(unittest.TestCase):
+    def setUp(self):
+        """Set up a queue with entries out of order."""
+        self.queue = EventQueue()
+        self.queue.push(DelayedEvent("dragon_attack", 1005, 0.3, "natural"))
+        self.queue.push(DelayedEvent("dragon_treaty", 1002, 0.2, "natural"))
+        self.queue.push(DelayedEvent("mana_aftermath", 1002, 1.0, "magical"))
+        
+    def test_pop_due_only_returns_due_entries(self):
+        """Test that only due entries are popped, in trigger and scheduling order"""
+        due = [event.event_id for event in self.queue.pop_due(1003)]
+        self.assertEqual(due, ["dragon_treaty", "mana_aftermath"])
+        self.assertEqual(len(self.queue), 1)
+        self.assertEqual(self.queue.next_trigger_year(), 1005)
+        
+    def test_metrics(self):
+        """Test the queue depth metrics"""
+        list(self.queue.pop_due(1002))
+        self.assertEqual(self.queue.metrics(), {"depth": 1, "max_depth": 3, "scheduled": 3, "popped": 2})
+        
+    def test_serialization_round_trip(self):
+        """Test that a queue can be restored from its serialized form"""
+        entries = self.queue.to_list()
+        self.assertEqual([entry["trigger_year"] for entry in entries], [1002, 1002, 1005])
+        restored = EventQueue.from_list(entries)
+        self.assertEqual(restored.to_list(), entries)
+        
+class TestDelayedEventProcessing(unittest.TestCase):
+    def setUp(self):
+        """Set up a processor with a delayed follow-up chain."""
+        self.processor = EventProcessor("")
+        self.processor.events = {
+            "events": {
+                "natural": {
+                    "dragon_migration": {
+                        "name": "Dragon Migration",
+                        "conditions": [{"type": "year", "operator": "==", "value": 1000}],
+                        "effects": [],
+                        "followup_events": [{"id": "dragon_attack", "delay": 2, "probability": 1.0}]
+                    },
+                    "dragon_attack": {
+                        "name": "Dragon Attack",
+                        "is_followup": True,
+                        "conditions": [{"type": "year", "operator": "<", "value": 0}],
+                        "effects": []
+                    }
+                }
+            }
+        }
+        
+    def test_followup_fires_after_delay(self):
+        """Test that a delayed follow-up fires in its trigger year"""
+        world_state = {"current_year": 1000, "regions": {}, "factions": {}}
+        names = []
+        for year in range(1000, 1004):
+            world_state["current_year"] = year
+            names.append([event["name"] for event in self.processor.process_events(world_state, year)])
+        self.assertEqual(names, [["Dragon Migration"], [], ["Dragon Attack"], []])
+        self.assertEqual(len(world_state["delayed_events"]), 0)
+        
+    def test_serialized_queue_in_world_state(self):
+        """Test that a serialized queue in the world state is picked up"""
+        world_state = {
+            "current_year": 1002,
+            "delayed_events": [{"event_id": "dragon_attack", "trigger_year": 1002, "probability": 1.0, "category": "natural"}]
+        }
+        with patch('random.random', return_value=0.0):
+            events = self.processor.process_events(world_state, 1002)
+        self.assertEqual([event["name"] for event in events], ["Dragon Attack"])
+        self.assertIsInstance(world_state["delayed_events"], EventQueue)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from history_generator.event_sinks import (CallbackSink, CsvSink, EventPipeline, JsonLinesSink, NpzSink,
+                                           event_record, open_sink, read_npz_events, read_npz_records)
+from history_generator.events import BirthEvent, DeathEvent, MarriageEvent
+from history_generator.fantasy_events import FantasyEvent, NaturalEvent
+from history_generator.simulation import Simulation
+
+class TestEventSinks(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.events = [
+            DeathEvent(year=1000, message="Aldric has died at the age of 70", person_name="Aldric", age=70),
+            MarriageEvent(year=1001, message="Bran marries Cora", person1="Bran", person2="Cora", age=20),
+            NaturalEvent(1002, {"name": "Great Flood", "category": "natural", "region": "Central Valley"})
+        ]
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+        
+    def test_event_record(self):
+        """Test the conversion of events into flat records"""
+        self.assertEqual(event_record(self.events[0]), {
+            "year": 1000, "type": "DeathEvent", "message": "Aldric has died at the age of 70",
+            "person_name": "Aldric", "age": 70, "person_id": None
+        })
+        record = event_record(self.events[2])
+        self.assertEqual(record["type"], "NaturalEvent")
+        self.assertEqual(record["region"], "Central Valley")
+        
+    def test_json_lines_sink(self):
+        """Test that JSON Lines output is buffered and complete after closing"""
+        path = self._path("events.jsonl")
+        with JsonLinesSink(path, buffer_size=2) as sink:
+            for event in self.events:
+                sink.write(event)
+        with open(path) as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual([record["year"] for record in records], [1000, 1001, 1002])
+        
+    def test_compressed_json_lines_sink(self):
+        """Test that a .gz path gives gzip-compressed NDJSON"""
+        path = self._path("events.ndjson.gz")
+        with open_sink(path) as sink:
+            for event in self.events:
+                sink.write(event)
+        with gzip.open(path, "rt") as file:
+            self.assertEqual(len(file.readlines()), 3)
+            
+    def test_csv_sink(self):
+        """Test the CSV columns"""
+        path = self._path("events.csv")
+        with CsvSink(path) as sink:
+            for event in self.events:
+                sink.write(event)
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(rows[1]["type"], "MarriageEvent")
+        self.assertEqual(json.loads(rows[1]["fields"])["person2"], "Cora")
+        
+    def test_npz_sink(self):
+        """Test that chunked columnar output is read back in order"""
+        path = self._path("events.npz")
+        with NpzSink(path, buffer_size=2) as sink:
+            for event in self.events * 3:
+                sink.write(event)
+        columns = read_npz_events(path)
+        self.assertEqual(columns["year"].tolist(), [1000, 1001, 1002] * 3)
+        self.assertEqual(columns["type"].tolist()[:3], ["DeathEvent", "MarriageEvent", "NaturalEvent"])
+        self.assertEqual(columns["message"][2], "Great Flood")
+        self.assertEqual(columns["person2"].tolist()[:3], ["", "Cora", ""])
+        self.assertEqual(columns["region"][2], "Central Valley")
+        
+    def test_npz_records_round_trip(self):
+        """Test that the archive gives back every field of every record"""
+        path = self._path("events.npz")
+        with NpzSink(path, buffer_size=2) as sink:
+            for event in self.events:
+                sink.write(event)
+        self.assertEqual(list(read_npz_records(path)), [event_record(event) for event in self.events])
+        
+    def test_unsupported_extension(self):
+        """Test that unknown output formats are rejected"""
+        with self.assertRaises(ValueError):
+            open_sink(self._path("events.xml"))
+            
+    def test_pipeline_filters_by_subscription(self):
+        """Test that sinks only receive the event types they subscribed to"""
+        deaths, fantasy = [], []
+        pipeline = EventPipeline([CallbackSink(deaths.append, [DeathEvent]),
+                                  CallbackSink(fantasy.append, [FantasyEvent])])
+        self.assertEqual(set(pipeline.event_types), {DeathEvent, FantasyEvent})
+        pipeline.write_all(self.events)
+        self.assertEqual(deaths, [self.events[0]])
+        self.assertEqual(fantasy, [self.events[2]])
+        pipeline.add(CallbackSink(lambda event: None))
+        self.assertIsNone(pipeline.event_types)
+
+class TestProducerFiltering(unittest.TestCase):
+    def _simulation(self):
+        sim = Simulation(start_year=1000, duration=40, seed=5)
+        sim.create_dynasty("House Nerdival")
+        return sim
+        
+    def test_only_subscribed_events_are_produced(self):
+        """Test that filtering is pushed down without changing the simulation"""
+        full = self._simulation()
+        all_events = list(full.iter_events())
+        births = []
+        filtered = self._simulation()
+        filtered.run([CallbackSink(births.append, [BirthEvent])])
+        
+        self.assertTrue(births)
+        self.assertTrue(all(isinstance(event, BirthEvent) for event in births))
+        self.assertEqual([event.message for event in births],
+                         [event.message for event in all_events if isinstance(event, BirthEvent)])
+        self.assertEqual(filtered.year, full.year)
+        self.assertEqual(filtered.fantasy_world.regions, full.fantasy_world.regions)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,5 +79,28 @@ class TestEvents(unittest.TestCase):
         self.assertEqual(event.monarch_name, "John")
         self.assertTrue(event.is_king)
 
+    def test_message_is_rendered_lazily(self):
+        """Test that events without an explicit message render it from their fields"""
+        event = DeathEvent(year=1000, person_name="John", age=75, person_id=3)
+        self.assertIsNone(event._message)
+        self.assertEqual(event.message, "John has died at the age of 75")
+        self.assertEqual(event.person_id, 3)
+        succession = SuccessionEvent(year=1000, old_monarch="John", new_monarch="Jim", dynasty_name="House A")
+        self.assertEqual(succession.message, "Jim becomes the new monarch of House A")
+        
+    def test_events_are_immutable_and_slotted(self):
+        """Test that events cannot be changed and have no instance dict"""
+        event = MarriageEvent(year=1000, person1="John", person2="Jane", age=25)
+        with self.assertRaises(AttributeError):
+            event.age = 30
+        self.assertFalse(hasattr(event, "__dict__"))
+        self.assertEqual(event, MarriageEvent(year=1000, person1="John", person2="Jane", age=25))
+        
+    def test_names_are_interned(self):
+        """Test that equal names share one string object"""
+        first = DeathEvent(year=1000, person_name="".join(["Jo", "hn"]), age=75)
+        second = DeathEvent(year=1001, person_name="".join(["Joh", "n"]), age=76)
+        self.assertIs(first.person_name, second.person_name)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,7 +1,16 @@
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
 import unittest
+import weakref
 from unittest.mock import MagicMock
-from history_generator.fantasy_events import NaturalEvent, MagicalEvent, PoliticalEvent, FantasyEventGenerator
+from history_generator.event_catalogue import clear_catalogue_cache
+from history_generator.fantasy_events import (DEFINITIONS, FantasyEvent, NaturalEvent, MagicalEvent,
+                                              PoliticalEvent, FantasyEventGenerator)
 from history_generator.fantasy_world import FantasyWorld
+from history_generator.simulation import Simulation
 
 class TestFantasyEvents(unittest.TestCase):
     def test_natural_event(self):
@@ -244,5 +253,77 @@ class TestFantasyEvents(unittest.TestCase):
         # Check that events without category are ignored
         self.assertEqual(len(events), 0)
 
+class TestFantasyEventDefinitions(unittest.TestCase):
+    def test_events_pickle_the_definition_key(self):
+        """Test that catalogue events pickle their definition key instead of the definition"""
+        world = FantasyWorld()
+        events = []
+        for year in range(1000, 1020):
+            events.extend(FantasyEventGenerator(world).generate_events(year))
+        event = events[0]
+        digest, event_id = DEFINITIONS.keys[event.definition_code]
+        self.assertEqual(digest, world.event_processor.catalogue.digest)
+        self.assertIs(world.event_processor._get_event_by_id(event_id), event.event_data)
+        self.assertNotIn(b"effects", pickle.dumps(event))
+        restored = pickle.loads(pickle.dumps(events))
+        self.assertEqual(restored, events)
+        self.assertIs(restored[0].event_data, event.event_data)
+        
+    def test_definitions_outside_a_catalogue_travel_with_the_event(self):
+        """Test that events built from plain dictionaries still pickle"""
+        event = NaturalEvent(1000, {"name": "Flood", "category": "natural", "effects": []})
+        self.assertEqual(pickle.loads(pickle.dumps(event)), event)
+        
+    def test_table_does_not_keep_other_definitions(self):
+        """Test that ad-hoc definitions are freed with their events and reloads reuse codes"""
+        class Definition(dict):
+            pass
+        FantasyWorld()
+        size = len(DEFINITIONS.definitions)
+        definition = Definition(name="Flood", category="natural")
+        event = NaturalEvent(1000, definition)
+        self.assertEqual(event.definition_code, -1)
+        self.assertIs(event.event_data, definition)
+        reference = weakref.ref(definition)
+        del event, definition
+        self.assertIsNone(reference())
+        
+        clear_catalogue_cache()
+        world = FantasyWorld()
+        self.assertEqual(len(DEFINITIONS.definitions), size)
+        generator = FantasyEventGenerator(world)
+        event = [event for year in range(1000, 1020) for event in generator.generate_events(year)][0]
+        self.assertIs(event.event_data, world.event_processor._get_event_by_id(DEFINITIONS.keys[event.definition_code][1]))
+
+class TestDisabledFantasyEvents(unittest.TestCase):
+    def _messages(self, fantasy_events, years):
+        sim = Simulation(start_year=1000, duration=years, seed=5, fantasy_events=fantasy_events)
+        sim.create_dynasty("House Nerdival")
+        return sim, [event.message for event in sim.iter_events() if not isinstance(event, FantasyEvent)]
+        
+    def test_dynasties_do_not_depend_on_the_world(self):
+        """Test that disabling fantasy events leaves the dynasty events unchanged and survives a checkpoint"""
+        _, expected = self._messages(True, 60)
+        sim, messages = self._messages(False, 60)
+        self.assertEqual(messages, expected)
+        self.assertIsNone(sim.fantasy_world)
+        self.assertIsNone(sim.fantasy_generator)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "simulation.ckpt")
+            sim.checkpoint(path)
+            self.assertIsNone(Simulation.resume(path).fantasy_world)
+            
+    def test_catalogue_is_loaded_on_first_use(self):
+        """Test that the event catalogue is only imported once the fantasy world is used"""
+        code = ("import sys\n"
+                "from history_generator.simulation import Simulation\n"
+                "sim = Simulation(duration=1, seed=1)\n"
+                "print('history_generator.event_catalogue' in sys.modules)\n"
+                "sim.simulate_year()\n"
+                "print('history_generator.event_catalogue' in sys.modules)\n")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.split(), ["False", "True"])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
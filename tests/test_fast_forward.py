@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+from history_generator.events import BirthEvent, DeathEvent, MarriageEvent, NoSuccessorEvent, SuccessionEvent
+from history_generator.fast_forward import sample_death_years
+from history_generator.population import NO_YEAR, Population
+from history_generator.simulation import Simulation
+
+def _run(seed, fast_forward, years=60, event_types=None):
+    sim = Simulation(start_year=1000, duration=years, seed=seed)
+    for index in range(10):
+        sim.create_dynasty(f"House {index}")
+    if fast_forward:
+        events = []
+        while sim.year < sim.end_year:
+            events.extend(sim.fast_forward(fast_forward, event_types))
+    else:
+        events = list(sim.iter_events(event_types))
+    return sim, events
+
+class TestSampleDeathYears(unittest.TestCase):
+    def test_death_years(self):
+        """Test that only persons old enough can die and the very old die in the first year"""
+        population = Population()
+        for birth_year in (990, 900, 800):
+            population.add("Person", "male", birth_year, "Commoners", "Central Valley")
+        population.death_year[1] = 990
+        death_years = sample_death_years(population, 1000, 20, np.random.default_rng(1))
+        survives = np.iinfo(np.int32).max
+        self.assertEqual(death_years.tolist(), [survives, survives, 1000])
+        
+    def test_matches_yearly_hazard(self):
+        """Test that sampled deaths follow the yearly mortality of the same age"""
+        population = Population(capacity=20000)
+        for _ in range(20000):
+            population.add("Person", "female", 905, "Commoners", "Central Valley")
+        # At age 95 to 104 the yearly death probability rises from 15/41 to 24/41
+        death_years = sample_death_years(population, 1000, 10, np.random.default_rng(7))
+        expected = 1 - np.prod([1 - min(age - 80, 41) / 41 for age in range(95, 105)])
+        self.assertAlmostEqual(np.mean(death_years < 1010), expected, delta=0.01)
+        self.assertTrue((population.death_year[:20000] == NO_YEAR).all())
+
+class TestFastForward(unittest.TestCase):
+    def test_advances_and_keeps_families_consistent(self):
+        """Test that a step advances the year and leaves only living members in families"""
+        sim, events = _run(3, 10, years=95)
+        self.assertEqual(sim.year, 1095)
+        self.assertEqual([event.year for event in events], sorted(event.year for event in events))
+        self.assertTrue(all(1000 <= event.year < 1095 for event in events))
+        for dynasty in sim.dynasties:
+            self.assertTrue(all(not person.is_dead() for person in dynasty.family))
+            
+    def test_only_subscribed_events_are_built(self):
+        """Test that a fast-forward step only materializes subscribed event classes"""
+        event_types = (SuccessionEvent, NoSuccessorEvent)
+        _, events = _run(5, 20, years=200, event_types=event_types)
+        self.assertGreater(len(events), 0)
+        self.assertTrue(all(isinstance(event, event_types) for event in events))
+        
+    def test_children_born_in_a_long_step_marry(self):
+        """Test that a step longer than the marriage age still marries children born within it"""
+        sim = Simulation(start_year=1000, duration=80, seed=4)
+        for index in range(10):
+            sim.create_dynasty(f"House {index}")
+        events = sim.fast_forward(80)
+        self.assertEqual(sim.year, 1080)
+        born = {event.child_id for event in events if isinstance(event, BirthEvent)}
+        married = {event.person1_id for event in events if isinstance(event, MarriageEvent)}
+        self.assertTrue(born & married)
+        
+    def test_reproducible(self):
+        """Test that fast-forward runs are determined by the seed"""
+        first = [event.message for event in _run(9, 10)[1]]
+        second = [event.message for event in _run(9, 10)[1]]
+        self.assertEqual(first, second)
+        
+    def test_demography_matches_yearly_simulation(self):
+        """Test that births, deaths and marriages occur about as often as in yearly simulation"""
+        def counts(fast_forward):
+            totals = np.zeros(3)
+            for seed in range(8):
+                events = _run(seed, fast_forward)[1]
+                totals += [sum(isinstance(event, event_class) for event in events)
+                           for event_class in (BirthEvent, DeathEvent, MarriageEvent)]
+            return totals
+        yearly = counts(0)
+        aggregated = counts(10)
+        np.testing.assert_allclose(aggregated, yearly, rtol=0.35)
+
+if __name__ == '__main__':
+    unittest.main()
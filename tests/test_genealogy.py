@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from history_generator.genealogy import GenealogyStore, ancestors, descendants, family_tree
+from history_generator.person import Person
+from history_generator.population import Population
+from history_generator.simulation import Simulation
+
+def _simulate(sim, checkpoint_at=None, checkpoint=None):
+    while sim.year < sim.end_year:
+        if sim.year == checkpoint_at:
+            sim.checkpoint(checkpoint)
+        sim.simulate_year()
+        sim.increment_year()
+    return sim
+
+def _run(seed, path=None, checkpoint_at=None, checkpoint=None):
+    sim = Simulation(start_year=1000, duration=200, seed=seed)
+    if path is not None:
+        sim.enable_genealogy(path, eviction_batch=8)
+    for index in range(4):
+        sim.create_dynasty(f"House {index}")
+    return _simulate(sim, checkpoint_at, checkpoint)
+
+class TestGenealogyStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "genealogy")
+        self.population = Population()
+        self.king = Person("Aldric", "male", 950, "Noble Houses", "Central Valley", population=self.population)
+        self.queen = Person("Elara", "female", 955, "Noble Houses", "Central Valley", population=self.population)
+        self.king.marry(self.queen)
+        self.child = Person("Bran", "male", 980, "Noble Houses", "Central Valley", population=self.population)
+        self.queen.add_child(self.child)
+        self.king.add_child(self.child)
+        self.grandchild = Person("Cara", "female", 1005, "Noble Houses", "Central Valley",
+                                 population=self.population)
+        self.child.add_child(self.grandchild)
+        self.king.death_year = 1020
+        self.queen.death_year = 1025
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def test_evicted_relations_are_read_from_store(self):
+        """Test that evicted persons keep their relations while the edges leave memory"""
+        self.population.genealogy = GenealogyStore(self.path)
+        edges = len(self.population.children) + len(self.population.partners)
+        self.population.evict(np.array([self.king.id, self.queen.id]))
+        
+        self.assertIn(self.king.id, self.population.genealogy)
+        self.assertNotIn(self.child.id, self.population.genealogy)
+        self.assertEqual(self.population.children.neighbors(self.king.id), [])
+        self.assertLess(len(self.population.children) + len(self.population.partners), edges)
+        self.assertEqual(self.king.partners, (self.queen,))
+        self.assertEqual(self.queen.children, (self.child,))
+        self.assertEqual(self.child.parents, (self.queen, self.king))
+        self.assertEqual(ancestors(self.population, self.grandchild.id), [self.child.id, self.queen.id, self.king.id])
+        self.assertEqual(descendants(self.population, self.king.id), [self.child.id, self.grandchild.id])
+        self.assertEqual(descendants(self.population, self.king.id, generations=1), [self.child.id])
+        
+    def test_reopened_store_keeps_records(self):
+        """Test that archived records survive closing and reopening the store"""
+        store = GenealogyStore(self.path)
+        store.archive(self.population, [self.queen.id, self.king.id])
+        store.close()
+        
+        store = GenealogyStore(self.path)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.ids().tolist(), [self.king.id, self.queen.id])
+        record = store.record(self.king.id)
+        self.assertEqual(record["name"], "Aldric")
+        self.assertEqual(record["gender"], "male")
+        self.assertEqual((record["birth_year"], record["death_year"]), (950, 1020))
+        self.assertEqual(record["faction"], "Noble Houses")
+        self.assertEqual(record["partners"], [self.queen.id])
+        self.assertEqual(record["children"], [self.child.id])
+        with self.assertRaises(KeyError):
+            store.record(self.child.id)
+            
+    def test_archived_persons_are_not_archived_again(self):
+        """Test that evicting a person twice keeps the relations written the first time"""
+        self.population.genealogy = GenealogyStore(self.path)
+        self.population.evict(np.array([self.king.id]))
+        self.population.evict(np.array([self.king.id, self.queen.id]))
+        self.assertEqual(self.population.genealogy.record(self.king.id)["children"], [self.child.id])
+        self.assertEqual(self.king.partners, (self.queen,))
+        self.assertEqual(self.queen.children, (self.child,))
+        
+    def test_evict_requires_store(self):
+        """Test that evicting without a genealogy store fails"""
+        with self.assertRaises(ValueError):
+            self.population.evict(np.array([self.king.id]))
+
+class TestSimulationGenealogy(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "genealogy")
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def test_lineage_matches_in_memory_run(self):
+        """Test that family trees and lineage queries are the same with the dead evicted"""
+        reference = _run(1)
+        sim = _run(1, self.path)
+        
+        self.assertGreater(len(sim.genealogy), 0)
+        for expected, dynasty in zip(reference.dynasties, sim.dynasties):
+            self.assertEqual(family_tree(sim.population, dynasty.founding_king.id),
+                             family_tree(reference.population, expected.founding_king.id))
+        for person_id in range(len(reference.population)):
+            self.assertEqual(ancestors(sim.population, person_id), ancestors(reference.population, person_id))
+            
+    def test_resume_reattaches_store(self):
+        """Test that a resumed simulation reattaches the store and forgets later evictions"""
+        reference = _run(2, self.path + "-reference")
+        checkpoint = os.path.join(self.directory.name, "sim.ckpt")
+        _run(2, self.path, checkpoint_at=1100, checkpoint=checkpoint)
+        sim = _simulate(Simulation.resume(checkpoint))
+        
+        self.assertIsNotNone(sim.genealogy)
+        self.assertEqual(sim.genealogy.ids().tolist(), reference.genealogy.ids().tolist())
+        for expected, dynasty in zip(reference.dynasties, sim.dynasties):
+            self.assertEqual(family_tree(sim.population, dynasty.founding_king.id),
+                             family_tree(reference.population, expected.founding_king.id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from history_generator.instrumentation import Instrumentation
+from history_generator.simulation import Simulation
+
+PHASES = ("mortality", "marriage_market", "dynasties", "fantasy_events", "cleanup")
+
+class TestInstrumentation(unittest.TestCase):
+    def test_phases_and_counters_per_year(self):
+        """Test that phases, counters and gauges are recorded per year"""
+        instrumentation = Instrumentation()
+        for year in (1000, 1001):
+            instrumentation.begin_year(year)
+            with instrumentation.phase("work"):
+                pass
+            with instrumentation.phase("work"):
+                pass
+            instrumentation.count("items", 3)
+            instrumentation.count("items")
+            instrumentation.gauge("depth", year - 1000)
+        rows = instrumentation.rows()
+        self.assertEqual([row["year"] for row in rows], [1000, 1001])
+        self.assertEqual(rows[1]["work_calls"], 2)
+        self.assertEqual(rows[1]["items"], 4)
+        self.assertEqual(rows[1]["depth"], 1)
+        self.assertGreaterEqual(rows[0]["work_ms"], 0)
+        
+    def test_allocations(self):
+        """Test that allocated memory is recorded per phase when enabled"""
+        instrumentation = Instrumentation(track_allocations=True)
+        try:
+            instrumentation.begin_year(1000)
+            with instrumentation.phase("allocate"):
+                data = [object() for _ in range(10000)]
+        finally:
+            instrumentation.close()
+        self.assertGreater(instrumentation.rows()[0]["allocate_alloc_kb"], 100)
+        self.assertEqual(len(data), 10000)
+
+class TestSimulationInstrumentation(unittest.TestCase):
+    def _run(self, instrumented):
+        sim = Simulation(start_year=1000, duration=30, seed=5)
+        sim.create_dynasty("House Nerdival")
+        instrumentation = sim.enable_instrumentation() if instrumented else None
+        messages = [event.message for event in sim.iter_events()]
+        return messages, instrumentation
+        
+    def test_disabled_by_default(self):
+        """Test that simulations are not instrumented unless enabled"""
+        self.assertIsNone(Simulation(seed=1).instrumentation)
+        
+    def test_instrumentation_does_not_change_results(self):
+        """Test that an instrumented run produces the same events"""
+        self.assertEqual(self._run(False)[0], self._run(True)[0])
+        
+    def test_metrics_table(self):
+        """Test the per-year metrics of a simulation"""
+        messages, instrumentation = self._run(True)
+        rows = instrumentation.rows()
+        self.assertEqual([row["year"] for row in rows], list(range(1000, 1030)))
+        for phase in PHASES:
+            self.assertTrue(all(row[f"{phase}_calls"] == 1 for row in rows))
+        self.assertEqual(sum(row["events_emitted"] for row in rows), len(messages))
+        self.assertEqual(rows[0]["persons_processed"], 2)
+        self.assertGreater(sum(row["events_evaluated"] for row in rows), 0)
+        self.assertGreater(sum(row["events_triggered"] for row in rows), 0)
+        self.assertIn("delayed_queue_depth", rows[0])
+        self.assertIn("candidates_scanned", rows[0])
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.csv")
+            instrumentation.write_table(path)
+            with open(path, newline="") as file:
+                table = list(csv.DictReader(file))
+        self.assertEqual(len(table), 30)
+        self.assertEqual(int(table[-1]["year"]), 1029)
+        
+    def test_chrome_trace(self):
+        """Test that phases are exported as complete events of a Chrome trace"""
+        _, instrumentation = self._run(True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            instrumentation.write_chrome_trace(path)
+            with open(path) as file:
+                trace = json.load(file)
+        phases = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual(len(phases), 30 * len(PHASES))
+        self.assertEqual(phases[0]["name"], "mortality")
+        self.assertEqual(phases[0]["args"], {"year": 1000})
+        self.assertTrue(all(event["dur"] >= 0 for event in phases))
+        counters = [event for event in trace["traceEvents"] if event["ph"] == "C"]
+        self.assertIn("delayed_queue_depth", {event["name"] for event in counters})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from history_generator.event_processor import EventProcessor
+from history_generator.logger_config import (PROJECT_LOGGERS, disable_async_logging, enable_async_logging,
+                                             world_logger)
+
+class _CountingState(dict):
+    """World state that counts how often it is formatted."""
+    formatted = 0
+    
+    def __repr__(self):
+        _CountingState.formatted += 1
+        return super().__repr__()
+        
+class _ThreadRecordingNumber(int):
+    """Number that records the threads it is formatted on."""
+    threads = []
+    
+    def __str__(self):
+        _ThreadRecordingNumber.threads.append(threading.current_thread())
+        return super().__str__()
+        
+class TestLoggerConfig(unittest.TestCase):
+    def tearDown(self):
+        disable_async_logging()
+        
+    def test_disabled_debug_does_not_format_world_state(self):
+        """Test that the world state is only formatted when debug logging is on"""
+        processor = EventProcessor("")
+        processor.events = {"events": {}}
+        state = _CountingState(current_year=1000, regions={}, factions={})
+        _CountingState.formatted = 0
+        processor.process_events(state, 1000)
+        self.assertEqual(_CountingState.formatted, 0)
+        
+    def test_async_structured_logging(self):
+        """Test that async logging writes JSON lines and restores the loggers afterwards"""
+        handlers = world_logger.handlers[:]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "log.jsonl")
+            enable_async_logging(path, level=logging.DEBUG)
+            self.assertTrue(world_logger.isEnabledFor(logging.DEBUG))
+            world_logger.info("Year %d done", 1000, extra={"year": 1000})
+            disable_async_logging()
+            with open(path) as file:
+                entries = [json.loads(line) for line in file]
+        self.assertEqual(entries[0]["message"], "Year 1000 done")
+        self.assertEqual(entries[0]["logger"], "world")
+        self.assertEqual(entries[0]["year"], 1000)
+        self.assertEqual(world_logger.handlers, handlers)
+        self.assertFalse(world_logger.isEnabledFor(logging.INFO))
+        self.assertIn("world", PROJECT_LOGGERS)
+        
+    def test_async_logging_formats_on_the_listener(self):
+        """Test that queued records keep their exception and are formatted with the state they were logged with"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "log.jsonl")
+            enable_async_logging(path, level=logging.DEBUG)
+            _ThreadRecordingNumber.threads = []
+            try:
+                raise ValueError("bad stat")
+            except ValueError:
+                world_logger.exception("Event %s failed in year %s", "flood", _ThreadRecordingNumber(1000))
+            # Mutable arguments are merged into the message before they can change
+            state = {"year": 1000}
+            world_logger.debug("State: %s", state)
+            state["year"] = 1001
+            disable_async_logging()
+            with open(path) as file:
+                entries = [json.loads(line) for line in file]
+        self.assertEqual(entries[0]["message"], "Event flood failed in year 1000")
+        self.assertIn("ValueError: bad stat", entries[0]["exception"])
+        self.assertNotIn(threading.main_thread(), _ThreadRecordingNumber.threads)
+        self.assertEqual(entries[1]["message"], "State: {'year': 1000}")
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+from history_generator.marriage_market import MarriageMarket
+from history_generator.person_manager import PersonManager
+from history_generator.person import Person
+from history_generator.population import Population
+
+class TestMarriageMarket(unittest.TestCase):
+    def setUp(self):
+        """Set up an empty marriage market."""
+        self.population = Population()
+        self.market = MarriageMarket(PersonManager(self.population))
+        self.seeker = self._person("Aric", "male", 1000)
+        
+    def _person(self, name, gender, birth_year):
+        return Person(name, gender, birth_year, "Noble Houses", "Central Valley", population=self.population)
+        
+    def test_find_partner_respects_gender_and_age_window(self):
+        """Test that only candidates of the other gender within the age window are chosen"""
+        too_old = self._person("Lyra", "female", 980)
+        same_gender = self._person("Kael", "male", 1001)
+        match = self._person("Iona", "female", 1008)
+        for person in (too_old, same_gender, match):
+            self.market.add(person, 1020)
+        for _ in range(20):
+            self.assertEqual(self.market.find_partner(self.seeker, 1020), match)
+            
+    def test_find_partner_without_candidates(self):
+        """Test that no partner is found in an empty market"""
+        self.assertIsNone(self.market.find_partner(self.seeker, 1020))
+        
+    def test_married_candidates_are_dropped(self):
+        """Test that candidates married elsewhere are skipped and removed"""
+        candidate = self._person("Lyra", "female", 1000)
+        self.market.add(candidate, 1020)
+        candidate.marry(self._person("Kael", "male", 1000))
+        self.assertIsNone(self.market.find_partner(self.seeker, 1020))
+        self.assertEqual(self.market.candidates, [])
+        
+    def test_candidates_expire(self):
+        """Test that candidates leave the market after their remaining years"""
+        candidate = self._person("Lyra", "female", 1000)
+        self.market.add(candidate, 1020, remaining_years=2)
+        with patch('random.random', return_value=1.0):
+            self.market.update(1022)
+            self.assertEqual(self.market.find_partner(self.seeker, 1022), candidate)
+            self.market.update(1023)
+        self.assertIsNone(self.market.find_partner(self.seeker, 1023))
+        self.assertEqual(self.market.candidates, [])
+        
+    def test_remove(self):
+        """Test removing a candidate by ID"""
+        first = self._person("Lyra", "female", 1000)
+        second = self._person("Iona", "female", 1000)
+        self.market.add(first, 1020)
+        self.market.add(second, 1020)
+        self.market.remove(first)
+        self.assertEqual([c.person for c in self.market.candidates], [second])
+        self.assertEqual(self.market.find_partner(self.seeker, 1020), second)
+        
+    def test_pick_is_uniform_within_window(self):
+        """Test that every candidate in the window can be drawn"""
+        candidates = [self._person(f"C{i}", "female", 995 + i) for i in range(10)]
+        for candidate in candidates:
+            self.market.add(candidate, 1020)
+        drawn = {self.market.find_partner(self.seeker, 1020) for _ in range(500)}
+        self.assertEqual(drawn, set(candidates))
+
+if __name__ == '__main__':
+    unittest.main()
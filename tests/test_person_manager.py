@@ -1,7 +1,9 @@
 import unittest
 from datetime import datetime
+import numpy as np
 from history_generator.person_manager import PersonManager
 from history_generator.person import Person
+from history_generator.population import Population
 from history_generator.config.settings import PERSON, CHILDBIRTH
 
 class TestPersonManager(unittest.TestCase):
@@ -91,4 +93,37 @@ class TestPersonManager(unittest.TestCase):
         """Test removing a person that doesn't exist in the manager."""
         self.manager.remove_person(self.person1)  # Try to remove a person that was never added
         all_persons = self.manager.get_all_persons()
-        self.assertEqual(len(all_persons), 0)  # Should still be empty 
\ No newline at end of file
+        self.assertEqual(len(all_persons), 0)  # Should still be empty
+        
+    def test_get_persons_born_between(self):
+        """Test retrieving persons by birth year range."""
+        self.manager.add_person(self.person1)
+        self.manager.add_person(self.person2)
+        self.manager.add_person(self.person3)
+        persons = self.manager.get_persons_born_between(self.current_year - 25, self.current_year - 20)
+        self.assertEqual(len(persons), 2)
+        self.assertNotIn(self.person3, persons)
+        
+    def test_indexes_after_removal(self):
+        """Test that removed persons disappear from all queries."""
+        self.manager.add_person(self.person1)
+        self.manager.remove_person(self.person1)
+        self.assertIsNone(self.manager.get_person_by_id(self.person1.id))
+        self.assertEqual(self.manager.get_persons_by_faction("Noble Houses"), [])
+        self.assertEqual(self.manager.get_persons_by_region("Central Valley"), [])
+        self.assertEqual(self.manager.get_living_persons(), [])
+        
+    def test_cleanup_after_mortality_pass(self):
+        """Test that deaths from the batched mortality pass are cleaned up."""
+        self.manager.add_person(self.person1)
+        self.manager.add_person(self.person3)
+        self.manager.population.apply_mortality(self.current_year + PERSON["max_age_bonus"], np.random.default_rng(0))
+        self.manager.cleanup_dead_persons(self.current_year)
+        self.assertEqual(self.manager.get_all_persons(), [self.person1])
+        
+    def test_add_person_from_other_population(self):
+        """Test that persons of another population are rejected."""
+        stranger = Person("Stranger", "male", self.current_year - 30, "Noble Houses", "Central Valley",
+                          population=Population())
+        with self.assertRaises(ValueError):
+            self.manager.add_person(stranger)
@@ -0,0 +1,138 @@
+import unittest
+import numpy as np
+from history_generator.config.settings import PERSON
+from history_generator.population import Population, Adjacency, NO_YEAR, MALE, FEMALE
+from history_generator.person import Person
+
+class TestPopulation(unittest.TestCase):
+    def setUp(self):
+        """Set up an empty population store."""
+        self.population = Population(capacity=2)
+
+    def test_add_assigns_sequential_ids(self):
+        """Test that persons get monotonically increasing IDs"""
+        first = self.population.add("Aric", "male", 1000, "Noble Houses", "Central Valley")
+        second = self.population.add("Lyra", "female", 1002, "Mages' Guild", "Central Valley")
+        self.assertEqual((first, second), (0, 1))
+        self.assertEqual(len(self.population), 2)
+
+    def test_columns_grow(self):
+        """Test that columns keep their values when the capacity grows"""
+        for i in range(10):
+            self.population.add(f"P{i}", "male" if i % 2 else "female", 1000 + i, "Noble Houses", "Central Valley")
+        self.assertEqual(self.population.view("birth_year").tolist(), list(range(1000, 1010)))
+        self.assertTrue((self.population.view("death_year") == NO_YEAR).all())
+        self.assertEqual(self.population.view("gender").tolist(), [FEMALE, MALE] * 5)
+
+    def test_string_codes_are_shared(self):
+        """Test that repeated factions and regions map to the same code"""
+        first = self.population.add("Aric", "male", 1000, "Noble Houses", "Central Valley")
+        second = self.population.add("Kael", "male", 1000, "Noble Houses", "Eastern Forests")
+        self.assertEqual(self.population.faction[first], self.population.faction[second])
+        self.assertNotEqual(self.population.region[first], self.population.region[second])
+        self.assertEqual(len(self.population.factions), 1)
+
+    def test_invalid_gender(self):
+        """Test that an invalid gender is rejected"""
+        with self.assertRaises(ValueError):
+            self.population.add("Nobody", "unknown", 1000, "Noble Houses", "Central Valley")
+
+    def test_adjacency_compaction_keeps_order(self):
+        """Test that compaction keeps edges in insertion order"""
+        adjacency = Adjacency()
+        adjacency.add(2, 5)
+        adjacency.add(0, 1)
+        adjacency.add(2, 3)
+        adjacency.compact()
+        adjacency.add(2, 7)
+        self.assertEqual(adjacency.neighbors(2), [5, 3, 7])
+        self.assertEqual(adjacency.neighbors(0), [1])
+        self.assertEqual(adjacency.neighbors(1), [])
+        self.assertEqual(adjacency.neighbors(9), [])
+        self.assertEqual(len(adjacency), 4)
+
+class TestMortality(unittest.TestCase):
+    def setUp(self):
+        """Set up persons of different ages."""
+        self.population = Population()
+        self.young = self.population.add("Aric", "male", 1000, "Noble Houses", "Central Valley")
+        self.ancient = self.population.add("Lyra", "female", 1000 - PERSON["max_base_age"] - PERSON["max_age_bonus"] - 1,
+                                           "Noble Houses", "Central Valley")
+        self.sick = self.population.add("Kael", "male", 1000, "Noble Houses", "Central Valley")
+        self.population.health[self.sick] = 0
+
+    def test_apply_mortality(self):
+        """Test that the batched pass kills old and sick persons only"""
+        died = self.population.apply_mortality(1010, np.random.default_rng(1))
+        self.assertEqual(sorted(died.tolist()), [self.ancient, self.sick])
+        self.assertEqual(self.population.death_year[self.ancient], 1010)
+        self.assertEqual(self.population.death_year[self.young], NO_YEAR)
+
+    def test_dead_persons_are_not_processed_again(self):
+        """Test that a second pass leaves earlier deaths untouched"""
+        self.population.apply_mortality(1010, np.random.default_rng(1))
+        died = self.population.apply_mortality(1011, np.random.default_rng(1))
+        self.assertEqual(len(died), 0)
+        self.assertEqual(self.population.death_year[self.ancient], 1010)
+
+    def test_is_dead_is_a_pure_lookup(self):
+        """Test that is_dead does not decide deaths by itself"""
+        ancient = Person.view(self.population, self.ancient)
+        self.assertFalse(ancient.is_dead(1010))
+        self.assertEqual(self.population.death_year[self.ancient], NO_YEAR)
+        self.assertTrue(Person.view(self.population, self.sick).is_dead(1010))
+        self.population.apply_mortality(1010, np.random.default_rng(1))
+        self.assertTrue(ancient.is_dead(1010))
+
+class TestPersonView(unittest.TestCase):
+    def setUp(self):
+        """Set up a population with a married couple."""
+        self.population = Population()
+        self.king = Person("Aric", "male", 1000, "Noble Houses", "Central Valley", population=self.population)
+        self.queen = Person("Lyra", "female", 1002, "Noble Houses", "Central Valley", population=self.population)
+        self.king.marry(self.queen)
+
+    def test_attributes_are_read_from_columns(self):
+        """Test that person attributes reflect the store"""
+        self.assertEqual(self.king.name, "Aric")
+        self.assertEqual(self.king.gender, "male")
+        self.assertEqual(self.queen.birth_year, 1002)
+        self.assertEqual(self.queen.faction, "Noble Houses")
+        self.assertIsNone(self.king.death_year)
+        self.population.death_year[self.king.id] = 1050
+        self.assertEqual(self.king.death_year, 1050)
+
+    def test_setters_write_columns(self):
+        """Test that setting attributes updates the store"""
+        self.king.health = 0
+        self.king.was_king = True
+        self.king.death_year = 1060
+        self.assertEqual(self.population.health[self.king.id], 0)
+        self.assertTrue(self.population.was_king[self.king.id])
+        self.king.death_year = None
+        self.assertEqual(self.population.death_year[self.king.id], NO_YEAR)
+
+    def test_marriage_is_symmetric(self):
+        """Test that marriage is stored in both directions"""
+        self.assertEqual(self.king.partners, (self.queen,))
+        self.assertEqual(self.queen.partners, (self.king,))
+        self.king.marry(self.queen)
+        self.assertEqual(self.population.partner_count[self.king.id], 1)
+
+    def test_children(self):
+        """Test that children are recorded for each parent"""
+        child = Person("Kael", "male", 1025, "Noble Houses", "Central Valley", population=self.population)
+        self.king.add_child(child)
+        self.queen.add_child(child)
+        self.assertEqual(self.king.children, (child,))
+        self.assertEqual(self.queen.children, (child,))
+
+    def test_views_compare_by_row(self):
+        """Test that two views on the same row are equal"""
+        view = Person.view(self.population, self.king.id)
+        self.assertEqual(view, self.king)
+        self.assertEqual(hash(view), hash(self.king))
+        self.assertNotEqual(view, self.queen)
+
+if __name__ == '__main__':
+    unittest.main()
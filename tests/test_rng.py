@@ -0,0 +1,71 @@
+import random
+import unittest
+from history_generator.rng import RandomStream, RandomStreams, _stream_key
+from history_generator.simulation import Simulation
+
+class TestRandomStreams(unittest.TestCase):
+    def test_streams_are_reproducible(self):
+        """Test that the same seed and name give the same draws"""
+        first = RandomStreams(42).stream("events")
+        second = RandomStreams(42).stream("events")
+        self.assertEqual([first.random() for _ in range(5)], [second.random() for _ in range(5)])
+        self.assertEqual(first.generator.integers(0, 1000, 5).tolist(),
+                         second.generator.integers(0, 1000, 5).tolist())
+                         
+    def test_streams_do_not_depend_on_creation_order(self):
+        """Test that a stream is derived from its name only"""
+        first = RandomStreams(42)
+        first.stream("dynasty/House A")
+        first_events = first.stream("events")
+        second = RandomStreams(42)
+        second_events = second.stream("events")
+        self.assertEqual(first_events.random(), second_events.random())
+        
+    def test_streams_are_independent(self):
+        """Test that different names and seeds give different draws"""
+        streams = RandomStreams(42)
+        self.assertIs(streams.stream("events"), streams.stream("events"))
+        self.assertNotEqual(streams.stream("events").random(), streams.stream("marriage_market").random())
+        self.assertNotEqual(RandomStreams(1).stream("events").random(), RandomStreams(2).stream("events").random())
+        self.assertEqual(set(streams.streams()), {"events", "marriage_market"})
+        
+    def test_distinct_names_have_distinct_keys(self):
+        """Test that names with the same CRC-32 still get different streams"""
+        # "plumless" and "buckeroo" share their CRC-32 checksum
+        self.assertNotEqual(_stream_key("dynasty/plumless"), _stream_key("dynasty/buckeroo"))
+        self.assertNotEqual(_stream_key("dynasty/House A"), _stream_key("dynasty/House B"))
+        self.assertEqual(_stream_key("dynasty/House A"), _stream_key("dynasty/House A"))
+        streams = RandomStreams(42)
+        self.assertNotEqual(streams.stream("dynasty/plumless").random(), streams.stream("dynasty/buckeroo").random())
+        
+    def test_stream_is_a_random_instance(self):
+        """Test that a stream offers the random.Random interface"""
+        stream = RandomStream()
+        self.assertIsInstance(stream, random.Random)
+        self.assertIn(stream.choice(["a", "b"]), ["a", "b"])
+        self.assertTrue(16 <= stream.randint(16, 30) <= 30)
+
+class TestSimulationSeed(unittest.TestCase):
+    def _run(self, seed, dynasties=("House Nerdival",)):
+        sim = Simulation(start_year=1000, duration=20, seed=seed)
+        for name in dynasties:
+            sim.create_dynasty(name)
+        messages = []
+        while sim.year < sim.end_year:
+            messages.extend(event.message for event in sim.simulate_year())
+            sim.increment_year()
+        return messages
+        
+    def test_same_seed_gives_same_history(self):
+        """Test that a seeded simulation is fully reproducible"""
+        self.assertEqual(self._run(7), self._run(7))
+        
+    def test_global_random_state_is_not_used(self):
+        """Test that draws from the random module do not change a seeded simulation"""
+        expected = self._run(7)
+        random.seed(123)
+        random.random()
+        self.assertEqual(self._run(7), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from history_generator.events import NoSuccessorEvent, SuccessionEvent
+from history_generator.person import Person
+from history_generator.population import Population
+from history_generator.simulation import Simulation
+from history_generator.succession import Family, HeirIndex
+
+class TestHeirIndex(unittest.TestCase):
+    def test_oldest_first_in_insertion_order(self):
+        """Test that heirs come out by birth year, ties in the order they were added"""
+        heirs = HeirIndex()
+        for person_id, birth_year in ((1, 1010), (2, 1005), (3, 1010), (4, 1020)):
+            heirs.add(person_id, birth_year)
+        heirs.discard(2)
+        self.assertEqual(heirs.peek(), (1, 1010))
+        self.assertEqual([heirs.pop(), heirs.pop(), heirs.pop(), heirs.pop()], [1, 3, 4, None])
+        
+    def test_stale_entries_are_compacted(self):
+        """Test that the heap is rebuilt once most of its entries were removed"""
+        heirs = HeirIndex()
+        for person_id in range(100):
+            heirs.add(person_id, 1000 + person_id)
+        for person_id in range(1, 100):
+            heirs.discard(person_id)
+        self.assertEqual(len(heirs), 1)
+        self.assertLessEqual(len(heirs._heap), 18)
+        self.assertEqual(heirs.pop(), 0)
+
+class TestFamily(unittest.TestCase):
+    def test_keeps_joining_order(self):
+        """Test that removal keeps the order of the remaining members"""
+        population = Population()
+        persons = [Person(f"Person {index}", "male", 1000, "Commoners", "Central Valley", population=population)
+                   for index in range(4)]
+        family = Family(persons)
+        family.remove(persons[1])
+        self.assertEqual(list(family), [persons[0], persons[2], persons[3]])
+        self.assertNotIn(persons[1], family)
+        with self.assertRaises(ValueError):
+            family.remove(persons[1])
+
+class TestDynastySuccession(unittest.TestCase):
+    def setUp(self):
+        """Set up a dynasty with two sons and a daughter"""
+        self.sim = Simulation(start_year=1000, seed=1)
+        self.dynasty = self.sim.create_dynasty("House Nerdival")
+        population = self.sim.population
+        self.younger = Person("Younger", "male", 985, "Noble Houses", "Central Valley", population=population)
+        self.daughter = Person("Daughter", "female", 975, "Noble Houses", "Central Valley", population=population)
+        self.older = Person("Older", "male", 980, "Noble Houses", "Central Valley", population=population)
+        for person in (self.younger, self.daughter, self.older):
+            self.dynasty.add_member(person)
+            
+    def test_oldest_son_inherits(self):
+        """Test that the oldest man who never reigned inherits, then the next one"""
+        event = self.dynasty.succeed(1000)
+        self.assertIsInstance(event, SuccessionEvent)
+        self.assertEqual(self.dynasty.monarch, self.older)
+        self.assertTrue(self.older.was_king)
+        self.dynasty.succeed(1001)
+        self.assertEqual(self.dynasty.monarch, self.younger)
+        self.assertIsInstance(self.dynasty.succeed(1002), NoSuccessorEvent)
+        
+    def test_dead_and_newborn_men_do_not_inherit(self):
+        """Test that removed members and sons born in the year of succession are skipped"""
+        self.dynasty.remove_member(self.older)
+        self.dynasty.remove_member(self.younger)
+        newborn = Person("Newborn", "male", 1000, "Noble Houses", "Central Valley", population=self.sim.population)
+        self.dynasty.add_member(newborn)
+        self.assertIsInstance(self.dynasty.succeed(1000), NoSuccessorEvent)
+        self.assertEqual(self.dynasty.succeed(1001).new_monarch, "Newborn")
+        
+    def test_index_matches_family_during_simulation(self):
+        """Test that the heir index always holds exactly the living men who never reigned"""
+        sim = Simulation(start_year=1000, duration=150, seed=4)
+        dynasty = sim.create_dynasty("House Nerdival")
+        while sim.year < sim.end_year:
+            sim.simulate_year()
+            sim.increment_year()
+            expected = {person.id for person in dynasty.family if person.gender == "male" and not person.was_king}
+            self.assertEqual({person_id for person_id in expected if person_id in dynasty.heirs}, expected)
+            self.assertEqual(len(dynasty.heirs), len(expected))
+
+if __name__ == '__main__':
+    unittest.main()
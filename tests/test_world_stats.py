@@ -0,0 +1,153 @@
+import copy
+import random
+import unittest
+from history_generator.fantasy_world import FantasyWorld
+from history_generator.event_queue import EventQueue
+from history_generator.world_stats import VECTOR_THRESHOLD, WorldStats
+
+class TestWorldStats(unittest.TestCase):
+    def setUp(self):
+        self.sections = {
+            "regions": {"Central Valley": {"fertility": 80, "trade": 70}},
+            "factions": {"Noble Houses": {"stability": 75}}
+        }
+        self.events = {
+            "events": {
+                "natural": {
+                    "drought": {
+                        "name": "Drought",
+                        "conditions": [{"type": "region", "region": "Western Deserts", "stat": "fertility",
+                                        "operator": "<=", "value": 20}],
+                        "effects": [{"type": "modify_stat", "region": "Central Valley", "stat": "fertility", "value": 30},
+                                    {"type": "modify_stat", "faction": "Noble Houses", "stat": "power", "value": -5}]
+                    }
+                }
+            }
+        }
+        self.stats = WorldStats.from_sections(self.sections, self.events)
+        
+    def test_views_behave_like_nested_dictionaries(self):
+        """Test that section views expose exactly the stats an entity has"""
+        regions = self.stats.section("regions")
+        self.assertEqual(regions, self.sections["regions"])
+        self.assertEqual(self.stats.section("factions"), self.sections["factions"])
+        # Entities and stats referenced only by the catalogue are laid out but absent
+        self.assertIn(("regions", "Western Deserts"), self.stats.layout.entity_index)
+        self.assertIsNone(regions.get("Western Deserts"))
+        self.assertEqual(regions["Central Valley"].get("power", 0), 0)
+        
+        regions["Central Valley"]["magical_energy"] = 50
+        regions["Eastern Forests"] = {"trade": 30}
+        self.assertEqual(self.stats.to_dict("regions"), {
+            "Central Valley": {"fertility": 80, "trade": 70, "magical_energy": 50},
+            "Eastern Forests": {"trade": 30}
+        })
+        del regions["Eastern Forests"]
+        self.assertNotIn("Eastern Forests", regions)
+        
+    def test_compiled_effects_clamp_and_create_stats(self):
+        """Test that effects are clamped to 0..100 and create missing stats"""
+        effects = self.stats.compile_effects(self.events["events"]["natural"]["drought"]["effects"])
+        # The new power stat reads as 0 before and is clamped to 0, so it does not count as changed
+        changed = self.stats.apply(effects)
+        self.assertEqual(changed, [0])
+        self.assertEqual(self.stats.get("regions", "Central Valley", "fertility"), 100)
+        self.assertEqual(self.stats.section("factions")["Noble Houses"], {"stability": 75, "power": 0})
+        # Nothing changes at the bounds, but the stats stay present
+        self.assertEqual(self.stats.apply(effects), [])
+        
+    def test_whole_stats_read_back_as_ints(self):
+        """Test that whole-number stats stay ints and a fractional value switches the store to floats"""
+        self.stats.apply(self.stats.compile_effects(self.events["events"]["natural"]["drought"]["effects"]))
+        self.assertEqual(repr(self.stats.to_dict("regions")), repr({"Central Valley": {"fertility": 100, "trade": 70}}))
+        self.assertEqual(repr(self.stats.section("factions")["Noble Houses"]["stability"]), "75")
+        self.assertEqual(repr(self.stats.stack([self.stats.snapshot()]).tolist()[0][0][:2]), "[100, 70]")
+        
+        self.stats.set("regions", "Central Valley", "trade", 70.5)
+        effects = self.stats.compile_effects([{"type": "modify_stat", "region": "Central Valley",
+                                               "stat": "fertility", "value": -0.25}])
+        self.stats.apply(effects)
+        self.assertEqual(self.stats.to_dict("regions"), {"Central Valley": {"fertility": 99.75, "trade": 70.5}})
+        
+    def test_repeated_stat_is_clamped_after_every_effect(self):
+        """Test that an effect list changing one stat twice matches applying it effect by effect"""
+        effects = self.stats.compile_effects([
+            {"type": "modify_stat", "region": "Central Valley", "stat": "trade", "value": 50},
+            {"type": "modify_stat", "region": "Central Valley", "stat": "trade", "value": -40}
+        ])
+        self.assertTrue(effects.sequential)
+        self.stats.apply(effects)
+        self.assertEqual(self.stats.get("regions", "Central Valley", "trade"), 60)
+        
+    def test_vectorized_add_matches_scalar_updates(self):
+        """Test that events changing many stats give the same result as stat-by-stat updates"""
+        rng = random.Random(3)
+        definitions = [{"type": "modify_stat", "region": f"Region {index}", "stat": "trade",
+                        "value": rng.randint(-60, 60)} for index in range(VECTOR_THRESHOLD * 2)]
+        scalar = WorldStats.from_sections({"regions": {f"Region {index}": {"trade": rng.randint(0, 100)}
+                                                       for index in range(VECTOR_THRESHOLD * 2)}})
+        vectorized = copy.deepcopy(scalar)
+        many = vectorized.compile_effects(definitions)
+        self.assertTrue(many.vectorized)
+        changed = vectorized.apply(many)
+        expected = []
+        for position, definition in enumerate(definitions):
+            single = scalar.compile_effects([definition])
+            self.assertFalse(single.vectorized)
+            if scalar.apply(single):
+                expected.append(position)
+        self.assertEqual(changed, expected)
+        self.assertEqual(vectorized.to_dict("regions"), scalar.to_dict("regions"))
+        
+    def test_growth_invalidates_compiled_effects(self):
+        """Test that new entities keep all values and reject effects of the old layout"""
+        effects = self.stats.compile_effects(self.events["events"]["natural"]["drought"]["effects"])
+        snapshot = self.stats.snapshot()
+        self.stats.set("regions", "Coastal Regions", "harbour", 10)
+        with self.assertRaises(ValueError):
+            self.stats.apply(effects)
+        stacked = self.stats.stack([snapshot, self.stats.snapshot()])
+        row, column = self.stats.index("regions", "Coastal Regions", "harbour")
+        self.assertEqual(stacked[:, row, column].tolist(), [0, 10])
+        self.assertEqual(self.stats.get("regions", "Central Valley", "trade"), 70)
+        
+    def test_deep_copy_keeps_views_on_the_copy(self):
+        """Test that a deep-copied world state writes to its own store"""
+        state = {"regions": self.stats.section("regions"), "stats": self.stats}
+        copied = copy.deepcopy(state)
+        copied["regions"]["Central Valley"]["trade"] = 10
+        copied["stats"].apply(copied["stats"].compile_effects(
+            [{"type": "modify_stat", "region": "Central Valley", "stat": "trade", "value": 5}]))
+        self.assertEqual(copied["stats"].get("regions", "Central Valley", "trade"), 15)
+        self.assertEqual(self.stats.get("regions", "Central Valley", "trade"), 70)
+
+class TestFantasyWorldStats(unittest.TestCase):
+    def test_store_matches_nested_dictionaries(self):
+        """Test that events on the stat store evolve the world exactly like on plain dictionaries"""
+        world = FantasyWorld(random.Random(11))
+        reference = FantasyWorld(random.Random(11))
+        plain_state = {
+            "regions": reference.stats.to_dict("regions"),
+            "factions": reference.stats.to_dict("factions"),
+            "delayed_events": EventQueue()
+        }
+        for year in range(1000, 1100):
+            world.year = year
+            world_names = [event["name"] for event in world.generate_events()]
+            plain_state["current_year"] = year
+            reference_names = [event["name"] for event in reference.event_processor.process_events(plain_state, year)]
+            self.assertEqual(world_names, reference_names)
+        self.assertEqual(world.regions, plain_state["regions"])
+        self.assertEqual(world.factions, plain_state["factions"])
+        
+    def test_assigning_a_section_replaces_its_stats(self):
+        """Test that assigning regions replaces the stored stats and forces re-evaluation"""
+        world = FantasyWorld(random.Random(0))
+        view = world.regions
+        world.regions = {"Central Valley": {"magical_energy": 90}}
+        self.assertIsNot(world.regions, view)
+        self.assertEqual(dict(world.get_world_state()["regions"]), {"Central Valley": {"magical_energy": 90}})
+        self.assertEqual(world.stats.get("regions", "Northern Mountains", "trade"), 0)
+
+if __name__ == '__main__':
+    unittest.main()